@@ -1,20 +1,50 @@
 import logging
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from db.base import Base, engine
+from db.base import Base, engine, dispose_async_engine
 
 from core.scheduler import scheduler
 from core.config import settings
+from core.async_runner import run_sync, shutdown_loop
 from services.crawling import crawl_and_save_festivals
+from services.plan_recommend import close_async_places_client, OPENAI_API_KEY
+from services.ai_client import init_openai_client, close_openai_client
+from services.place_prefetch import prefetch_active_festivals
+from services.place_index import reload_place_index
+from services.plan_jobs import resume_plan_jobs, shutdown_plan_jobs
+from services.plan_writer import close_plan_writer
+from services.festival_search import ensure_festival_search
 def init_db():
     # 최초 1회 테이블 생성 (이미 있으면 아무 일도 안 함)
     Base.metadata.create_all(bind=engine)
+    # 축제 검색 인덱스 (SQLite FTS5 trigram / PostgreSQL pg_trgm)
+    ensure_festival_search()
 
 logger = logging.getLogger(__name__)
 
 def _daily_crawl_job():
-    stats = crawl_and_save_festivals()
+    # 좌표가 있어야 프리페치가 가능하므로 지오코딩까지 이 잡에서 마침
+    stats = crawl_and_save_festivals(background_geocode=False)
     logger.info("[CRAWL][DAILY] %s", stats)
+    # 2단계: 크롤 직후 후보 장소 프리페치
+    scheduler.add_job(
+        _daily_prefetch_job,
+        trigger="date",
+        id="daily_prefetch",
+        replace_existing=True,
+        max_instances=1,
+    )
+
+def _daily_prefetch_job():
+    stats = prefetch_active_festivals()
+    logger.info("[PREFETCH][DAILY] %s", stats)
+    reload_place_index()
+
+def _plan_job_sweep():
+    # 기동 직후 재시작으로 끊긴 작업(아직 stale 전)·큐가 가득 차 못 넣은 작업을 주기적으로 다시 넣음
+    resumed = resume_plan_jobs()
+    if resumed:
+        logger.info("Resumed %d plan jobs.", resumed)
 
 def _initial_crawl_job():
     stats = crawl_and_save_festivals()
@@ -22,6 +52,21 @@ def _initial_crawl_job():
 
 async def on_startup():
     init_db() 
+    if not settings.SECRET_KEY:
+        logger.warning("SECRET_KEY is not set: using a per-process random key, "
+                       "plan tickets will not survive restarts or work across workers. Set it in .env.")
+    init_openai_client(OPENAI_API_KEY)
+    # 재시작 전에 남은 일정 생성 작업 이어서 처리 (이후엔 주기 점검)
+    _plan_job_sweep()
+    scheduler.add_job(
+        _plan_job_sweep,
+        trigger="interval",
+        seconds=settings.PLAN_JOB_SWEEP_SECONDS,
+        id="plan_job_sweep",
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+    )
     # 매일 03:00 크론 잡
     scheduler.add_job(
         _daily_crawl_job,
@@ -48,6 +93,15 @@ async def on_startup():
             max_instances=1,
         )
 
+    # 장소 인덱스 초기 로드 (기동을 막지 않도록 잡으로)
+    scheduler.add_job(
+        reload_place_index,
+        trigger="date",
+        id="place_index_load",
+        replace_existing=True,
+        max_instances=1,
+    )
+
     scheduler.start()
     logger.info("Scheduler started. Jobs: daily_crawl + initial_crawl(%s).",
                 "on" if settings.CRAWL_ON_STARTUP else "off")
@@ -58,3 +112,16 @@ async def on_shutdown():
     except Exception:
         pass
     logger.info("Scheduler stopped.")
+
+    shutdown_plan_jobs()
+    # 작업 종료 뒤에 남은 일정 요청·결과 행 flush
+    close_plan_writer()
+    close_openai_client()
+    await dispose_async_engine()
+
+    # 공용 Places 커넥션 풀 정리 후 백그라운드 루프 종료
+    try:
+        run_sync(close_async_places_client(), timeout=5)
+    except Exception:
+        logger.exception("Places client close failed")
+    shutdown_loop()
@@ -8,6 +8,7 @@ from app.routers import health
 from app.routers import crawl as crawl_router
 from app.routers.festivals import router as festivals_router
 from app.routers import plan 
+from app.routers import metrics as metrics_router
 
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -36,6 +37,7 @@ def create_app() -> FastAPI:
     app.include_router(crawl_router.router, prefix="/crawl", tags=["crawl"])
     app.include_router(festivals_router, prefix="/festivals", tags=["festivals"])
     app.include_router(plan.router)
+    app.include_router(metrics_router.router, tags=["metrics"])
 
     return app
 
@@ -1,62 +1,175 @@
-from fastapi import APIRouter, Query
-from sqlalchemy import select, func, and_, case
+import base64
+import json
+from datetime import date
+from typing import List, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from sqlalchemy import select, case, text
 from db.base import SessionLocal
 from db.models import Festival
+from services.festival_cache import get_festival_response_cache
+from services.festival_search import search_festival_ids
 
 router = APIRouter()
 
 DEFAULT_FIRST_PAGE = 16  # 첫 페이지 기본 개수
+DEFAULT_PAGE_SIZE = 20
+
+def _festival_dict(f: Festival) -> dict:
+    return {
+        "id": f.id,
+        "title": f.title,
+        "period": {"raw": f.period_raw, "start": f.period_start, "end": f.period_end},
+        "address": f.address,
+        "image_src": f.image_src,
+        "detail_url": f.detail_url,
+    }
 
 @router.get("/first-page")
 def first_page(
+    request: Request,
     limit: int = Query(DEFAULT_FIRST_PAGE, ge=1, le=50),
     q: str | None = None,  # (옵션) 제목 검색어
 ):
     """
     축제 '최신 스냅샷'만 모아서 첫 페이지 분량 반환.
-    같은 축제(detail_url)는 최신 created_at 한 건만.
+    같은 축제(detail_url)는 최신 한 건만 (크롤러가 유지하는 is_latest 인덱스 스캔).
     """
-    with SessionLocal() as s:
-        # 같은 축제(detail_url)에서 최신(created_at)만 뽑는 서브쿼리
-        subq = (
-            s.query(
-                Festival.detail_url,
-                func.max(Festival.created_at).label("max_created"),
-            )
-            .group_by(Festival.detail_url)
-            .subquery()
-        )
-
-        stmt = (
-            select(Festival)
-            .join(
-                subq,
-                and_(
-                    Festival.detail_url == subq.c.detail_url,
-                    Festival.created_at == subq.c.max_created,
-                ),
-            )
-        )
-        if q:
-            stmt = stmt.filter(Festival.title.contains(q))
-
-        # 기간 있는 것 우선, 최신순
-        stmt = stmt.order_by(
-            case((Festival.period_start.is_(None), 1), else_=0),
-            Festival.period_start.desc(),
-            Festival.created_at.desc(),
-        ).limit(limit)
-
-        rows = s.execute(stmt).scalars().all()
-
-        return [
-            {
-                "id": f.id,
-                "title": f.title,
-                "period": {"raw": f.period_raw, "start": f.period_start, "end": f.period_end},
-                "address": f.address,
-                "image_src": f.image_src,
-                "detail_url": f.detail_url,
-            }
-            for f in rows
-        ]
+    def compute():
+        with SessionLocal() as s:
+            stmt = select(Festival).where(Festival.is_latest.is_(True))
+            if q:
+                # LIKE 전체 스캔 대신 검색 인덱스로 후보 id만 뽑아 필터
+                ids = [i for i, _ in search_festival_ids(s, q)]
+                stmt = stmt.filter(Festival.id.in_(ids))
+
+            # 기간 있는 것 우선, 최신순
+            stmt = stmt.order_by(
+                case((Festival.period_start.is_(None), 1), else_=0),
+                Festival.period_start.desc(),
+                Festival.created_at.desc(),
+                Festival.id.desc(),  # 동률 정렬 고정 (목록 API 커서와 같은 순서)
+            ).limit(limit)
+
+            rows = s.execute(stmt).scalars().all()
+
+            return [_festival_dict(f) for f in rows]
+
+    return get_festival_response_cache().respond(request, compute)
+
+@router.get("/search")
+def search(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=50),
+):
+    """
+    제목·주소·기간 검색 (최신 스냅샷만, 관련도 순).
+    띄어쓰기가 달라도(예: "춘천닭갈비" / "춘천 닭갈비") 부분 일치.
+    """
+    def compute():
+        with SessionLocal() as s:
+            hits = search_festival_ids(s, q, limit=limit)
+            by_id = {f.id: f for f in s.execute(select(Festival).where(Festival.id.in_([i for i, _ in hits]))).scalars()}
+            return [
+                dict(_festival_dict(f), score=round(score, 4))
+                for i, score in hits
+                if (f := by_id.get(i)) is not None
+            ]
+
+    return get_festival_response_cache().respond(request, compute)
+
+# ---- keyset 페이지 목록 ----
+# 정렬: (기간 있는 행) period_start DESC, created_at DESC, id DESC → (기간 없는 행) created_at DESC, id DESC
+# 커서 = 마지막 행 id + 구간(0: 기간 있음, 1: 기간 없음). 비교 값은 DB에서 그 행을 다시 읽어 씀
+# (created_at 저장 형식과 바인딩 형식 차이에 영향받지 않도록)
+_AFTER_DATED = text(
+    "(festival.period_start, festival.created_at, festival.id) < "
+    "(SELECT c.period_start, c.created_at, c.id FROM festival AS c WHERE c.id = :cursor_id)"
+)
+_AFTER_UNDATED = text(
+    "(festival.created_at, festival.id) < "
+    "(SELECT c.created_at, c.id FROM festival AS c WHERE c.id = :cursor_id)"
+)
+
+def _encode_cursor(fid: int, phase: int) -> str:
+    raw = json.dumps({"id": fid, "p": phase}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return int(data["id"]), int(data["p"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+def _region_values(region: str) -> List[str]:
+    region = region.strip()
+    if region.endswith(("시", "군")):
+        return [region]
+    return [region + "시", region + "군"]
+
+@router.get("")
+def list_festivals(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
+    cursor: Optional[str] = None,
+    date_from: Optional[date] = Query(None, description="이 날짜 이후까지 열리는 축제"),
+    date_to: Optional[date] = Query(None, description="이 날짜 이전에 시작하는 축제"),
+    region: Optional[str] = Query(None, max_length=20, description="시·군 (예: 춘천, 양구군)"),
+):
+    """
+    first_page와 같은 정렬의 전체 목록 (keyset 커서, OFFSET 없음).
+    next_cursor를 그대로 다시 보내면 다음 페이지. 깊은 페이지도 첫 페이지와 같은 비용.
+    """
+    base = select(Festival).where(Festival.is_latest.is_(True))
+    if region:
+        base = base.where(Festival.region.in_(_region_values(region)))
+    if date_from:
+        base = base.where(Festival.period_end >= date_from)
+    if date_to:
+        base = base.where(Festival.period_start <= date_to)
+    # 기간 조건이 있으면 기간 없는 축제는 애초에 제외
+    include_undated = date_from is None and date_to is None
+
+    cursor_id, phase = _decode_cursor(cursor) if cursor else (None, 0)
+
+    def dated(n: int, after: Optional[int]):
+        stmt = base.where(Festival.period_start.is_not(None))
+        if after is not None:
+            stmt = stmt.where(_AFTER_DATED.bindparams(cursor_id=after))
+        return stmt.order_by(
+            Festival.period_start.desc(), Festival.created_at.desc(), Festival.id.desc()
+        ).limit(n)
+
+    def undated(n: int, after: Optional[int]):
+        stmt = base.where(Festival.period_start.is_(None))
+        if after is not None:
+            stmt = stmt.where(_AFTER_UNDATED.bindparams(cursor_id=after))
+        return stmt.order_by(Festival.created_at.desc(), Festival.id.desc()).limit(n)
+
+    def compute():
+        with SessionLocal() as s:
+            items: List[Festival] = []
+            next_cursor = None
+            after = cursor_id
+            if phase == 0:
+                rows = s.execute(dated(limit + 1, after)).scalars().all()
+                items = list(rows[:limit])
+                if len(rows) > limit:
+                    next_cursor = _encode_cursor(items[-1].id, 0)
+                after = None  # 기간 없는 구간은 처음부터
+            if next_cursor is None and include_undated and len(items) < limit:
+                need = limit - len(items)
+                rows = s.execute(undated(need + 1, after)).scalars().all()
+                items.extend(rows[:need])
+                if len(rows) > need:
+                    next_cursor = _encode_cursor(items[-1].id, 1)
+            elif next_cursor is None and include_undated and phase == 0 and len(items) == limit:
+                # 기간 있는 구간이 딱 limit개로 끝난 경우: 기간 없는 행이 남았는지만 확인
+                if s.execute(undated(1, None)).first() is not None:
+                    next_cursor = _encode_cursor(items[-1].id, 0)
+
+            return {"items": [_festival_dict(f) for f in items], "next_cursor": next_cursor}
+
+    return get_festival_response_cache().respond(request, compute)
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from core import metrics
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus text format (METRICS_ENABLED=false면 404)"""
+    if not metrics.ENABLED:
+        raise HTTPException(status_code=404, detail="metrics disabled")
+    return PlainTextResponse(metrics.render_latest(), media_type="text/plain; version=0.0.4; charset=utf-8")
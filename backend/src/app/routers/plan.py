@@ -1,78 +1,202 @@
 # src/app/routers/plan.py
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Request, HTTPException, Query, Header, Path
+from fastapi.responses import StreamingResponse
 from datetime import datetime, timezone
 import logging
-import uuid
+from typing import Optional
 
 
-from schemas.plan import ItineraryRequest, ItineraryResponse, EchoMeta, PlanCommitPayload
-from services.plan_service import process_plan_sync
+from schemas.plan import (
+    ItineraryRequest, ItineraryResponse, EchoMeta, PlanCommitPayload,
+    PlanJobAccepted, PlanJobStatus, SavePlanResult, SavedPlanOut, SavedPlanPage,
+)
+from services.plan_service import process_plan_sync, stream_plan_events
+from services.plan_jobs import JobQueueFull, submit_plan_job, get_plan_job_async
+from services.plan_store import (
+    InvalidTicket, get_saved_plan, issue_plan_ticket, list_saved_plans, save_committed_plan,
+)
+from services.timezone import as_utc
+from core.config import settings
+from core.responses import FastJSONResponse
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/plan", tags=["plan"])
+router = APIRouter(prefix="/plan", tags=["plan"], default_response_class=FastJSONResponse)
+
+# echo=false: 요청 원문(request)과 result.schedule/options(요청에서 온 중복 정보)를 빼고 응답
+_SLIM_EXCLUDE = {"request": True, "result": {"schedule": True, "options": True}}
+
+def _want_echo(echo: Optional[bool], header: Optional[str]) -> bool:
+    """쿼리 ?echo= 우선, 없으면 X-Plan-Echo 헤더, 둘 다 없으면 기존처럼 echo"""
+    if echo is not None:
+        return echo
+    if header is not None:
+        return header.strip().lower() not in ("0", "false", "no", "off")
+    return True
+
+def _plan_title(payload: ItineraryRequest) -> str:
+    return payload.schedule.festival_title or payload.schedule.title
+
+def _itinerary_response(resp: ItineraryResponse, echo: bool) -> FastJSONResponse:
+    """
+    이미 검증된 응답 모델을 그대로 직렬화 (response_model 재검증 생략).
+    slim 모드는 None으로 채우지 않고 키 자체를 뺌
+    """
+    return FastJSONResponse(resp.model_dump(exclude=None if echo else _SLIM_EXCLUDE))
 
 @router.post("/generate", response_model=ItineraryResponse)
-def generate_plan(req: Request, payload: ItineraryRequest):
+def generate_plan(
+    req: Request,
+    payload: ItineraryRequest,
+    deadline_s: Optional[float] = Query(None, gt=0, le=300, description="응답 마감(초). 기본값은 PLAN_DEADLINE_SECONDS"),
+    echo: Optional[bool] = Query(None, description="false면 요청 원문·schedule/options 생략 (기본 true)"),
+    x_plan_echo: Optional[str] = Header(None),
+    x_client_id: Optional[str] = Header(None, max_length=64),
+):
     """
     클라이언트가 여행 일정 요청을 보내면:
     1) payload(요청 데이터)를 로그로 남김
     2) 서비스 레이어 호출 → 추천 시스템 실행
     3) EchoMeta로 요청 수신 시간 기록
     4) ItineraryResponse 구조로 응답 반환
+    마감까지 LLM 응답이 없으면 로컬 휴리스틱 일정(result.source="local")으로 응답.
+    ?echo=false (또는 X-Plan-Echo: false)면 request와 result.schedule/options 없이 응답.
     """
     try:
         logger.info("ItineraryRequest received",
                     extra={"payload": payload.model_dump(mode="json")})
 
         # 서비스 호출 → 실제 추천 실행
-        result_meta = process_plan_sync(payload)
+        if deadline_s is None and settings.PLAN_DEADLINE_SECONDS > 0:
+            deadline_s = settings.PLAN_DEADLINE_SECONDS
+        result_meta = process_plan_sync(payload, deadline_s=deadline_s)
 
         logger.info("Plan processed", extra={"result_meta": result_meta})
+        # 저장(/plan/save)용 ticket: plan_id·클라이언트(X-Client-Id)를 서명해 둠
+        result_meta["ticket"] = issue_plan_ticket(result_meta["plan_id"], x_client_id, _plan_title(payload))
 
         # 응답 메타 생성
+        want_echo = _want_echo(echo, x_plan_echo)
         meta = EchoMeta(
             received_at_iso=datetime.now(tz=timezone.utc),
-            echo=True,
+            echo=want_echo,
         )
 
-        # 최종 응답 반환
-        print(result_meta)
-        return ItineraryResponse(
+        # 최종 응답 반환 (result는 여기서 한 번만 검증)
+        return _itinerary_response(ItineraryResponse(
             ok=True,
             meta=meta,
             request=payload,
             result=result_meta
-        )
+        ), want_echo)
 
     except Exception as e:
         logger.exception("Plan generation failed")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/save")
-def save_plan(payload: PlanCommitPayload):
+@router.post("/generate/stream")
+def generate_plan_stream(
+    payload: ItineraryRequest,
+    x_client_id: Optional[str] = Header(None, max_length=64),
+):
     """
-    클라에서 온 PlanCommitPayload(ticket, itinerary)를 영구 저장.
-    반환 포맷은 자유 — 여기선 id와 저장 시각만 간단히 반환.
+    /generate의 SSE 버전: 모델이 일정 항목을 만드는 대로 한 건씩 전송.
+    이벤트: meta(plan_id, ticket) → item* → totals (실패 시 error)
+    """
+    return StreamingResponse(
+        stream_plan_events(payload, client_id=x_client_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/jobs", response_model=PlanJobAccepted, status_code=202)
+def create_plan_job(
+    payload: ItineraryRequest,
+    x_client_id: Optional[str] = Header(None, max_length=64),
+):
+    """
+    /generate의 비동기 버전:
+    - 작업만 등록하고 바로 job_id 반환 (LLM 호출은 백그라운드 워커가 처리)
+    - 클라는 GET /plan/jobs/{job_id} 로 폴링
     """
     try:
-      if not payload.itinerary:
-          raise HTTPException(status_code=400, detail="itinerary is empty")
+        job = submit_plan_job(payload, client_id=x_client_id)
+    except JobQueueFull:
+        raise HTTPException(status_code=503, detail="plan job queue is full")
+    return PlanJobAccepted(job_id=job.id, status=job.status, poll_url=f"/plan/jobs/{job.id}")
 
-      # 예: UUID 발급 후 저장 (여기선 메모리/파일/DB 중 택1)
-      plan_id = str(uuid.uuid4())
-      saved_at = datetime.now(tz=timezone.utc)
+@router.get("/jobs/{job_id}", response_model=PlanJobStatus)
+async def read_plan_job(
+    job_id: str,
+    echo: Optional[bool] = Query(None, description="false면 요청 원문·schedule/options 생략 (기본 true)"),
+    x_plan_echo: Optional[str] = Header(None),
+):
+    # 폴링이 잦은 경로라 스레드풀 대신 비동기 엔진으로 조회
+    job = await get_plan_job_async(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
 
-      # 예시) 파일로 떨어뜨리기 (DB 대체)
-      # with open(f"./.plans/{plan_id}.json", "w", encoding="utf-8") as f:
-      #     json.dump(payload.model_dump(mode="json"), f, ensure_ascii=False, indent=2)
+    want_echo = _want_echo(echo, x_plan_echo)
+    response = None
+    if job.status == "done":
+        request = ItineraryRequest.model_validate(job.request_json)
+        result = dict(job.result_json or {})
+        if result.get("plan_id") is not None:
+            # 폴링한 쪽이 아니라 작업을 등록한 클라이언트로 서명
+            result["ticket"] = issue_plan_ticket(result["plan_id"], job.client_id, _plan_title(request))
+        response = ItineraryResponse(
+            ok=True,
+            meta=EchoMeta(received_at_iso=as_utc(job.created_at), echo=want_echo),
+            request=request if want_echo else None,
+            result=result,
+        )
+    status = PlanJobStatus(job_id=job.id, status=job.status, error=job.error, response=response)
+    exclude = None if want_echo else {"response": _SLIM_EXCLUDE}
+    return FastJSONResponse(status.model_dump(exclude=exclude))
 
-      # TODO: 실제 DB에 저장하는 로직으로 교체 (SQLite, Postgres 등)
-      # save_to_db(plan_id, payload)
+@router.post("/save", response_model=SavePlanResult)
+def save_plan(payload: PlanCommitPayload):
+    """
+    클라에서 온 PlanCommitPayload(ticket, itinerary)를 영구 저장.
+    - ticket 서명 검증 (generate 응답의 result.ticket)
+    - 일정은 압축 JSON 1행, 같은 ticket 재전송은 처음 저장한 id 그대로 (created=false)
+    """
+    if not payload.itinerary:
+        raise HTTPException(status_code=400, detail="itinerary is empty")
+    try:
+        saved, created = save_committed_plan(
+            payload.ticket, [it.model_dump(mode="json") for it in payload.itinerary]
+        )
+    except InvalidTicket:
+        raise HTTPException(status_code=401, detail="invalid ticket")
+    except Exception as e:
+        logger.exception("Plan save failed")
+        raise HTTPException(status_code=500, detail=str(e))
+    return SavePlanResult(id=saved["id"], saved_at=saved["created_at"], created=created)
 
-      return {"id": plan_id, "saved_at": saved_at.isoformat()}
+@router.get("/history", response_model=SavedPlanPage)
+def plan_history(
+    x_client_id: str = Header(..., max_length=64),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+):
+    """X-Client-Id로 저장한 일정 최신순 목록 (keyset 커서, 요약만)"""
+    try:
+        items, next_cursor = list_saved_plans(x_client_id, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    return SavedPlanPage(items=items, next_cursor=next_cursor)
 
-    except HTTPException:
-      raise
-    except Exception as e:
-      logger.exception("Plan save failed")
-      raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+@router.get("/{saved_id}", response_model=SavedPlanOut)
+def read_saved_plan(
+    saved_id: str = Path(..., max_length=32),
+    x_client_id: Optional[str] = Header(None, max_length=64),
+):
+    """
+    저장된 일정 1건 (LRU 캐시 우선).
+    id는 추측 불가한 public id, 클라이언트가 지정된 일정은 같은 X-Client-Id만 조회
+    """
+    saved = get_saved_plan(saved_id)
+    if saved is None or (saved["client"] and saved["client"] != x_client_id):
+        raise HTTPException(status_code=404, detail="plan not found")
+    # 저장 시 이미 검증된 본문 → 재검증 없이 그대로 직렬화 (client는 응답에서 제외)
+    return FastJSONResponse({k: v for k, v in saved.items() if k != "client"})
@@ -0,0 +1,63 @@
+# src/core/async_runner.py
+import asyncio
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Awaitable, Optional
+
+# 스레드풀(동기 라우터)·스케줄러 잡에서 공유하는 백그라운드 이벤트 루프.
+# httpx.AsyncClient 같은 루프 귀속 리소스를 요청 간에 재사용하기 위해 하나만 둔다.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def _run_forever(loop: asyncio.AbstractEventLoop) -> None:
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """백그라운드 루프를 (필요하면 생성해서) 반환"""
+    global _loop, _thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_run_forever, args=(_loop,), name="async-runner", daemon=True)
+            _thread.start()
+        return _loop
+
+
+def run_sync(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """
+    동기 코드에서 코루틴을 백그라운드 루프에 제출하고 결과를 기다림.
+    - 이벤트 루프 스레드 안에서 호출하면 교착되므로 금지
+    """
+    loop = get_loop()
+    if threading.current_thread() is _thread:
+        raise RuntimeError("run_sync()는 async-runner 스레드 안에서 호출할 수 없습니다.")
+    fut = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return fut.result(timeout=timeout)
+    except FutureTimeout:
+        fut.cancel()
+        raise
+
+
+def shutdown_loop(close_timeout: float = 5.0) -> None:
+    """on_shutdown에서 호출: 루프 정지 + 스레드 합류"""
+    global _loop, _thread
+    with _lock:
+        loop, thread = _loop, _thread
+        _loop, _thread = None, None
+    if loop is None:
+        return
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join(timeout=close_timeout)
+    if not loop.is_running():
+        loop.close()
+
+
+def submit(coro: Awaitable[Any]) -> Future:
+    """코루틴을 백그라운드 루프에 띄우고 바로 반환 (결과는 Future.result()로 합류)"""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
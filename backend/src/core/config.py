@@ -1,15 +1,85 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List, Optional
 from pathlib import Path
 
 class Settings(BaseSettings):
     APP_NAME: str = "FastAPI Starter"
     APP_VERSION: str = "0.1.0"
     CORS_ALLOW_ORIGINS: List[str] = ["*"]
+    # 일정 저장 ticket 서명 키 (.env에 꼭 지정). 비우면 프로세스마다 임의 키 → 재시작·다중 워커에서 ticket이 무효가 됨 (기동 시 경고)
+    SECRET_KEY: str = ""
     _DB_PATH = (Path(__file__).resolve().parents[2] / "data" / "app.db").as_posix()
     DATABASE_URL: str = f"sqlite:///{_DB_PATH}"
+    # 비동기 엔진 URL (비우면 DATABASE_URL에서 aiosqlite/asyncpg 드라이버로 유도)
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # 커넥션 풀 (동기·비동기 엔진 공통, SQLite 메모리 DB는 무시)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000         # 쓰기 잠금 대기 (WAL이어도 쓰기는 한 번에 하나)
     CRAWL_ON_STARTUP: bool = True
     INITIAL_CRAWL_DELAY_SECONDS: int = 5 
+    # 축제 크롤러: 호스트당 동시 요청·요청 간격(예의상 제한), 페이지 상한
+    CRAWL_MAX_PER_HOST: int = 2
+    CRAWL_HOST_DELAY_SECONDS: float = 0.5
+    CRAWL_MAX_PAGES: int = 50
+    CRAWL_TIMEOUT_SECONDS: float = 15.0
+    # Google Places (비동기 클라이언트)
+    PLACES_MAX_CONCURRENCY: int = 8          # 키워드·details 동시 요청 상한
+    PLACES_MAX_CONNECTIONS: int = 20
+    PLACES_MAX_KEEPALIVE: int = 10
+    PLACES_TIMEOUT_SECONDS: float = 10.0
+    # place details 캐시: 필드별 TTL(초) + 프로세스 LRU 크기
+    PLACE_DETAILS_TTL_SECONDS: Dict[str, int] = {
+        "name": 7 * 86400,
+        "formatted_address": 7 * 86400,
+        "vicinity": 7 * 86400,
+        "rating": 86400,
+        "opening_hours": 86400,
+    }
+    PLACE_DETAILS_LRU_SIZE: int = 5000
+    # 축제 주소 지오코딩 캐시
+    GEOCODE_TTL_SECONDS: int = 30 * 86400
+    GEOCODE_NOT_FOUND_TTL_SECONDS: int = 86400
+    GEOCODE_ERROR_RETRY_SECONDS: int = 3600     # API 오류(error)로 끝난 축제는 이만큼 지난 뒤 다시 시도
+    # 야간 후보 장소 프리페치
+    PREFETCH_DAYS_AHEAD: int = 7                # 오늘~N일 뒤와 기간이 겹치는 축제 대상
+    PLACE_SEARCH_MAX_AGE_SECONDS: int = 36 * 3600
+    # 일정 결과 캐시 (같은 요청 형태 → LLM 1회)
+    PLAN_CACHE_TTL_SECONDS: int = 600
+    PLAN_CACHE_MAX_ENTRIES: int = 512
+    # 비동기 일정 생성 작업
+    PLAN_JOB_WORKERS: int = 4                  # 동시에 도는 process_plan_sync 수
+    PLAN_JOB_MAX_PENDING: int = 100            # 대기+실행 중 작업 상한 (넘으면 503)
+    PLAN_JOB_STALE_SECONDS: int = 300          # 이보다 오래 running이면(처리하던 프로세스가 죽음) 다시 대기열로
+    PLAN_JOB_SWEEP_SECONDS: int = 60           # 남은 queued·stale running 작업 점검 주기
+    # 일정 요청·결과 저장 (write-behind 배치)
+    PLAN_PERSIST_BATCH_SIZE: int = 200          # 행 수가 이만큼 모이면 바로 flush
+    PLAN_PERSIST_FLUSH_SECONDS: float = 1.0     # 첫 행이 들어온 뒤 이 시간 안에 flush
+    PLAN_PERSIST_MAX_PENDING: int = 5000        # 큐 상한 (요청·결과 묶음 단위)
+    PLAN_PERSIST_PUT_TIMEOUT_SECONDS: float = 0.05  # 큐가 차면 이만큼만 기다리고 버림
+    PLAN_ID_BLOCK_SIZE: int = 50                # plan_id 미리 받아 두는 개수
+    # 저장된 일정 조회 캐시 (저장 후 바뀌지 않으므로 TTL 없이 LRU만)
+    SAVED_PLAN_CACHE_MAX_ENTRIES: int = 2048
+    # OpenAI 공용 클라이언트 (커넥션 풀)
+    OPENAI_MAX_CONNECTIONS: int = 20
+    OPENAI_MAX_KEEPALIVE: int = 10
+    OPENAI_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    OPENAI_HTTP2: bool = False                 # httpx[http2] 필요
+    OPENAI_TIMEOUT_SECONDS: float = 90.0       # web_search_preview 포함 응답은 수십 초 걸림
+    OPENAI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    # 프롬프트 후보 장소: 점수순으로 토큰 예산까지만
+    PROMPT_PLACES_TOKEN_BUDGET: int = 900
+    PROMPT_PLACES_MAX: int = 40
+    PROMPT_DETAILS_LIMIT: int = 40             # 실시간 검색 시 details 조회 상한 (점수 상위만)
+    # /plan/generate 응답 마감: 넘기면 LLM 대신 로컬 휴리스틱 일정 (0 이하 = 마감 없음)
+    PLAN_DEADLINE_SECONDS: float = 40.0
+    # 축제 조회 API 응답 캐시 (크롤링 세대가 바뀌면 자동 무효화)
+    FESTIVAL_CACHE_MAX_AGE_SECONDS: int = 300  # 클라이언트 Cache-Control max-age
+    FESTIVAL_CACHE_MAX_ENTRIES: int = 1024
+    # Prometheus /metrics (끄면 계측 호출이 플래그 확인만 하고 반환, /metrics는 404)
+    METRICS_ENABLED: bool = False
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,101 @@
+# src/core/http_cache.py
+import gzip
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from core.responses import dumps_json
+
+try:  # brotli는 선택 의존성 (없으면 gzip만)
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+MIN_COMPRESS_BYTES = 512   # 이보다 작으면 압축 이득보다 헤더·CPU 비용이 큼
+
+
+@dataclass
+class CachedBody:
+    """직렬화·압축을 한 번만 해 두고 요청마다 재사용하는 JSON 응답 본문"""
+    etag: str                                   # 강한 ETag ("..."), identity 본문 기준
+    last_modified: Optional[datetime]
+    bodies: Dict[str, bytes] = field(default_factory=dict)   # encoding("identity"|"gzip"|"br") → bytes
+
+    def etag_for(self, enc: str) -> str:
+        """인코딩별 강한 ETag: 바이트가 다르므로 "...-gzip"처럼 인코딩을 붙임"""
+        if enc == "identity":
+            return self.etag
+        return f'{self.etag[:-1]}-{enc}"'
+
+
+def build_cached_body(payload: Any, tag_prefix: str, last_modified: Optional[datetime] = None) -> CachedBody:
+    raw = dumps_json(payload)
+    etag = f'"{tag_prefix}-{hashlib.sha256(raw).hexdigest()[:20]}"'
+    entry = CachedBody(etag=etag, last_modified=last_modified, bodies={"identity": raw})
+    if len(raw) >= MIN_COMPRESS_BYTES:
+        entry.bodies["gzip"] = gzip.compress(raw, compresslevel=6, mtime=0)
+        if brotli is not None:
+            entry.bodies["br"] = brotli.compress(raw, quality=5)
+    return entry
+
+
+def _accepts(request: Request) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        out[name.strip().lower()] = q
+    return out
+
+
+def _pick_encoding(request: Request, entry: CachedBody) -> str:
+    accepts = _accepts(request)
+    for enc in ("br", "gzip"):
+        if enc in entry.bodies and accepts.get(enc, accepts.get("*", 0.0)) > 0:
+            return enc
+    return "identity"
+
+
+def _not_modified(request: Request, entry: CachedBody, etag: str) -> bool:
+    """etag = 이번에 보낼 인코딩의 ETag (다른 인코딩 본문의 ETag로는 304를 주지 않음)"""
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        # If-None-Match가 있으면 If-Modified-Since는 무시 (RFC 9110, 약한 비교)
+        tags = {t.strip().removeprefix("W/") for t in inm.split(",")}
+        return "*" in tags or etag in tags
+    ims = request.headers.get("if-modified-since")
+    if ims and entry.last_modified is not None:
+        try:
+            return entry.last_modified.replace(microsecond=0) <= parsedate_to_datetime(ims)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def cached_json_response(request: Request, entry: CachedBody, max_age: int) -> Response:
+    """ETag/Last-Modified 조건부 요청이면 304, 아니면 협상된 인코딩의 미리 압축된 본문"""
+    enc = _pick_encoding(request, entry)
+    headers = {
+        "ETag": entry.etag_for(enc),
+        "Cache-Control": f"public, max-age={max_age}, must-revalidate",
+        "Vary": "Accept-Encoding",
+    }
+    if entry.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(entry.last_modified, usegmt=True)
+    if _not_modified(request, entry, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if enc != "identity":
+        headers["Content-Encoding"] = enc
+    return Response(content=entry.bodies[enc], media_type="application/json", headers=headers)
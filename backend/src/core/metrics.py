@@ -0,0 +1,198 @@
+# src/core/metrics.py
+import bisect
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from core.config import settings
+
+# 외부 라이브러리 없이 Prometheus text format(0.0.4)만 내보내는 최소 구현.
+# METRICS_ENABLED=false면 모든 기록 호출이 플래그 확인 한 번으로 끝남 (/metrics도 404)
+ENABLED: bool = settings.METRICS_ENABLED
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_registry: List["_Metric"] = []
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(v: float) -> str:
+    f = float(v)
+    if f == float("inf"):
+        return "+Inf"
+    return str(int(f)) if f.is_integer() and abs(f) < 1e15 else repr(f)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key))
+        if extra is not None:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, doc, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if not ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return super().render() + [f"{self.name}{self._labels(k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        if not ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class _Timer:
+    """with 블록 소요 시간을 히스토그램에 기록 (+ 선택적으로 결과 카운터 outcome=ok|error)"""
+    __slots__ = ("_hist", "_counter", "_labels", "_t0")
+
+    def __init__(self, hist: "Histogram", counter: Optional[Counter], labels: Dict[str, str]):
+        self._hist, self._counter, self._labels = hist, counter, labels
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._hist.observe(time.perf_counter() - self._t0, **self._labels)
+        if self._counter is not None:
+            self._counter.inc(outcome="error" if exc_type else "ok", **self._labels)
+        return False
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopTimer()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, doc, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key → [버킷별 개수..., 합계, 전체 개수]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        if not ENABLED:
+            return
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            if i < len(self.buckets):
+                row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def time(self, counter: Optional[Counter] = None, **labels: str):
+        """with HIST.time(stage="llm"): ... (counter를 주면 outcome 라벨로 성공/실패도 셈)"""
+        if not ENABLED:
+            return _NOOP
+        return _Timer(self, counter, labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        out = super().render()
+        for key, row in items:
+            acc = 0.0
+            for b, n in zip(self.buckets, row):
+                acc += n
+                out.append(f"{self.name}_bucket{self._labels(key, ('le', _fmt(b)))} {_fmt(acc)}")
+            out.append(f"{self.name}_bucket{self._labels(key, ('le', '+Inf'))} {_fmt(row[-1])}")
+            out.append(f"{self.name}_sum{self._labels(key)} {_fmt(row[-2])}")
+            out.append(f"{self.name}_count{self._labels(key)} {_fmt(row[-1])}")
+        return out
+
+
+def render_latest() -> str:
+    lines: List[str] = []
+    for m in _registry:
+        lines.extend(m.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---- 앱 공용 지표 ----
+PLAN_STAGE_SECONDS = Histogram(
+    "plan_stage_seconds", "Latency of each /plan/generate stage (process_plan_sync, FestPlanner.suggest_plan)", ["stage"],
+)
+PLAN_RESULTS = Counter("plan_results_total", "Generated plans by source (llm|local|error)", ["source"])
+
+GOOGLE_REQUEST_SECONDS = Histogram("google_api_request_seconds", "Google Maps API call latency", ["endpoint"])
+GOOGLE_REQUESTS = Counter("google_api_requests_total", "Google Maps API calls by outcome (ok|error|lowercased JSON status such as over_query_limit)", ["outcome", "endpoint"])
+
+OPENAI_REQUEST_SECONDS = Histogram("openai_request_seconds", "OpenAI API call latency (streams: time spent waiting on upstream events only)", ["call"])
+OPENAI_REQUESTS = Counter("openai_requests_total", "OpenAI API calls by outcome (ok|error|cancelled)", ["outcome", "call"])
+OPENAI_TOKENS = Counter("openai_tokens_total", "OpenAI token usage reported by the API", ["call", "kind"])
+
+CRAWL_SECONDS = Histogram(
+    "crawl_duration_seconds", "Festival crawl + upsert duration", buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+CRAWL_ROWS = Counter("crawl_rows_total", "Festival rows by upsert result (fetched|inserted|updated|unchanged)", ["result"])
+CRAWL_PAGES = Counter("crawl_pages_total", "Crawled list pages by conditional fetch result", ["result"])
+CRAWL_LAST_SUCCESS = Gauge("crawl_last_success_timestamp_seconds", "Unix time of the last successful crawl")
+
+
+def record_openai_usage(call: str, response) -> None:
+    """responses API 응답의 usage(input/output 토큰) 누적 (usage 없으면 무시)"""
+    if not ENABLED:
+        return
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    for kind in ("input_tokens", "output_tokens"):
+        n = getattr(usage, kind, None)
+        if n:
+            OPENAI_TOKENS.inc(n, call=call, kind=kind.split("_")[0])
@@ -0,0 +1,39 @@
+# src/core/responses.py
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:  # orjson은 선택 의존성 (없으면 표준 json)
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    # orjson이 직접 못 다루는 값(pydantic 모델, Url 등)만 여기로 옴
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    return jsonable_encoder(obj)
+
+
+def dumps_json(content: Any) -> bytes:
+    """응답용 JSON 직렬화 (UTF-8 그대로, 공백 없음). datetime·date는 ISO 8601"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    orjson 기반 JSONResponse.
+    라우트에서 이미 검증된 모델/dict를 이 응답으로 직접 돌려주면
+    response_model 재검증·jsonable_encoder 단계를 건너뜀.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
@@ -1,8 +1,11 @@
 # src/core/security.py
-import base64, hmac, json, hashlib
+import base64, hmac, json, hashlib, secrets
 from typing import Any, Dict
 from core.config import settings
 
+# SECRET_KEY 미지정 시 이 프로세스에서만 유효한 임의 키 (on_startup에서 경고)
+_KEY = (settings.SECRET_KEY or secrets.token_urlsafe(32)).encode()
+
 def _b64(data: bytes) -> str:
     return base64.urlsafe_b64encode(data).decode().rstrip("=")
 
@@ -16,7 +19,7 @@ def sign_ticket(payload: Dict[str, Any]) -> str:
     서버는 상태 저장 안 하고, 클라가 이 ticket을 들고 다시 오면 저장.
     """
     body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
-    sig = hmac.new(settings.SECRET_KEY.encode(), body, hashlib.sha256).digest()
+    sig = hmac.new(_KEY, body, hashlib.sha256).digest()
     return _b64(body) + "." + _b64(sig)
 
 def verify_ticket(ticket: str) -> Dict[str, Any]:
@@ -30,7 +33,7 @@ def verify_ticket(ticket: str) -> Dict[str, Any]:
 
     body = _unb64(body_b64)
     sig = _unb64(sig_b64)
-    exp = hmac.new(settings.SECRET_KEY.encode(), body, hashlib.sha256).digest()
+    exp = hmac.new(_KEY, body, hashlib.sha256).digest()
     if not hmac.compare_digest(sig, exp):
         raise ValueError("invalid ticket signature")
 
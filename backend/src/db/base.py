@@ -1,15 +1,52 @@
 # src/db/base.py
-from sqlalchemy import create_engine
+import threading
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from core.config import settings
 
 class Base(DeclarativeBase):
     pass
 
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+def _is_sqlite_memory(url: str) -> bool:
+    return _is_sqlite(url) and make_url(url).database in (None, "", ":memory:")
+
 def _engine_kwargs(url: str):
-    if url.startswith("sqlite"):
+    if _is_sqlite_memory(url):
+        # 메모리 DB는 연결마다 다른 DB라 풀 설정 의미 없음 (SQLAlchemy 기본 StaticPool/SingletonThreadPool)
         return {"connect_args": {"check_same_thread": False}}
-    return {}
+    kwargs = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
+    if _is_sqlite(url):
+        kwargs["connect_args"] = {"check_same_thread": False}
+    return kwargs
+
+def _install_sqlite_pragmas(target: Engine) -> None:
+    """
+    SQLite 연결마다:
+    - WAL: 쓰기 중에도 읽기가 막히지 않음 (크롤러 upsert ↔ 조회 API)
+    - busy_timeout: 쓰기 잠금 경합 시 바로 'database is locked' 대신 대기
+    - synchronous=NORMAL: WAL에선 안전하면서 커밋마다 fsync 안 함
+    """
+    @event.listens_for(target, "connect")
+    def _on_connect(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        try:
+            cur.execute("PRAGMA journal_mode=WAL")
+            cur.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+            cur.execute("PRAGMA synchronous=NORMAL")
+        finally:
+            cur.close()
 
 engine = create_engine(
     settings.DATABASE_URL,
@@ -17,4 +54,61 @@ engine = create_engine(
     pool_pre_ping=True,
     **_engine_kwargs(settings.DATABASE_URL),
 )
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
\ No newline at end of file
+if _is_sqlite(settings.DATABASE_URL):
+    _install_sqlite_pragmas(engine)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+# ---- 비동기 엔진 (async 라우터/리포지토리용) ----
+# 드라이버(aiosqlite/asyncpg)는 처음 쓸 때만 로드 → 동기 경로만 쓰는 배치·마이그레이션엔 영향 없음
+# 주의: 요청을 처리하는 이벤트 루프(uvicorn)에서만 사용 (core.async_runner 백그라운드 루프와 섞지 않음)
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    """동기 DATABASE_URL → 비동기 드라이버 URL (이미 비동기 드라이버면 그대로)"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    u = make_url(url)
+    backend = u.get_backend_name()
+    if backend not in _ASYNC_DRIVERS or u.drivername in ("sqlite+aiosqlite", "postgresql+asyncpg"):
+        return url
+    return u.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+_async_engine: Optional[AsyncEngine] = None
+_async_sessionmaker: Optional[async_sessionmaker] = None
+_async_lock = threading.Lock()
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine, _async_sessionmaker
+    with _async_lock:
+        if _async_engine is None:
+            url = async_database_url(settings.DATABASE_URL)
+            kwargs = _engine_kwargs(url)
+            if _is_sqlite(url):
+                kwargs.pop("connect_args", None)  # aiosqlite는 자체 스레드에서 연결을 씀
+            _async_engine = create_async_engine(url, echo=False, pool_pre_ping=True, **kwargs)
+            if _is_sqlite(url):
+                _install_sqlite_pragmas(_async_engine.sync_engine)
+            _async_sessionmaker = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+        return _async_engine
+
+def AsyncSessionLocal() -> AsyncSession:
+    """SessionLocal()의 비동기 버전: async with AsyncSessionLocal() as s: ..."""
+    get_async_engine()
+    return _async_sessionmaker()
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """FastAPI 의존성: Depends(get_async_db)"""
+    async with AsyncSessionLocal() as s:
+        yield s
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_sessionmaker
+    with _async_lock:
+        eng, _async_engine, _async_sessionmaker = _async_engine, None, None
+    if eng is not None:
+        await eng.dispose()
@@ -18,9 +18,20 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+# 모델 밖에서 관리하는 검색 객체 (services/festival_search, 7f5b2d0c8e14 마이그레이션)
+# → autogenerate가 "모델에 없음"으로 보고 DROP을 만들지 않도록 비교에서 제외
+def include_object(obj, name, type_, reflected, compare_to):
+    if type_ == "table" and name and name.startswith("festival_fts"):
+        return False
+    if type_ == "index" and name == "ix_festival_search_trgm":
+        return False
+    return True
+
 def run_migrations_offline():
     url = config.get_main_option("sqlalchemy.url")
-    context.configure(url=url, target_metadata=target_metadata, literal_binds=True)
+    context.configure(
+        url=url, target_metadata=target_metadata, literal_binds=True, include_object=include_object,
+    )
     with context.begin_transaction():
         context.run_migrations()
 
@@ -31,7 +42,7 @@ def run_migrations_online():
         poolclass=pool.NullPool,
     )
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
         with context.begin_transaction():
             context.run_migrations()
 
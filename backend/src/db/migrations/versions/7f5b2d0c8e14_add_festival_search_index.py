@@ -0,0 +1,51 @@
+"""add festival search index
+
+Revision ID: 7f5b2d0c8e14
+Revises: e2a7c4b91f38
+Create Date: 2026-10-18 16:41:55.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f5b2d0c8e14'
+down_revision: Union[str, Sequence[str], None] = 'e2a7c4b91f38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# services.festival_search.COMPACT_SQL 과 같은 식이어야 인덱스를 탐
+COMPACT_SQL = "replace(coalesce(title, '') || coalesce(address, '') || coalesce(period_raw, ''), ' ', '')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_festival_search_trgm ON festival "
+            f"USING gin (({COMPACT_SQL}) gin_trgm_ops) WHERE is_latest"
+        )
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS festival_fts "
+            "USING fts5(title, address, period_raw, compact, tokenize='trigram')"
+        )
+        op.execute(
+            "INSERT INTO festival_fts(rowid, title, address, period_raw, compact) "
+            f"SELECT id, title, coalesce(address, ''), coalesce(period_raw, ''), {COMPACT_SQL} "
+            "FROM festival WHERE is_latest"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_festival_search_trgm")
+    elif dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS festival_fts")
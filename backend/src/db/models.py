@@ -2,7 +2,7 @@
 
 from typing import Optional
 from datetime import date, datetime
-from sqlalchemy import String, Text, Date, DateTime, func, UniqueConstraint, Index, JSON, Boolean, Integer, ForeignKey
+from sqlalchemy import String, Text, Date, DateTime, func, UniqueConstraint, Index, JSON, Boolean, Integer, ForeignKey, Float, LargeBinary, true
 from sqlalchemy.orm import Mapped, mapped_column
 from db.base import Base
 
@@ -14,19 +14,67 @@ class Festival(Base):
     period_start: Mapped[Optional[date]] = mapped_column(Date)
     period_end:   Mapped[Optional[date]] = mapped_column(Date)
     address:   Mapped[Optional[str]] = mapped_column(String(300))
+    region:    Mapped[Optional[str]] = mapped_column(String(40))   # 주소의 시·군 ("춘천시"), 목록 필터용
     image_src: Mapped[Optional[str]] = mapped_column(Text)
     image_alt: Mapped[Optional[str]] = mapped_column(String(300))
     detail_url: Mapped[Optional[str]] = mapped_column(Text)
     published_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # 크롤 시점에 주소를 미리 지오코딩해 둔 좌표 (plan 요청 시 외부 호출 생략)
+    lat: Mapped[Optional[float]] = mapped_column(Float)
+    lng: Mapped[Optional[float]] = mapped_column(Float)
+    geocode_status: Mapped[str] = mapped_column(String(16), nullable=False, default="pending", server_default="pending")  # pending | ok | not_found | error
+    geocoded_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    # 같은 detail_url(같은 축제)의 스냅샷 중 가장 최근 크롤에서 본 행만 True (upsert_festivals가 같은 트랜잭션에서 유지)
+    is_latest: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True, server_default=true())
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     __table_args__ = (
         UniqueConstraint("hash", name="uq_festival_hash"),
+        Index("ix_festival_geocode_status", "geocode_status"),
+        # 목록 정렬(period_start DESC, created_at DESC, id DESC) keyset 페이지용
+        Index("ix_festival_latest_order", "is_latest", "period_start", "created_at", "id"),
+        Index("ix_festival_latest_region_order", "is_latest", "region", "period_start", "created_at", "id"),
+        Index("ix_festival_detail_url", "detail_url"),
         Index("ix_festival_period_start", "period_start"),
         Index("ix_festival_created_at", "created_at"),
     )
 
+class PlaceDetail(Base):
+    """Google place details 캐시 (place_id 단위, 필드별 조회 시각 보관)"""
+    __tablename__ = "place_detail"
+    place_id: Mapped[str] = mapped_column(String(300), primary_key=True)
+    name: Mapped[Optional[str]] = mapped_column(String(300))
+    formatted_address: Mapped[Optional[str]] = mapped_column(String(300))
+    vicinity: Mapped[Optional[str]] = mapped_column(String(300))
+    rating: Mapped[Optional[float]] = mapped_column(Float)
+    opening_hours: Mapped[Optional[dict]] = mapped_column(JSON)
+    field_fetched_at: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)  # {"rating": epoch초, ...}
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class PlaceSearch(Base):
+    """nearbysearch 결과 저장소 (위치·키워드·반경 단위, 야간 프리페치로 채움)"""
+    __tablename__ = "place_search"
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    location_key: Mapped[str] = mapped_column(String(64), nullable=False)   # 소수 5자리로 반올림한 "lat,lng"
+    keyword: Mapped[str] = mapped_column(String(100), nullable=False)
+    radius_m: Mapped[int] = mapped_column(Integer, nullable=False)
+    festival_id: Mapped[Optional[int]] = mapped_column(Integer, index=True)
+    places_json: Mapped[list] = mapped_column(JSON, nullable=False)        # [Place dict, ...]
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    __table_args__ = (
+        UniqueConstraint("location_key", "keyword", "radius_m", name="uq_place_search_key"),
+    )
+
+class GeocodeCache(Base):
+    """정규화된 주소 문자열 → 좌표("lat,lng") 캐시"""
+    __tablename__ = "geocode_cache"
+    key: Mapped[str] = mapped_column(String(300), primary_key=True)    # normalize_address() 결과
+    query_text: Mapped[str] = mapped_column(String(300), nullable=False)  # 최초 조회에 쓴 원문
+    coords: Mapped[Optional[str]] = mapped_column(String(64))          # 못 찾으면 NULL
+    status: Mapped[str] = mapped_column(String(16), nullable=False)    # 'ok' | 'not_found'
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 class PlanRequest(Base):
     __tablename__ = "plan_request"
 
@@ -53,4 +101,64 @@ class PlanItineraryItem(Base):
     end_time:   Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     description: Mapped[str]  = mapped_column(String(1000), nullable=False, default="")
 
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+class PlanJob(Base):
+    """비동기 일정 생성 작업 (POST /plan/jobs → 폴링). 재시작 후에도 이어서 처리"""
+    __tablename__ = "plan_job"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)   # uuid4 hex
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued")  # queued | running | done | failed
+    request_json: Mapped[dict] = mapped_column(JSON, nullable=False)     # ItineraryRequest(mode="json")
+    client_id: Mapped[Optional[str]] = mapped_column(String(64))         # 등록 시 X-Client-Id (저장 ticket 서명용)
+    result_json: Mapped[Optional[dict]] = mapped_column(JSON)            # process_plan_sync() 결과
+    error: Mapped[Optional[str]] = mapped_column(Text)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    __table_args__ = (
+        Index("ix_plan_job_status_updated_at", "status", "updated_at"),
+    )
+
+class CrawlPage(Base):
+    """크롤 대상 URL별 조건부 요청 검증자 + 본문 해시 + 파싱 결과 (304/본문 동일 시 재파싱 생략)"""
+    __tablename__ = "crawl_page"
+
+    url: Mapped[str] = mapped_column(String(500), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)        # 'list' | 'detail'
+    etag: Mapped[Optional[str]] = mapped_column(String(200))
+    last_modified: Mapped[Optional[str]] = mapped_column(String(64))    # 응답 헤더 원문 그대로 되돌려 보냄
+    body_hash: Mapped[Optional[str]] = mapped_column(String(64))        # sha256(본문)
+    parsed_json: Mapped[Optional[dict]] = mapped_column(JSON)           # list: {"items", "pages"} / detail: {필드}
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+class AppMeta(Base):
+    """프로세스 간 공유하는 작은 카운터 (예: festival_generation = 축제 데이터 세대, 크롤러가 올림)"""
+    __tablename__ = "app_meta"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class SavedPlan(Base):
+    """
+    /plan/save로 확정된 일정 (계획당 1행).
+    itinerary는 항목 행 대신 압축 JSON 한 덩어리, 같은 ticket 재전송은 ticket_hash로 중복 방지
+    """
+    __tablename__ = "saved_plan"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)   # 내부용 (정렬·커서 비교)
+    public_id: Mapped[str] = mapped_column(String(32), nullable=False, unique=True)   # 외부 노출 id (token_urlsafe)
+    ticket_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)   # sha256(ticket)
+    plan_request_id: Mapped[Optional[int]] = mapped_column(Integer)   # ticket의 plan_id (write-behind라 FK 없음)
+    client: Mapped[Optional[str]] = mapped_column(String(64))         # X-Client-Id (ticket에 서명되어 옴)
+    title: Mapped[str] = mapped_column(String(300), nullable=False, default="")
+    item_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    itinerary_z: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)   # zlib(JSON 배열)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # 클라이언트별 최신순 keyset 목록
+        Index("ix_saved_plan_client_created", "client", "created_at", "id"),
+    )
@@ -1,5 +1,5 @@
 # src/schemas/plan.py
-from typing import List, Literal, Optional, Any, Dict
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field, HttpUrl, AwareDatetime
 
 SchemaLiteral = Literal["itinerary_request_v1"]
@@ -41,11 +41,41 @@ class EchoMeta(BaseModel):
     received_at_iso: AwareDatetime
     echo: bool = True
 
+# ⬇️ /plan/generate 결과 (process_plan_sync 반환 형태)
+PlanSourceLiteral = Literal["llm", "local"]
+
+class PlanResultItem(BaseModel):
+    index: int
+    type: str
+    title: str
+    start_time: str   # KST ISO 문자열 (정규화된 LLM 출력 그대로)
+    end_time: str
+    description: str = ""
+
+class PlanResultSchedule(BaseModel):
+    title: str
+    start_at_kst: str
+    end_at_kst: str
+    stay_minutes: int
+
+class PlanResultOptions(BaseModel):
+    budget: BudgetLiteral
+    categories: List[str] = []
+    notes: Optional[str] = None
+
+class PlanResult(BaseModel):
+    plan_id: int
+    schedule: Optional[PlanResultSchedule] = None   # echo=false면 생략
+    options: Optional[PlanResultOptions] = None     # echo=false면 생략
+    itinerary: List[PlanResultItem] = []
+    source: PlanSourceLiteral = "llm"               # local = 마감 초과 시 휴리스틱 대체
+    ticket: Optional[str] = None                    # /plan/save에 그대로 보내는 서명 토큰
+
 class ItineraryResponse(BaseModel):
     ok: bool = True
     meta: EchoMeta
-    request: ItineraryRequest
-    result: Dict[str, Any] | None = None  # ← Any 허용
+    request: Optional[ItineraryRequest] = None   # echo=false면 생략
+    result: Optional[PlanResult] = None
 
 # ⬇️ 저장(커밋) 요청 스키마: ticket + itinerary 배열
 class ItineraryItem(BaseModel):
@@ -59,3 +89,37 @@ class ItineraryItem(BaseModel):
 class PlanCommitPayload(BaseModel):
     ticket: str  # sign_ticket() 결과
     itinerary: List[ItineraryItem] = []
+
+# ⬇️ 저장된 일정 조회: POST /plan/save → GET /plan/{id}, GET /plan/history
+class SavePlanResult(BaseModel):
+    id: str   # 저장 일정 public id (GET /plan/{id})
+    saved_at: AwareDatetime
+    created: bool = True   # False = 같은 ticket으로 이미 저장된 일정
+
+class SavedPlanSummary(BaseModel):
+    id: str
+    plan_id: Optional[int] = None   # 생성 시 plan_request id
+    title: str
+    item_count: int
+    created_at: AwareDatetime
+
+class SavedPlanOut(SavedPlanSummary):
+    itinerary: List[ItineraryItem] = []
+
+class SavedPlanPage(BaseModel):
+    items: List[SavedPlanSummary]
+    next_cursor: Optional[str] = None
+
+# ⬇️ 비동기 작업 모드: POST /plan/jobs → GET /plan/jobs/{id} 폴링
+JobStatusLiteral = Literal["queued", "running", "done", "failed"]
+
+class PlanJobAccepted(BaseModel):
+    job_id: str
+    status: JobStatusLiteral
+    poll_url: str
+
+class PlanJobStatus(BaseModel):
+    job_id: str
+    status: JobStatusLiteral
+    error: Optional[str] = None
+    response: Optional[ItineraryResponse] = None  # status == "done" 일 때만
@@ -0,0 +1,66 @@
+# src/services/ai_client.py
+import logging
+import threading
+from typing import Optional
+
+import certifi
+import httpx
+from openai import OpenAI
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 공용 OpenAI 클라이언트 (앱 lifespan에서 생성/종료)
+_client: Optional[OpenAI] = None
+_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401  (httpx[http2] 설치 시에만 존재)
+    except ImportError:
+        return False
+    return True
+
+
+def _build_http_client() -> httpx.Client:
+    http2 = settings.OPENAI_HTTP2 and _http2_available()
+    if settings.OPENAI_HTTP2 and not http2:
+        logger.warning("OPENAI_HTTP2=true 이지만 h2 패키지가 없어 HTTP/1.1로 동작합니다.")
+    return httpx.Client(
+        verify=certifi.where(),   # CA 번들은 프로세스당 한 번만 로드
+        http2=http2,
+        timeout=httpx.Timeout(settings.OPENAI_TIMEOUT_SECONDS, connect=settings.OPENAI_CONNECT_TIMEOUT_SECONDS),
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE,
+            keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+
+def init_openai_client(api_key: str) -> Optional[OpenAI]:
+    """on_startup에서 호출. 이미 있으면 그대로 반환 (키가 없으면 None)"""
+    global _client
+    if not api_key:
+        logger.warning("OPENAI_API_KEY가 설정되지 않아 OpenAI 클라이언트를 만들지 않습니다.")
+        return None
+    with _lock:
+        if _client is None:
+            _client = OpenAI(api_key=api_key, http_client=_build_http_client())
+        return _client
+
+
+def get_openai_client(api_key: str) -> Optional[OpenAI]:
+    """공용 클라이언트 (lifespan 밖 — 스크립트/스케줄러 — 에서 쓰면 지연 생성)"""
+    return _client or init_openai_client(api_key)
+
+
+def close_openai_client() -> None:
+    """on_shutdown에서 호출: 커넥션 풀 정리"""
+    global _client
+    with _lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
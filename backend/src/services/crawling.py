@@ -1,15 +1,28 @@
 from __future__ import annotations
+import asyncio
 import hashlib
+import logging
 import re
-from datetime import datetime, date
-from typing import List, Tuple, Optional
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, date, timedelta, timezone
+from typing import Callable, Dict, List, Tuple, Optional
 
-import requests
+import httpx
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from sqlalchemy import insert, or_, select, update
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl
 
+from core.async_runner import run_sync
+from core.config import settings
+from core.metrics import CRAWL_LAST_SUCCESS, CRAWL_PAGES, CRAWL_ROWS, CRAWL_SECONDS
+from core.scheduler import scheduler
 from db.base import SessionLocal
-from db.models import Festival
+from db.models import CrawlPage, Festival
+from services.festival_cache import bump_festival_generation
+from services.festival_search import sync_festival_search
+
+logger = logging.getLogger(__name__)
 
 BASE_URL = "https://www.gangwon.to"
 LIST_URL = "https://www.gangwon.to/gwtour/now/festival"
@@ -43,15 +56,21 @@ def parse_period(period_raw: Optional[str]) -> Tuple[Optional[date], Optional[da
     y1, m1, d1, y2, m2, d2 = m.groups()
     return _to_date(y1, m1, d1), _to_date(y2, m2, d2)
 
-# ----[2] 리스트 페이지 파싱 ----
-def parse_list_page(url: str) -> List[dict]:
-    resp = requests.get(url, headers=HEADERS, timeout=15)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+# ----[1-1] 지역(시·군) 추출: "강원특별자치도 춘천시 공지로" → "춘천시" ----
+_REGION_PATTERN = re.compile(r"([가-힣]+(?:시|군))(?=\s|$)")
+
+def extract_region(address: Optional[str]) -> Optional[str]:
+    m = _REGION_PATTERN.search(address or "")
+    return m.group(1) if m else None
+
+# ----[2] 리스트/상세 페이지 파싱 (HTML → dict, 네트워크 X) ----
+def parse_list_html(html: str, url: str) -> dict:
+    """리스트 페이지 → {"items": [축제...], "pages": [같은 목록의 다른 페이지 URL...]}"""
+    soup = BeautifulSoup(html, "html.parser")
 
     container = soup.select_one("div.now-list.list-type-col4.clearfix")
     if not container:
-        return []
+        return {"items": [], "pages": []}
 
     items = []
     for a in container.select("a[href]"):
@@ -84,58 +103,439 @@ def parse_list_page(url: str) -> List[dict]:
                 "detail_url": detail_url,
             }
         )
-    return items
+    return {"items": items, "pages": _page_links(soup, url)}
+
+def _page_links(soup: BeautifulSoup, url: str) -> List[str]:
+    """페이징 영역(class에 'pag' 포함)의 같은 호스트 링크 중 쿼리에 page가 들어간 것만"""
+    host = urlsplit(url).netloc
+    pages = []
+    for a in soup.select("[class*=pag] a[href]"):
+        href = urljoin(url, a["href"].strip())
+        parts = urlsplit(href)
+        if parts.scheme not in ("http", "https") or parts.netloc != host:
+            continue  # javascript:, 외부 링크
+        if not any("page" in k.lower() for k, _ in parse_qsl(parts.query)):
+            continue
+        href = urlunsplit(parts._replace(fragment=""))
+        if href not in pages:
+            pages.append(href)
+    return pages
+
+_DETAIL_LABELS = ("주소", "장소", "위치", "개최장소", "행사장소")
+
+def parse_detail_html(html: str, url: str) -> dict:
+    """상세 페이지 → 리스트에 없을 수 있는 보조 필드 (address, image_src)"""
+    soup = BeautifulSoup(html, "html.parser")
+    out = {}
+    og = soup.select_one('meta[property="og:image"]')
+    if og and og.get("content"):
+        out["image_src"] = urljoin(url, og["content"].strip())
+    for label in soup.select("th, dt, strong, em"):
+        if label.get_text(strip=True) not in _DETAIL_LABELS:
+            continue
+        value = label.find_next_sibling(["td", "dd", "span", "p"])
+        txt = value.get_text(" ", strip=True) if value else ""
+        if txt:
+            out["address"] = txt
+            break
+    return out
+
+# ----[2-1] 조건부·동시 수집 (호스트당 동시 요청/간격 제한) ----
+class HostLimiter:
+    """호스트별 동시 요청 수 + 요청 시작 최소 간격 (대상 사이트 부담 제한)"""
+
+    def __init__(self, per_host: int, delay_seconds: float):
+        self.per_host = per_host
+        self.delay = delay_seconds
+        self._sems: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._next_at: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        host = urlsplit(url).netloc
+        sem = self._sems.setdefault(host, asyncio.Semaphore(self.per_host))
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with sem:
+            async with lock:
+                loop = asyncio.get_running_loop()
+                wait = self._next_at.get(host, 0.0) - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._next_at[host] = loop.time() + self.delay
+            yield
+
+class ConditionalFetcher:
+    """
+    URL별 검증자(ETag/Last-Modified)로 조건부 GET.
+    - 304 → 저장된 파싱 결과 재사용
+    - 200이어도 본문 해시가 같으면 파싱 생략
+    pages: url → CrawlPage 행 dict (미리 로드, 갱신분은 그대로 dict에 반영 → 호출 측이 저장)
+    """
+
+    def __init__(self, http: httpx.AsyncClient, limiter: HostLimiter, pages: Dict[str, dict]):
+        self.http = http
+        self.limiter = limiter
+        self.pages = pages
+        self.dirty: set = set()
+        self.stats = {"requests": 0, "not_modified": 0, "unchanged": 0, "parsed": 0}
+
+    async def fetch(self, url: str, kind: str, parse: Callable[[str, str], dict]) -> dict:
+        prev = self.pages.get(url)
+        headers = dict(HEADERS)
+        if prev and prev.get("parsed_json") is not None:
+            if prev.get("etag"):
+                headers["If-None-Match"] = prev["etag"]
+            if prev.get("last_modified"):
+                headers["If-Modified-Since"] = prev["last_modified"]
+
+        async with self.limiter.slot(url):
+            self.stats["requests"] += 1
+            resp = await self.http.get(url, headers=headers)
+
+        now = datetime.now(tz=timezone.utc)
+        if resp.status_code == 304 and prev and prev.get("parsed_json") is not None:
+            self.stats["not_modified"] += 1
+            prev["fetched_at"] = now
+            self.dirty.add(url)
+            return prev["parsed_json"]
+        resp.raise_for_status()
+
+        body_hash = hashlib.sha256(resp.content).hexdigest()
+        if prev and prev.get("body_hash") == body_hash and prev.get("parsed_json") is not None:
+            self.stats["unchanged"] += 1
+            parsed = prev["parsed_json"]
+        else:
+            self.stats["parsed"] += 1
+            parsed = parse(resp.text, url)
+        self.pages[url] = {
+            "url": url,
+            "kind": kind,
+            "etag": resp.headers.get("etag"),
+            "last_modified": resp.headers.get("last-modified"),
+            "body_hash": body_hash,
+            "parsed_json": parsed,
+            "fetched_at": now,
+        }
+        self.dirty.add(url)
+        return parsed
+
+def _load_crawl_pages(kind: str, urls: Optional[List[str]] = None) -> Dict[str, dict]:
+    cols = ("url", "kind", "etag", "last_modified", "body_hash", "parsed_json", "fetched_at")
+    with SessionLocal() as s:
+        q = s.query(CrawlPage).filter(CrawlPage.kind == kind)
+        if urls is not None:
+            if not urls:
+                return {}
+            q = q.filter(CrawlPage.url.in_(urls))
+        return {p.url: {c: getattr(p, c) for c in cols} for p in q.all()}
+
+def _save_crawl_pages(fetcher: ConditionalFetcher) -> None:
+    if not fetcher.dirty:
+        return
+    with SessionLocal() as s:
+        for url in fetcher.dirty:
+            s.merge(CrawlPage(**fetcher.pages[url]))
+        s.commit()
+
+def _http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=settings.CRAWL_TIMEOUT_SECONDS,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=settings.CRAWL_MAX_PER_HOST * 2),
+    )
+
+async def _crawl_list_pages(fetcher: ConditionalFetcher, start_url: str, max_pages: int) -> Tuple[List[dict], int]:
+    """첫 페이지부터 페이징 링크를 따라 너비 우선으로 (같은 깊이는 동시에) 수집"""
+    seen = {start_url}
+    frontier = [start_url]
+    items: List[dict] = []
+    while frontier:
+        results = await asyncio.gather(
+            *(fetcher.fetch(u, "list", parse_list_html) for u in frontier), return_exceptions=True
+        )
+        next_frontier = []
+        for url, res in zip(frontier, results):
+            if isinstance(res, Exception):
+                if url == start_url:
+                    raise res
+                logger.warning("[CRAWL] list page 실패 %s: %r", url, res)
+                continue
+            items.extend(res.get("items") or [])
+            for page in res.get("pages") or []:
+                if page not in seen and len(seen) < max_pages:
+                    seen.add(page)
+                    next_frontier.append(page)
+        frontier = next_frontier
+
+    uniq: Dict[str, dict] = {}
+    for it in items:  # 페이지 경계에서 같은 항목이 겹칠 수 있음
+        uniq.setdefault(it["detail_url"] or make_hash(it["title"], "", it["period"]), it)
+    return list(uniq.values()), len(seen)
+
+async def _crawl_details(fetcher: ConditionalFetcher, rows: List[dict]) -> int:
+    """상세 페이지는 새로 생겼거나 바뀐 항목만: 리스트에 비어 있는 필드만 보충"""
+    async def one(r: dict) -> bool:
+        try:
+            detail = await fetcher.fetch(r["detail_url"], "detail", parse_detail_html)
+        except Exception as e:
+            logger.warning("[CRAWL] detail 실패 %s: %r", r["detail_url"], e)
+            return False
+        for k, v in detail.items():
+            if v and not r.get(k):
+                r[k] = v
+        return True
+
+    done = await asyncio.gather(*(one(r) for r in rows))
+    return sum(done)
+
+def _complete_hashes(hashes: List[str]) -> set:
+    """
+    DB에 있고 상세까지 채워진 항목의 해시: 주소가 있고 상세 페이지가 crawl_page에 저장됨.
+    (상세 요청이 실패했던 항목은 여기서 빠져 다음 크롤 때 다시 받음)
+    """
+    out: set = set()
+    with SessionLocal() as s:
+        for chunk in _chunks(hashes, UPSERT_CHUNK):
+            out.update(
+                h for (h,) in s.query(Festival.hash)
+                .join(CrawlPage, (CrawlPage.url == Festival.detail_url) & (CrawlPage.kind == "detail"))
+                .filter(Festival.hash.in_(chunk), Festival.address.isnot(None), Festival.address != "")
+                .all()
+            )
+    return out
+
+def crawl_festival_rows(start_url: str = LIST_URL) -> Tuple[List[dict], dict]:
+    """
+    리스트(페이징 포함) → 새/변경 항목만 상세 보충 → (rows, 통계).
+    DB 접근은 이 함수(호출 스레드)에서, 네트워크는 백그라운드 루프에서.
+    """
+    limiter = HostLimiter(settings.CRAWL_MAX_PER_HOST, settings.CRAWL_HOST_DELAY_SECONDS)
+
+    async def _lists(pages: Dict[str, dict]):
+        async with _http_client() as http:
+            fetcher = ConditionalFetcher(http, limiter, pages)
+            rows, n_pages = await _crawl_list_pages(fetcher, start_url, settings.CRAWL_MAX_PAGES)
+            return fetcher, rows, n_pages
+
+    list_fetcher, rows, n_pages = run_sync(_lists(_load_crawl_pages("list")))
+    _save_crawl_pages(list_fetcher)
+
+    # 해시(title|detail_url|period)가 DB에 없으면 새로 생겼거나 바뀐 항목,
+    # 있어도 주소가 비었거나 상세 페이지를 못 받았던 항목은 다시 (조건부 요청이라 대개 304)
+    known = _complete_hashes([make_hash(r["title"], r["detail_url"], r["period"]) for r in rows])
+    changed = [
+        r for r in rows
+        if r.get("detail_url") and make_hash(r["title"], r["detail_url"], r["period"]) not in known
+    ]
+
+    async def _details(pages: Dict[str, dict]):
+        async with _http_client() as http:
+            fetcher = ConditionalFetcher(http, limiter, pages)
+            return fetcher, await _crawl_details(fetcher, changed)
+
+    details_fetched = 0
+    if changed:
+        detail_fetcher, details_fetched = run_sync(
+            _details(_load_crawl_pages("detail", [r["detail_url"] for r in changed]))
+        )
+        _save_crawl_pages(detail_fetcher)
+
+    stats = dict(list_fetcher.stats)
+    stats.update({"pages": n_pages, "changed": len(changed), "details_fetched": details_fetched})
+    return rows, stats
 
 # ----[3] 해시 생성(중복 방지 키) ----
 def make_hash(title: str, detail_url: str, period_raw: Optional[str]) -> str:
     key = f"{(title or '').strip()}|{(detail_url or '').strip()}|{(period_raw or '').strip()}"
     return hashlib.sha256(key.encode("utf-8")).hexdigest()
 
-# ----[4] DB 저장(UPSERT 유사: 있으면 업데이트, 없으면 INSERT) ----
-def upsert_festivals(rows: List[dict]) -> tuple[int, int]:
-    inserted = 0
-    updated = 0
+# ----[4] DB 저장(UPSERT: 배치 단위 IN 조회 1회 + 청크 단위 bulk INSERT/UPDATE) ----
+UPSERT_CHUNK = 400   # IN 목록·executemany 한 번에 보낼 행 수 (구버전 SQLite 변수 상한 999 이내)
+
+# 크롤 결과로 갱신하는 필드 (비어 있으면 기존 값 유지)
+_UPSERT_FIELDS = ("title", "period_raw", "address", "image_src", "image_alt", "detail_url")
+
+def _chunks(seq: List, n: int):
+    for i in range(0, len(seq), n):
+        yield seq[i:i + n]
+
+def _festival_values(r: dict) -> dict:
+    period_raw = r.get("period") or ""
+    start, end = parse_period(period_raw)
+    title = (r.get("title") or "").strip()
+    detail_url = r.get("detail_url") or ""
+    return {
+        "hash": make_hash(title, detail_url, period_raw),
+        "title": title,
+        "period_raw": period_raw,
+        "period_start": start,
+        "period_end": end,
+        "address": r.get("address"),
+        "image_src": r.get("image_src"),
+        "image_alt": r.get("image_alt"),
+        "detail_url": detail_url,
+        "region": extract_region(r.get("address")),
+    }
+
+def _mark_latest(s, incoming: Dict[str, dict]) -> None:
+    """
+    is_latest 유지 (upsert와 같은 트랜잭션): 이번 크롤에서 본 해시가 그 detail_url의 최신 스냅샷.
+    기간이 바뀌면 해시가 달라져 새 행이 생기므로, 같은 detail_url의 예전 행은 False로 내림.
+    """
+    latest = {v["detail_url"]: h for h, v in incoming.items() if v["detail_url"]}
+    urls = list(latest)
+    for chunk in _chunks(urls, UPSERT_CHUNK // 2):   # url + hash 두 목록이 한 문장에
+        hashes = [latest[u] for u in chunk]
+        s.execute(
+            update(Festival)
+            .where(Festival.detail_url.in_(chunk), Festival.hash.not_in(hashes), Festival.is_latest.is_(True))
+            .values(is_latest=False)
+            .execution_options(synchronize_session=False)
+        )
+        s.execute(
+            update(Festival)
+            .where(Festival.hash.in_(hashes), Festival.is_latest.is_(False))
+            .values(is_latest=True)
+            .execution_options(synchronize_session=False)
+        )
+
+def upsert_festivals(rows: List[dict]) -> dict:
+    """
+    크롤 결과 → festival 테이블.
+    - 배치의 해시 전체를 IN 조회(청크) 한 번으로 기존 행 로드 (행마다 SELECT X)
+    - 실제로 값이 바뀐 행만 UPDATE, 나머지는 unchanged
+    - 새 행·주소가 바뀐 행은 geocode_status='pending' (크롤 후 배치 지오코딩 대상)
+    반환: {"inserted", "updated", "unchanged"}
+    """
+    incoming: Dict[str, dict] = {}
+    for r in rows:
+        v = _festival_values(r)
+        incoming[v["hash"]] = v   # 같은 배치 안 중복은 마지막 것
+
+    cols = (Festival.id, Festival.hash, Festival.period_start, Festival.period_end, Festival.region) + tuple(
+        getattr(Festival, f) for f in _UPSERT_FIELDS
+    )
+    inserts: List[dict] = []
+    updates: List[dict] = []
+    unchanged = 0
+    with SessionLocal() as s:
+        existing: Dict[str, dict] = {}
+        for chunk in _chunks(list(incoming), UPSERT_CHUNK):
+            for row in s.execute(select(*cols).where(Festival.hash.in_(chunk))).mappings():
+                existing[row["hash"]] = dict(row)
+
+        for h, v in incoming.items():
+            old = existing.get(h)
+            if old is None:
+                inserts.append(dict(v, geocode_status="pending"))
+                continue
+            # 변경 가능성이 있는 필드만 갱신 (빈 값이면 기존 유지)
+            new = {f: v[f] or old[f] for f in _UPSERT_FIELDS}
+            new["period_start"], new["period_end"] = v["period_start"], v["period_end"]
+            new["region"] = extract_region(new["address"])
+            diff = {k: val for k, val in new.items() if val != old[k]}
+            if not diff:
+                unchanged += 1
+                continue
+            if "address" in diff:
+                # 주소가 바뀌면 좌표 무효화 → 크롤 후 배치 지오코딩 대상
+                diff.update(lat=None, lng=None, geocode_status="pending")
+            updates.append(dict(diff, id=old["id"]))
+
+        for chunk in _chunks(inserts, UPSERT_CHUNK):
+            s.execute(insert(Festival), chunk)
+        # 바뀐 필드 조합별로 묶어야 executemany 한 문장으로 나감
+        by_keys: Dict[tuple, List[dict]] = {}
+        for u in updates:
+            by_keys.setdefault(tuple(sorted(u)), []).append(u)
+        for group in by_keys.values():
+            for chunk in _chunks(group, UPSERT_CHUNK):
+                s.execute(update(Festival), chunk)
+        _mark_latest(s, incoming)
+        sync_festival_search(s, (v["detail_url"] for v in incoming.values()), list(incoming))
+        if inserts or updates:
+            bump_festival_generation(s)  # 조회 API 응답 캐시·ETag 무효화
+        s.commit()
+    return {"inserted": len(inserts), "updated": len(updates), "unchanged": unchanged}
+
+# ----[5] 좌표 배치 지오코딩: pending 상태 축제 주소 → lat/lng ----
+def geocode_pending_festivals(limit: int = 200) -> dict:
+    """
+    geocode_status='pending'인 축제 주소를 지오코딩해 lat/lng 저장.
+    일시적 API 오류(error)로 끝난 행도 GEOCODE_ERROR_RETRY_SECONDS가 지나면 다시 시도.
+    같은 주소는 GeocodeCache를 거치므로 plan 요청 경로와 결과를 공유.
+    """
+    # plan_recommend는 openai 등 무거운 의존성이 있어 지연 import
+    from services.plan_recommend import PlacesClient, GoogleAPIError
+    from services.geocode_cache import get_geocode_cache
+
+    stats = {"ok": 0, "not_found": 0, "error": 0}
+    try:
+        places = PlacesClient()
+    except ValueError as e:
+        logger.warning("[GEOCODE] skipped: %s", e)
+        return stats
+    cache = get_geocode_cache()
+
+    retry_before = datetime.now(tz=timezone.utc) - timedelta(seconds=settings.GEOCODE_ERROR_RETRY_SECONDS)
     with SessionLocal() as s:
-        for r in rows:
-            title = (r.get("title") or "").strip()
-            detail_url = r.get("detail_url") or ""
-            period_raw = r.get("period") or ""
-
-            h = make_hash(title, detail_url, period_raw)
-            start, end = parse_period(period_raw)
-
-            obj = s.query(Festival).filter(Festival.hash == h).one_or_none()
-            if obj:
-                # 변경 가능성이 있는 필드만 갱신
-                obj.title = title or obj.title
-                obj.period_raw = period_raw or obj.period_raw
-                obj.period_start = start
-                obj.period_end = end
-                obj.address = r.get("address") or obj.address
-                obj.image_src = r.get("image_src") or obj.image_src
-                obj.image_alt = r.get("image_alt") or obj.image_alt
-                obj.detail_url = detail_url or obj.detail_url
-                updated += 1
+        rows = (
+            s.query(Festival)
+            .filter(or_(
+                Festival.geocode_status == "pending",
+                (Festival.geocode_status == "error")
+                & (Festival.geocoded_at.is_(None) | (Festival.geocoded_at < retry_before)),
+            ))
+            .order_by(Festival.id)
+            .limit(limit)
+            .all()
+        )
+        for f in rows:
+            try:
+                coords = cache.resolve(f.address, places.get_coords_from_place_name)
+            except GoogleAPIError as e:
+                logger.warning("[GEOCODE] festival_id=%s 실패: %s", f.id, e)
+                f.geocode_status = "error"
             else:
-                s.add(
-                    Festival(
-                        title=title,
-                        period_raw=period_raw,
-                        period_start=start,
-                        period_end=end,
-                        address=r.get("address"),
-                        image_src=r.get("image_src"),
-                        image_alt=r.get("image_alt"),
-                        detail_url=detail_url,
-                        hash=h,
-                    )
-                )
-                inserted += 1
+                if coords:
+                    lat, lng = coords.split(",", 1)
+                    f.lat, f.lng = float(lat), float(lng)
+                    f.geocode_status = "ok"
+                else:
+                    f.geocode_status = "not_found"
+            f.geocoded_at = datetime.now(tz=timezone.utc)
+            stats[f.geocode_status] += 1
         s.commit()
-    return inserted, updated
+    return stats
+
+def schedule_festival_geocoding() -> None:
+    """크롤 직후 지오코딩을 백그라운드 잡으로 넘김 (스케줄러 미가동 시 즉시 실행)"""
+    if scheduler.running:
+        scheduler.add_job(
+            geocode_pending_festivals,
+            trigger="date",
+            id="festival_geocode",
+            replace_existing=True,
+            max_instances=1,
+        )
+    else:
+        stats = geocode_pending_festivals()
+        logger.info("[GEOCODE] %s", stats)
 
-# ----[5] 오케스트레이션: 크롤 → 파싱 → 저장 ----
-def crawl_and_save_festivals() -> dict:
-    rows = parse_list_page(LIST_URL)
-    ins, upd = upsert_festivals(rows)
-    return {"fetched": len(rows), "inserted": ins, "updated": upd}
+# ----[6] 오케스트레이션: 크롤(조건부·페이징) → 저장 → (백그라운드) 지오코딩 ----
+def crawl_and_save_festivals(background_geocode: bool = True) -> dict:
+    """background_geocode=False면 지오코딩까지 끝낸 뒤 반환 (후속 단계가 좌표를 쓰는 잡용)"""
+    with CRAWL_SECONDS.time():
+        rows, crawl_stats = crawl_festival_rows(LIST_URL)
+        stats = {"fetched": len(rows), **upsert_festivals(rows), "crawl": crawl_stats}
+    for k in ("fetched", "inserted", "updated", "unchanged"):
+        CRAWL_ROWS.inc(stats[k], result=k)
+    for k in ("requests", "not_modified", "unchanged", "parsed"):
+        CRAWL_PAGES.inc(crawl_stats.get(k, 0), result=k)
+    CRAWL_LAST_SUCCESS.set(time.time())
+    if background_geocode:
+        schedule_festival_geocoding()
+    else:
+        stats["geocode"] = geocode_pending_festivals()
+    return stats
@@ -0,0 +1,78 @@
+# src/services/festival_cache.py
+from __future__ import annotations
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from core.cache import LRUCache
+from core.config import settings
+from core.http_cache import CachedBody, build_cached_body, cached_json_response
+from db.base import SessionLocal
+from db.models import AppMeta
+from services.timezone import as_utc
+
+# 축제 데이터 세대: 크롤러 upsert가 실제로 행을 바꾸면 +1.
+# 응답 캐시 키와 ETag에 들어가므로, 세대가 바뀌면 캐시는 자연히 무효화됨 (명시적 삭제 불필요)
+GENERATION_KEY = "festival_generation"
+
+
+def get_festival_generation(s: Optional[Session] = None) -> Tuple[int, Optional[datetime]]:
+    """(세대 번호, 마지막 변경 시각). 아직 크롤링 전이면 (0, None)"""
+    if s is None:
+        with SessionLocal() as s:
+            return get_festival_generation(s)
+    row = s.execute(select(AppMeta.value, AppMeta.updated_at).where(AppMeta.key == GENERATION_KEY)).first()
+    if row is None:
+        return 0, None
+    return int(row.value), (as_utc(row.updated_at) if row.updated_at else None)
+
+
+def bump_festival_generation(s: Session) -> None:
+    """upsert_festivals와 같은 트랜잭션에서 호출 (커밋은 호출 측)"""
+    now = datetime.now(timezone.utc)
+    res = s.execute(
+        update(AppMeta).where(AppMeta.key == GENERATION_KEY)
+        .values(value=AppMeta.value + 1, updated_at=now)
+    )
+    if res.rowcount == 0:
+        s.execute(insert(AppMeta).values(key=GENERATION_KEY, value=1, updated_at=now))
+
+
+class FestivalResponseCache:
+    """
+    축제 조회 API 응답 캐시: (경로, 정렬된 쿼리 파라미터, 세대) → 직렬화·압축된 본문.
+    - 세대가 같으면 DB 조회 없이 미리 만든 본문 재사용
+    - ETag = 세대 + 본문 해시 (강한 검증자) → 조건부 요청은 304
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self._lru = LRUCache(maxsize=max_entries or settings.FESTIVAL_CACHE_MAX_ENTRIES)
+
+    def respond(self, request: Request, compute: Callable[[], Any]) -> Response:
+        gen, updated_at = get_festival_generation()
+        key = (request.url.path, tuple(sorted(request.query_params.multi_items())), gen)
+        entry: Optional[CachedBody] = self._lru.get(key)
+        if entry is None:
+            entry = build_cached_body(compute(), f"g{gen}", updated_at)
+            self._lru.set(key, entry)
+        return cached_json_response(request, entry, settings.FESTIVAL_CACHE_MAX_AGE_SECONDS)
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+
+_shared_cache: Optional[FestivalResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_festival_response_cache() -> FestivalResponseCache:
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = FestivalResponseCache()
+        return _shared_cache
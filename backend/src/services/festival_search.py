@@ -0,0 +1,195 @@
+# src/services/festival_search.py
+from __future__ import annotations
+import logging
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import or_, select, text
+from sqlalchemy.orm import Session
+
+from db.base import SessionLocal, engine
+from db.models import Festival
+
+logger = logging.getLogger(__name__)
+
+# 축제 검색 인덱스 (최신 스냅샷만 대상)
+# - SQLite: FTS5 trigram 가상 테이블 festival_fts (rowid = festival.id), 크롤러가 upsert 트랜잭션에서 동기화
+# - PostgreSQL: pg_trgm GIN 표현식 인덱스 (테이블 자체에 걸리므로 동기화 불필요)
+# - 그 외/FTS5 trigram 미지원 SQLite: LIKE 폴백
+FTS_TABLE = "festival_fts"
+SEARCH_MAX = 200
+SYNC_CHUNK = 400
+
+# 띄어쓰기 변형("춘천닭갈비" ↔ "춘천 닭갈비")을 맞추기 위한 공백 제거 검색 문자열
+COMPACT_SQL = "replace(coalesce(title, '') || coalesce(address, '') || coalesce(period_raw, ''), ' ', '')"
+
+_fts_ready: Optional[bool] = None
+
+
+def _dialect() -> str:
+    return engine.dialect.name
+
+
+def _tokens(q: str) -> List[str]:
+    return [t for t in (q or "").split() if t][:8]
+
+
+def _like(t: str) -> str:
+    esc = t.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{esc}%"
+
+
+def _phrase(t: str) -> str:
+    return '"' + t.replace('"', '""') + '"'
+
+
+def ensure_festival_search() -> None:
+    """기동 시: 검색 인덱스가 없으면 만들고, 비어 있으면 최신 스냅샷으로 채움"""
+    global _fts_ready
+    dialect = _dialect()
+    if dialect == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_festival_search_trgm ON festival "
+                f"USING gin (({COMPACT_SQL}) gin_trgm_ops) WHERE is_latest"
+            ))
+        return
+    if dialect != "sqlite":
+        return
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+                f"USING fts5(title, address, period_raw, compact, tokenize='trigram')"
+            ))
+            empty = conn.execute(text(f"SELECT count(*) FROM {FTS_TABLE}")).scalar() == 0
+    except Exception as e:
+        # SQLite 3.34 미만은 trigram 토크나이저 없음 → LIKE 폴백
+        logger.warning("[SEARCH] FTS5 trigram unavailable, falling back to LIKE: %s", e)
+        _fts_ready = False
+        return
+    _fts_ready = True
+    if empty:
+        rebuild_festival_search()
+
+
+def _use_fts() -> bool:
+    global _fts_ready
+    if _fts_ready is None:
+        if _dialect() != "sqlite":
+            _fts_ready = False
+        else:
+            with engine.connect() as conn:
+                _fts_ready = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :n"), {"n": FTS_TABLE}
+                ).first() is not None
+    return _fts_ready
+
+
+def _chunks(seq: List, n: int):
+    for i in range(0, len(seq), n):
+        yield seq[i:i + n]
+
+
+def _reindex_ids(s: Session, ids: List[int]) -> None:
+    for chunk in _chunks(ids, SYNC_CHUNK):
+        params = {f"i{k}": v for k, v in enumerate(chunk)}
+        in_list = ", ".join(f":{k}" for k in params)
+        s.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({in_list})"), params)
+        s.execute(text(
+            f"INSERT INTO {FTS_TABLE}(rowid, title, address, period_raw, compact) "
+            f"SELECT id, title, coalesce(address, ''), coalesce(period_raw, ''), {COMPACT_SQL} "
+            f"FROM festival WHERE is_latest AND id IN ({in_list})"
+        ), params)
+
+
+def sync_festival_search(s: Session, detail_urls: Iterable[str], hashes: Iterable[str]) -> None:
+    """
+    upsert_festivals와 같은 트랜잭션에서 호출.
+    이번 배치가 건드린 축제(같은 detail_url의 예전 스냅샷 포함)만 지우고 최신 행으로 다시 넣음.
+    """
+    if not _use_fts():
+        return
+    urls, hs = [u for u in detail_urls if u], list(hashes)
+    ids = set()
+    for chunk in _chunks(urls, SYNC_CHUNK):
+        ids.update(s.execute(select(Festival.id).where(Festival.detail_url.in_(chunk))).scalars())
+    for chunk in _chunks(hs, SYNC_CHUNK):
+        ids.update(s.execute(select(Festival.id).where(Festival.hash.in_(chunk))).scalars())
+    _reindex_ids(s, sorted(ids))
+
+
+def rebuild_festival_search() -> int:
+    """검색 인덱스 전체 재구성 (초기 적재·복구용)"""
+    if not _use_fts():
+        return 0
+    with SessionLocal() as s:
+        s.execute(text(f"DELETE FROM {FTS_TABLE}"))
+        n = s.execute(text(
+            f"INSERT INTO {FTS_TABLE}(rowid, title, address, period_raw, compact) "
+            f"SELECT id, title, coalesce(address, ''), coalesce(period_raw, ''), {COMPACT_SQL} "
+            f"FROM festival WHERE is_latest"
+        )).rowcount
+        s.commit()
+    logger.info("[SEARCH] festival_fts rebuilt: %s rows", n)
+    return n
+
+
+def _search_sqlite_fts(s: Session, tokens: List[str], limit: int) -> List[Tuple[int, float]]:
+    # 3글자 이상 토큰은 trigram MATCH(전 컬럼), 짧은 토큰(한글 2글자 등)은 공백 제거 문자열 LIKE
+    long_toks = [t for t in tokens if len(t) >= 3]
+    params = {"limit": limit}
+    conds = []
+    if long_toks:
+        params["m"] = " AND ".join(_phrase(t) for t in long_toks)
+        conds.append(f"{FTS_TABLE} MATCH :m")
+    for k, t in enumerate(t for t in tokens if len(t) < 3):
+        params[f"l{k}"] = _like(t)
+        conds.append(f"compact LIKE :l{k} ESCAPE '\\'")
+    params["t0"] = _like(tokens[0])
+    # bm25: 작을수록 관련도 높음 (title > address > compact > period)
+    rank = f"bm25({FTS_TABLE}, 10.0, 5.0, 1.0, 2.0)" if long_toks else "0.0"
+    rows = s.execute(text(
+        f"SELECT rowid, {rank} AS r FROM {FTS_TABLE} WHERE {' AND '.join(conds)} "
+        f"ORDER BY CASE WHEN title LIKE :t0 ESCAPE '\\' THEN 0 ELSE 1 END, r LIMIT :limit"
+    ), params).all()
+    return [(int(i), 0.0 - float(r)) for i, r in rows]
+
+
+def _search_postgres(s: Session, q: str, tokens: List[str], limit: int) -> List[Tuple[int, float]]:
+    params = {"q": q, "limit": limit}
+    conds = ["is_latest"]
+    for k, t in enumerate(tokens):
+        params[f"l{k}"] = _like(t)
+        conds.append(f"{COMPACT_SQL} ILIKE :l{k}")
+    rows = s.execute(text(
+        "SELECT id, 2 * word_similarity(:q, title) + word_similarity(:q, coalesce(address, '')) "
+        "+ 0.5 * word_similarity(:q, coalesce(period_raw, '')) AS score "
+        f"FROM festival WHERE {' AND '.join(conds)} ORDER BY score DESC, id DESC LIMIT :limit"
+    ), params).all()
+    return [(int(i), float(sc)) for i, sc in rows]
+
+
+def _search_like(s: Session, tokens: List[str], limit: int) -> List[Tuple[int, float]]:
+    stmt = select(Festival.id).where(Festival.is_latest.is_(True))
+    for t in tokens:
+        stmt = stmt.where(or_(
+            Festival.title.contains(t, autoescape=True),
+            Festival.address.contains(t, autoescape=True),
+            Festival.period_raw.contains(t, autoescape=True),
+        ))
+    ids = s.execute(stmt.order_by(Festival.id.desc()).limit(limit)).scalars().all()
+    return [(i, 0.0) for i in ids]
+
+
+def search_festival_ids(s: Session, q: str, limit: int = SEARCH_MAX) -> List[Tuple[int, float]]:
+    """검색어 → [(festival.id, score)] 관련도 순 (score는 클수록 관련)"""
+    tokens = _tokens(q)
+    if not tokens:
+        return []
+    limit = min(limit, SEARCH_MAX)
+    if _use_fts():
+        return _search_sqlite_fts(s, tokens, limit)
+    if _dialect() == "postgresql":
+        return _search_postgres(s, q, tokens, limit)
+    return _search_like(s, tokens, limit)
@@ -0,0 +1,37 @@
+# src/services/geo.py
+from typing import Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def parse_latlng(location: Optional[str]) -> Optional[Tuple[float, float]]:
+    """"lat,lng" 문자열 → (lat, lng) (형식이 이상하면 None)"""
+    if not location:
+        return None
+    try:
+        lat, lng = (float(v) for v in location.split(",", 1))
+    except ValueError:
+        return None
+    return lat, lng
+
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """한 점 → 여러 점 대원거리(km), 벡터화"""
+    lat1 = np.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlng = np.radians(lngs) - np.radians(lng)
+    a = np.sin(dlat / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def haversine_matrix(lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """여러 점 사이 대원거리 행렬(km), (n, n) 브로드캐스팅"""
+    lat = np.radians(lats)[:, None]
+    lng = np.radians(lngs)[:, None]
+    dlat = lat.T - lat
+    dlng = lng.T - lng
+    a = np.sin(dlat / 2.0) ** 2 + np.cos(lat) * np.cos(lat.T) * np.sin(dlng / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
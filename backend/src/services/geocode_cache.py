@@ -0,0 +1,118 @@
+# src/services/geocode_cache.py
+from __future__ import annotations
+import re
+import threading
+import time
+import unicodedata
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from core.cache import LRUCache, SingleFlight
+from core.config import settings
+from db.base import SessionLocal
+from db.models import GeocodeCache as GeocodeRow
+from services.timezone import as_utc
+
+# 광역 행정구역 표기 변형 → 짧은 이름으로 접기 (긴 표기부터 치환)
+_REGION_ALIASES = [
+    ("강원특별자치도", "강원"), ("강원도", "강원"),
+    ("제주특별자치도", "제주"), ("제주도", "제주"),
+    ("전북특별자치도", "전북"), ("전라북도", "전북"), ("전라남도", "전남"),
+    ("경상북도", "경북"), ("경상남도", "경남"),
+    ("충청북도", "충북"), ("충청남도", "충남"),
+    ("경기도", "경기"),
+    ("서울특별시", "서울"), ("세종특별자치시", "세종"),
+    ("부산광역시", "부산"), ("대구광역시", "대구"), ("인천광역시", "인천"),
+    ("광주광역시", "광주"), ("대전광역시", "대전"), ("울산광역시", "울산"),
+]
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_address(text: Optional[str]) -> str:
+    """
+    캐시 키용 주소 정규화.
+    - 유니코드 NFC, 공백 전부 제거 ("박수근로 366" == "박수근로366")
+    - 광역 행정구역 표기 통일 ("강원특별자치도" == "강원도" == "강원")
+    """
+    s = unicodedata.normalize("NFC", text or "")
+    s = _SPACE.sub("", s)
+    for long_name, short_name in _REGION_ALIASES:
+        s = s.replace(long_name, short_name)
+    return s
+
+
+class GeocodeCache:
+    """
+    주소 → "lat,lng" 캐시 (LRU → geocode_cache 테이블 → 실제 조회).
+    같은 키의 동시 miss는 SingleFlight로 묶어 외부 호출은 한 번만.
+    """
+
+    def __init__(self, lru_size: int = 1024):
+        self._lru = LRUCache(maxsize=lru_size, ttl_seconds=settings.GEOCODE_NOT_FOUND_TTL_SECONDS)
+        self._flight = SingleFlight()
+
+    def resolve(self, address_text: Optional[str], lookup: Callable[[str], str]) -> str:
+        """캐시된 좌표 반환, 없으면 lookup(address_text)로 조회 후 저장 (못 찾으면 "")"""
+        key = normalize_address(address_text)
+        if not key:
+            return ""
+        hit = self._lru.get(key)
+        if hit is not None:
+            return hit
+        return self._flight.do(key, lambda: self._load_or_lookup(key, address_text, lookup))
+
+    def peek(self, address_text: Optional[str]) -> str:
+        """외부 조회 없이 캐시(LRU → 테이블)에 있는 좌표만 (없거나 오래됐으면 "")"""
+        key = normalize_address(address_text)
+        if not key:
+            return ""
+        hit = self._lru.get(key)
+        if hit is not None:
+            return hit
+        with SessionLocal() as s:
+            row = s.get(GeocodeRow, key)
+            if row is None or not self._is_fresh(row):
+                return ""
+            coords = row.coords or ""
+        self._lru.set(key, coords)
+        return coords
+
+    def _load_or_lookup(self, key: str, address_text: str, lookup: Callable[[str], str]) -> str:
+        with SessionLocal() as s:
+            row = s.get(GeocodeRow, key)
+            if row is not None and self._is_fresh(row):
+                coords = row.coords or ""
+                self._lru.set(key, coords)
+                return coords
+
+        coords = lookup(address_text) or ""   # 예외(GoogleAPIError)는 캐시하지 않고 그대로 전파
+
+        with SessionLocal() as s:
+            row = s.get(GeocodeRow, key)
+            if row is None:
+                row = GeocodeRow(key=key, query_text=address_text[:300])
+                s.add(row)
+            row.coords = coords or None
+            row.status = "ok" if coords else "not_found"
+            row.updated_at = datetime.now(tz=timezone.utc)
+            s.commit()
+        self._lru.set(key, coords)
+        return coords
+
+    @staticmethod
+    def _is_fresh(row: GeocodeRow) -> bool:
+        ttl = settings.GEOCODE_TTL_SECONDS if row.status == "ok" else settings.GEOCODE_NOT_FOUND_TTL_SECONDS
+        if row.updated_at is None:
+            return False
+        return time.time() - as_utc(row.updated_at).timestamp() <= ttl
+
+
+_shared_cache: Optional[GeocodeCache] = None
+_shared_lock = threading.Lock()
+
+def get_geocode_cache() -> GeocodeCache:
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = GeocodeCache()
+        return _shared_cache
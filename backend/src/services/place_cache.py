@@ -0,0 +1,116 @@
+# src/services/place_cache.py
+from __future__ import annotations
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+
+from core.cache import LRUCache
+from core.config import settings
+from db.base import SessionLocal
+from db.models import PlaceDetail
+
+# details API에서 캐시하는 필드 (= PlaceDetail 컬럼)
+DETAIL_FIELDS = ("name", "formatted_address", "vicinity", "rating", "opening_hours")
+
+
+@dataclass
+class CachedDetails:
+    values: Dict[str, Any] = field(default_factory=dict)   # TTL 안 지난 필드만 (None 값 제외)
+    stale: List[str] = field(default_factory=lambda: list(DETAIL_FIELDS))  # 다시 받아야 할 필드
+
+
+class PlaceDetailsCache:
+    """
+    place_id → details 캐시.
+    - 앞단: 프로세스 LRU (행 스냅샷)
+    - 뒷단: place_detail 테이블
+    - 필드별 TTL: 오래된 필드만 stale로 표시 → 호출 측은 그 필드만 다시 요청
+    """
+
+    def __init__(self, ttl_seconds: Optional[Dict[str, int]] = None, lru_size: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds or settings.PLACE_DETAILS_TTL_SECONDS
+        self._lru = LRUCache(maxsize=lru_size or settings.PLACE_DETAILS_LRU_SIZE)
+
+    # ---- 조회 ----
+    def get_many(self, place_ids: Iterable[str]) -> Dict[str, CachedDetails]:
+        """place_id 목록을 한 번에 조회 (LRU → DB IN 쿼리 1회)"""
+        ids = list(dict.fromkeys(pid for pid in place_ids if pid))
+        snapshots: Dict[str, Dict[str, Any]] = self._lru.get_many(ids)
+
+        misses = [pid for pid in ids if pid not in snapshots]
+        if misses:
+            with SessionLocal() as s:
+                rows = s.execute(select(PlaceDetail).where(PlaceDetail.place_id.in_(misses))).scalars().all()
+                for row in rows:
+                    snap = _row_to_snapshot(row)
+                    snapshots[row.place_id] = snap
+                    self._lru.set(row.place_id, snap)
+
+        now = time.time()
+        return {pid: self._split_fresh(snapshots[pid], now) for pid in ids if pid in snapshots}
+
+    def _split_fresh(self, snap: Dict[str, Any], now: float) -> CachedDetails:
+        values: Dict[str, Any] = {}
+        stale: List[str] = []
+        fetched_at = snap.get("field_fetched_at") or {}
+        for f in DETAIL_FIELDS:
+            ts = fetched_at.get(f)
+            ttl = self.ttl_seconds.get(f, 0)
+            if ts is None or now - ts > ttl:
+                stale.append(f)
+            elif snap.get(f) is not None:
+                values[f] = snap[f]
+        return CachedDetails(values=values, stale=stale)
+
+    # ---- 저장 ----
+    def put_many(self, fetched: Dict[str, Dict[str, Any]], fields: Dict[str, List[str]]) -> None:
+        """
+        fetched: place_id → details 응답(result)
+        fields:  place_id → 이번에 요청했던 필드 (응답에 없으면 '값 없음'으로 기록)
+        """
+        if not fetched:
+            return
+        now = time.time()
+        with SessionLocal() as s:
+            existing = {
+                row.place_id: row
+                for row in s.execute(
+                    select(PlaceDetail).where(PlaceDetail.place_id.in_(list(fetched)))
+                ).scalars()
+            }
+            for pid, result in fetched.items():
+                row = existing.get(pid)
+                if row is None:
+                    row = PlaceDetail(place_id=pid, field_fetched_at={})
+                    s.add(row)
+                stamps = dict(row.field_fetched_at or {})
+                for f in fields.get(pid, DETAIL_FIELDS):
+                    if f not in DETAIL_FIELDS:
+                        continue
+                    setattr(row, f, result.get(f))
+                    stamps[f] = now
+                row.field_fetched_at = stamps  # JSON 컬럼은 새 객체로 교체해야 변경 감지됨
+                existing[pid] = row
+            s.commit()
+            for pid in fetched:
+                self._lru.set(pid, _row_to_snapshot(existing[pid]))
+
+
+def _row_to_snapshot(row: PlaceDetail) -> Dict[str, Any]:
+    snap = {f: getattr(row, f) for f in DETAIL_FIELDS}
+    snap["field_fetched_at"] = dict(row.field_fetched_at or {})
+    return snap
+
+
+_shared_cache: Optional[PlaceDetailsCache] = None
+_shared_lock = threading.Lock()
+
+def get_place_details_cache() -> PlaceDetailsCache:
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = PlaceDetailsCache()
+        return _shared_cache
@@ -0,0 +1,185 @@
+# src/services/place_index.py
+from __future__ import annotations
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from core.config import settings
+from db.base import SessionLocal
+from db.models import PlaceSearch
+from services.geo import haversine_km, parse_latlng
+from services.timezone import as_utc
+
+logger = logging.getLogger(__name__)
+
+CELL_DEG = 0.05          # 격자 한 칸 ≈ 위도 5.5km
+_KM_PER_DEG_LAT = 111.32
+
+
+class PlaceRecord:
+    """캐시된 장소 1건 (Place와 같은 필드, 메모리 절약용 __slots__)"""
+    __slots__ = ("name", "address", "category", "rating", "lat", "lng", "operating_hours", "place_id")
+
+    def __init__(self, name, address, category, rating, lat, lng, operating_hours, place_id=None):
+        self.name = name
+        self.address = address
+        self.category = category
+        self.rating = rating
+        self.lat = lat
+        self.lng = lng
+        self.operating_hours = operating_hours
+        self.place_id = place_id
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+def _cell(lat: float, lng: float) -> Tuple[int, int]:
+    return int(math.floor(lat / CELL_DEG)), int(math.floor(lng / CELL_DEG))
+
+
+class PlaceIndex:
+    """
+    프로세스 내 장소 인덱스 (불변 스냅샷, reload 시 통째로 교체).
+    - 행 = (장소, 키워드) 쌍. lat/lng/rating/keyword_id/record_idx를 NumPy 열로 보관
+    - 행은 격자 칸 순으로 정렬 → 칸마다 연속 구간(slice)
+    - 질의: 반경이 걸치는 칸들의 구간만 모아 벡터화 haversine 필터
+    - coverage: 실제로 검색해 본 원(중심·반경·키워드). 질의 원이 그 안에 들어가야
+      "이 키워드는 로컬 결과로 충분"으로 판단 (결과 0건과 미검색을 구분)
+    """
+
+    def __init__(self, searches: Iterable[Tuple[str, str, int, List[Dict[str, Any]]]] = ()):
+        self.records: List[PlaceRecord] = []
+        self.keywords: Dict[str, int] = {}
+        rec_by_key: Dict[Any, int] = {}
+        rows: List[Tuple[float, float, float, int, int]] = []
+        cover: List[Tuple[float, float, float, int]] = []
+
+        for location, keyword, radius_m, places in searches:
+            center = parse_latlng(location)
+            if center is None:
+                continue
+            kid = self.keywords.setdefault(keyword, len(self.keywords))
+            cover.append((center[0], center[1], radius_m / 1000.0, kid))
+            for p in places or []:
+                key = p.get("place_id") or (p.get("name"), p.get("lat"), p.get("lng"))
+                idx = rec_by_key.get(key)
+                if idx is None:
+                    idx = len(self.records)
+                    rec_by_key[key] = idx
+                    self.records.append(PlaceRecord(**{k: p.get(k) for k in PlaceRecord.__slots__}))
+                rating = p.get("rating")
+                rows.append((p["lat"], p["lng"], np.nan if rating is None else float(rating), kid, idx))
+
+        # 행 열(column) 구성 + 격자 칸 정렬
+        arr = np.array(rows, dtype=np.float64).reshape(-1, 5)
+        cells = np.array([_cell(r[0], r[1]) for r in arr], dtype=np.int64).reshape(-1, 2)
+        order = np.lexsort((cells[:, 1], cells[:, 0])) if len(arr) else np.array([], dtype=np.int64)
+        arr, cells = arr[order], cells[order]
+        self.lat = arr[:, 0].copy()
+        self.lng = arr[:, 1].copy()
+        self.rating = arr[:, 2].astype(np.float32)
+        self.keyword_id = arr[:, 3].astype(np.int32)
+        self.record_idx = arr[:, 4].astype(np.int32)
+
+        self._buckets: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        start = 0
+        for i in range(1, len(cells) + 1):
+            if i == len(cells) or (cells[i] != cells[start]).any():
+                self._buckets[(int(cells[start, 0]), int(cells[start, 1]))] = (start, i)
+                start = i
+
+        c = np.array(cover, dtype=np.float64).reshape(-1, 4)
+        self._cover_lat, self._cover_lng, self._cover_r = c[:, 0], c[:, 1], c[:, 2]
+        self._cover_kid = c[:, 3].astype(np.int32)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def covered_keywords(self, lat: float, lng: float, radius_km: float, keywords: List[str]) -> List[str]:
+        """질의 원 전체를 이미 검색해 둔 키워드만"""
+        kids = {self.keywords[k]: k for k in keywords if k in self.keywords}
+        if not kids or not len(self._cover_r):
+            return []
+        d = haversine_km(lat, lng, self._cover_lat, self._cover_lng)
+        ok = d + radius_km <= self._cover_r + 1e-6
+        hit = set(self._cover_kid[ok].tolist())
+        return [k for kid, k in kids.items() if kid in hit]
+
+    def _candidate_rows(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        dlat = radius_km / _KM_PER_DEG_LAT
+        dlng = radius_km / (_KM_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        (r0, c0), (r1, c1) = _cell(lat - dlat, lng - dlng), _cell(lat + dlat, lng + dlng)
+        spans = [
+            self._buckets[(r, c)]
+            for r in range(r0, r1 + 1)
+            for c in range(c0, c1 + 1)
+            if (r, c) in self._buckets
+        ]
+        if not spans:
+            return np.array([], dtype=np.int64)
+        return np.concatenate([np.arange(a, b) for a, b in spans])
+
+    def query(self, lat: float, lng: float, radius_km: float, keywords: List[str]) -> Dict[str, List[PlaceRecord]]:
+        """
+        키워드별 반경 내 장소 (거리순).
+        coverage가 없는 키워드는 결과에서 빠짐 → 호출 측이 실시간 검색.
+        """
+        covered = self.covered_keywords(lat, lng, radius_km, keywords)
+        if not covered:
+            return {}
+        out: Dict[str, List[PlaceRecord]] = {k: [] for k in covered}
+        rows = self._candidate_rows(lat, lng, radius_km)
+        if not len(rows):
+            return out
+
+        kid_to_kw = {self.keywords[k]: k for k in covered}
+        rows = rows[np.isin(self.keyword_id[rows], list(kid_to_kw))]
+        d = haversine_km(lat, lng, self.lat[rows], self.lng[rows])
+        inside = d <= radius_km
+        rows, d = rows[inside], d[inside]
+        seen = set()
+        for r in rows[np.argsort(d, kind="stable")]:
+            kid, ridx = int(self.keyword_id[r]), int(self.record_idx[r])
+            if (kid, ridx) in seen:  # 겹치는 검색 영역에서 같은 장소가 중복될 수 있음
+                continue
+            seen.add((kid, ridx))
+            out[kid_to_kw[kid]].append(self.records[ridx])
+        return out
+
+    @classmethod
+    def from_db(cls, max_age_seconds: Optional[int] = None) -> "PlaceIndex":
+        max_age = max_age_seconds or settings.PLACE_SEARCH_MAX_AGE_SECONDS
+        now = time.time()
+        with SessionLocal() as s:
+            rows = s.execute(select(PlaceSearch)).scalars().all()
+            searches = [
+                (r.location_key, r.keyword, r.radius_m, list(r.places_json or []))
+                for r in rows
+                if now - as_utc(r.fetched_at).timestamp() <= max_age
+            ]
+        return cls(searches)
+
+
+_index: Optional[PlaceIndex] = None
+_index_lock = threading.Lock()
+
+def get_place_index() -> Optional[PlaceIndex]:
+    """현재 스냅샷 (아직 로드 전이면 None)"""
+    return _index
+
+def reload_place_index() -> PlaceIndex:
+    """DB에서 새 스냅샷을 만들어 교체 (프리페치 직후·기동 시 호출)"""
+    global _index
+    with _index_lock:
+        started = time.perf_counter()
+        idx = PlaceIndex.from_db()
+        _index = idx
+    logger.info("[PLACE_INDEX] %d places, %d keywords (%.1f ms)",
+                len(idx), len(idx.keywords), (time.perf_counter() - started) * 1000)
+    return idx
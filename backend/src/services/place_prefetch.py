@@ -0,0 +1,78 @@
+# src/services/place_prefetch.py
+from __future__ import annotations
+import logging
+from dataclasses import asdict
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from core.async_runner import run_sync
+from core.config import settings
+from db.base import SessionLocal
+from db.models import Festival
+from services.place_store import get_place_search_store, location_key
+from services.plan_recommend import DEFAULT_KEYWORDS, get_async_places_client
+from services.timezone import KST
+
+logger = logging.getLogger(__name__)
+
+# FestPlanner.suggest_plan / suggest_parking 이 쓰는 검색 조건과 같아야 저장소가 적중함
+PROMPT_RADIUS_M = 10000
+PARKING_KEYWORD = "공영주차장"
+PARKING_RADIUS_M = 1500
+
+
+def prefetch_active_festivals(days_ahead: Optional[int] = None, today: Optional[date] = None) -> dict:
+    """
+    기간이 [오늘, 오늘+N일]과 겹치는 축제마다
+    - 기본 키워드 세트 nearbysearch (반경 10km)
+    - 공영주차장 검색 (반경 1.5km)
+    을 미리 돌려 place_search 저장소에 넣는다.
+    """
+    days_ahead = settings.PREFETCH_DAYS_AHEAD if days_ahead is None else days_ahead
+    today = today or datetime.now(KST).date()
+    until = today + timedelta(days=days_ahead)
+
+    with SessionLocal() as s:
+        festivals = (
+            s.query(Festival.id, Festival.lat, Festival.lng)
+            .filter(
+                Festival.is_latest.is_(True),
+                Festival.geocode_status == "ok",
+                Festival.period_start <= until,
+                Festival.period_end >= today,
+            )
+            .order_by(Festival.id.desc())
+            .all()
+        )
+
+    stats = {"festivals": 0, "keywords": 0, "places": 0, "errors": 0}
+    try:
+        client = get_async_places_client()
+    except ValueError as e:
+        logger.warning("[PREFETCH] skipped: %s", e)
+        return stats
+    store = get_place_search_store()
+
+    seen = set()
+    for fid, lat, lng in festivals:
+        location = f"{lat},{lng}"
+        key = location_key(location)
+        if key in seen:  # 같은 축제의 다른 스냅샷 등 좌표 중복은 한 번만
+            continue
+        seen.add(key)
+        stats["festivals"] += 1
+
+        for keywords, radius_m in ((DEFAULT_KEYWORDS, PROMPT_RADIUS_M), ([PARKING_KEYWORD], PARKING_RADIUS_M)):
+            try:
+                by_kw = run_sync(client.find_near_places_by_keyword(location, keywords=keywords, radius_m=radius_m))
+            except Exception:
+                logger.exception("[PREFETCH] festival_id=%s 검색 실패", fid)
+                stats["errors"] += 1
+                continue
+            for kw, places in by_kw.items():
+                if not places:  # 빈 결과는 API 오류일 수 있으니 저장하지 않고 실시간 검색에 맡김
+                    continue
+                store.put(location, kw, radius_m, [asdict(p) for p in places], festival_id=fid)
+                stats["keywords"] += 1
+                stats["places"] += len(places)
+    return stats
@@ -0,0 +1,123 @@
+# src/services/place_ranking.py
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from services.geo import haversine_km, parse_latlng
+
+# 점수 가중치 (합 1.0)
+W_DISTANCE = 0.4
+W_RATING = 0.35
+W_CATEGORY = 0.25
+NEUTRAL_RATING = 3.5     # 평점 없는 곳은 중간값 취급
+
+# 사용자 카테고리(한국어 키워드) → Google place types
+CATEGORY_TYPES: Dict[str, set] = {
+    "카페": {"cafe", "bakery"},
+    "맛집": {"restaurant", "food", "meal_takeaway"},
+    "식당": {"restaurant", "food", "meal_takeaway"},
+    "관광": {"tourist_attraction"},
+    "자연경관": {"natural_feature", "park", "campground"},
+    "레저": {"amusement_park", "park", "stadium", "bowling_alley", "gym"},
+    "체험": {"amusement_park", "aquarium", "zoo", "tourist_attraction"},
+    "박물관": {"museum"},
+    "전시": {"art_gallery", "museum"},
+    "공영주차장": {"parking"},
+}
+
+
+def category_hits(name: str, types: Iterable[str], categories: Sequence[str]) -> int:
+    """장소가 맞는 사용자 카테고리 수 (type 매핑 또는 이름에 키워드 포함)"""
+    types = set(types or [])
+    hits = 0
+    for c in categories:
+        if types & CATEGORY_TYPES.get(c, set()) or (c and c in (name or "")):
+            hits += 1
+    return hits
+
+
+def score_candidates(
+    center: Optional[tuple],
+    lats: np.ndarray,
+    lngs: np.ndarray,
+    ratings: np.ndarray,
+    cat_hits: np.ndarray,
+    n_categories: int,
+    max_km: float,
+) -> np.ndarray:
+    """후보 전체를 한 번에 점수화 (높을수록 좋음). ratings의 NaN은 NEUTRAL_RATING"""
+    if center is not None and len(lats):
+        d = haversine_km(center[0], center[1], lats, lngs)
+        dist_score = 1.0 - np.clip(d / max(max_km, 1e-6), 0.0, 1.0)
+    else:
+        dist_score = np.full(len(lats), 0.5)
+    rating_score = np.nan_to_num(ratings, nan=NEUTRAL_RATING) / 5.0
+    cat_score = np.clip(cat_hits / max(n_categories, 1), 0.0, 1.0) if n_categories else np.zeros(len(lats))
+    return W_DISTANCE * dist_score + W_RATING * rating_score + W_CATEGORY * cat_score
+
+
+def _rating_array(values: Iterable[Any]) -> np.ndarray:
+    return np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+
+
+def rank_places(places: List[Any], fest_location: Optional[str], categories: Sequence[str], max_km: float = 10.0) -> List[Any]:
+    """
+    Place 목록 → place_id 기준 중복 제거 후 점수 내림차순.
+    여러 키워드 검색에서 반복 등장한 장소는 반복 횟수(첫 등장 제외)만큼 카테고리 적합도 가산.
+    """
+    uniq: Dict[Any, Any] = {}
+    seen_count: Dict[Any, int] = {}
+    for p in places:
+        key = p.place_id or (p.name, p.lat, p.lng)
+        if key not in uniq:
+            uniq[key] = p
+        seen_count[key] = seen_count.get(key, 0) + 1
+    if not uniq:
+        return []
+
+    keys = list(uniq)
+    cands = [uniq[k] for k in keys]
+    n_cat = len(categories)
+    cat_hits = np.array(
+        [
+            min(n_cat, (seen_count[k] - 1 if categories else 0) + category_hits(p.name, p.category, categories))
+            for k, p in zip(keys, cands)
+        ],
+        dtype=np.float64,
+    )
+    scores = score_candidates(
+        parse_latlng(fest_location),
+        np.array([p.lat for p in cands], dtype=np.float64),
+        np.array([p.lng for p in cands], dtype=np.float64),
+        _rating_array(p.rating for p in cands),
+        cat_hits,
+        n_cat,
+        max_km,
+    )
+    order = np.argsort(-scores, kind="stable")
+    return [cands[i] for i in order]
+
+
+def rank_raw_results(raw: List[Dict[str, Any]], location: str, categories: Sequence[str], max_km: float) -> List[Dict[str, Any]]:
+    """nearbysearch 원본 결과용 rank_places (details 조회 대상을 고를 때)"""
+    rows = [r for r in raw if r.get("geometry", {}).get("location")]
+    if not rows:
+        return []
+    locs = [r["geometry"]["location"] for r in rows]
+    scores = score_candidates(
+        parse_latlng(location),
+        np.array([l.get("lat", 0.0) for l in locs], dtype=np.float64),
+        np.array([l.get("lng", 0.0) for l in locs], dtype=np.float64),
+        _rating_array(r.get("rating") for r in rows),
+        np.array([category_hits(r.get("name"), r.get("types"), categories) for r in rows], dtype=np.float64),
+        len(categories),
+        max_km,
+    )
+    return [rows[i] for i in np.argsort(-scores, kind="stable")]
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 대략 추정: ASCII 4자 ≈ 1토큰, 한글 등 비ASCII는 1자 ≈ 1토큰"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
@@ -0,0 +1,85 @@
+# src/services/place_store.py
+from __future__ import annotations
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+
+from core.config import settings
+from db.base import SessionLocal
+from db.models import PlaceSearch
+from services.timezone import as_utc
+
+
+def location_key(location: str) -> str:
+    """"lat,lng" → 소수 5자리(약 1m) 반올림 키. 지오코딩 출처가 달라도 같은 키가 되도록."""
+    lat, lng = (float(v) for v in location.split(",", 1))
+    return f"{lat:.5f},{lng:.5f}"
+
+
+class PlaceSearchStore:
+    """
+    (위치, 키워드, 반경) → nearbysearch 결과(Place dict 목록) 저장소.
+    야간 프리페치가 쓰고, FestPlanner가 실시간 검색 전에 읽는다.
+    """
+
+    def __init__(self, max_age_seconds: Optional[int] = None):
+        self.max_age_seconds = max_age_seconds or settings.PLACE_SEARCH_MAX_AGE_SECONDS
+
+    def get_many(self, location: str, keywords: List[str], radius_m: int) -> Dict[str, List[Dict[str, Any]]]:
+        """저장돼 있고 max_age 안 지난 키워드만 반환 (IN 쿼리 1회)"""
+        if not location or not keywords:
+            return {}
+        key = location_key(location)
+        now = time.time()
+        with SessionLocal() as s:
+            rows = s.execute(
+                select(PlaceSearch).where(
+                    PlaceSearch.location_key == key,
+                    PlaceSearch.radius_m == radius_m,
+                    PlaceSearch.keyword.in_(keywords),
+                )
+            ).scalars().all()
+        return {
+            row.keyword: list(row.places_json or [])
+            for row in rows
+            if now - as_utc(row.fetched_at).timestamp() <= self.max_age_seconds
+        }
+
+    def put(
+        self,
+        location: str,
+        keyword: str,
+        radius_m: int,
+        places: List[Dict[str, Any]],
+        festival_id: Optional[int] = None,
+    ) -> None:
+        key = location_key(location)
+        with SessionLocal() as s:
+            row = s.execute(
+                select(PlaceSearch).where(
+                    PlaceSearch.location_key == key,
+                    PlaceSearch.keyword == keyword,
+                    PlaceSearch.radius_m == radius_m,
+                )
+            ).scalar_one_or_none()
+            if row is None:
+                row = PlaceSearch(location_key=key, keyword=keyword, radius_m=radius_m)
+                s.add(row)
+            row.festival_id = festival_id
+            row.places_json = places
+            row.fetched_at = datetime.now(tz=timezone.utc)
+            s.commit()
+
+
+_shared_store: Optional[PlaceSearchStore] = None
+_shared_lock = threading.Lock()
+
+def get_place_search_store() -> PlaceSearchStore:
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = PlaceSearchStore()
+        return _shared_store
@@ -0,0 +1,114 @@
+# src/services/plan_cache.py
+from __future__ import annotations
+import copy
+import hashlib
+import json
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Optional
+
+from core.cache import LRUCache, SingleFlight
+from core.config import settings
+from services.plan_transformer import PlanCommand
+
+
+def plan_cache_key(cmd: PlanCommand) -> str:
+    """
+    프롬프트에 실제로 들어가는 필드만 모아 정규화한 해시.
+    (client 정보, notes, stay_minutes 등 프롬프트와 무관한 값은 제외)
+    """
+    s, o = cmd.schedule, cmd.options
+    canonical = {
+        "festival_id": s.festival_id,
+        "fest_title": (s.festival_title or s.title or "").strip(),
+        "festival_address": (s.festival_address or "").strip(),
+        "start_at": s.start_at_kst.isoformat(),
+        "end_at": s.end_at_kst.isoformat(),
+        "categories": sorted({c.strip() for c in o.categories if c and c.strip()}),
+        "budget": o.budget,
+    }
+    body = json.dumps(canonical, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class PlanResultCache:
+    """
+    요청 형태(plan_cache_key) → 생성 결과({"itinerary": [...], "source": "llm"|"local", "totals": {...}, "routed": True}).
+    - TTL + 크기 제한 LRU
+    - 같은 키의 동시 요청은 진행 중인 계산 하나를 함께 기다림
+    - LLM이 만든 비어 있지 않은 결과만 캐시 (실패·로컬 대체 일정은 다음 요청에서 다시 LLM 시도)
+    - 동선 정리(optimize_route)를 거친 결과(routed)만 캐시 → 적중 응답도 항상 정리된 순서
+      (적중 시엔 후보 좌표가 없어 다시 돌릴 수 없으므로 넣을 때 보장)
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: Optional[int] = None):
+        self._lru = LRUCache(
+            maxsize=max_entries or settings.PLAN_CACHE_MAX_ENTRIES,
+            ttl_seconds=ttl_seconds or settings.PLAN_CACHE_TTL_SECONDS,
+        )
+        self._flight = SingleFlight()
+
+    @staticmethod
+    def cacheable(result: Dict[str, Any]) -> bool:
+        return (
+            bool(result.get("itinerary"))
+            and result.get("source", "llm") == "llm"
+            and bool(result.get("routed"))
+        )
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Dict[str, Any]],
+        timeout: Optional[float] = None,
+        fallback: Optional[Callable[[], Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        timeout: 응답 마감이 있는 호출의 남은 시간. 진행 중인 계산을 이만큼만 기다리고 넘으면 fallback()
+        마감 유무를 single-flight 키에 넣어, 마감 없는 호출이 마감 있는 leader의 로컬 대체 일정을 받지 않게 함
+        """
+        hit = self._lru.get(key)
+        if hit is None:
+            try:
+                hit = self._flight.do(
+                    (key, timeout is not None),
+                    lambda: self._compute_and_store(key, compute),
+                    timeout=None if timeout is None else max(0.0, timeout),
+                )
+            except FutureTimeout:
+                if fallback is None:
+                    raise
+                return fallback()
+        # 호출 측이 항목을 고쳐도 캐시가 오염되지 않도록 복사본 반환
+        return copy.deepcopy(hit)
+
+    def peek(self, key: str) -> Optional[Dict[str, Any]]:
+        hit = self._lru.get(key)
+        return copy.deepcopy(hit) if hit is not None else None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        if self.cacheable(result):
+            self._lru.set(key, copy.deepcopy(result))
+
+    def _compute_and_store(self, key: str, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        hit = self._lru.get(key)  # 앞선 leader가 방금 채웠을 수 있음
+        if hit is not None:
+            return hit
+        result = compute()
+        if self.cacheable(result):
+            self._lru.set(key, result)
+        return result
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+
+_shared_cache: Optional[PlanResultCache] = None
+_shared_lock = threading.Lock()
+
+def get_plan_result_cache() -> PlanResultCache:
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = PlanResultCache()
+        return _shared_cache
@@ -0,0 +1,190 @@
+# src/services/plan_fallback.py
+from __future__ import annotations
+import math
+import re
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from services.geo import parse_latlng
+
+# LLM이 늦거나 실패할 때 쓰는 결정적(deterministic) 휴리스틱 플래너.
+# 입력이 같으면 항상 같은 일정, 외부 호출 없음.
+
+DAY_START = time(9, 0)
+DAY_END = time(21, 0)
+FESTIVAL_MINUTES = 120
+STAY_MINUTES = {"place": 90, "cafe": 45, "restaurant": 60}
+MEAL_WINDOWS = ((time(11, 30), time(13, 30)), (time(17, 30), time(19, 30)))
+AVG_SPEED_KMH = 30.0
+MIN_MOVE_MINUTES = 10
+WAIT_MINUTES = 30
+
+_EXCLUDED_TYPES = {"parking", "lodging"}
+_CAFE_TYPES = {"cafe", "bakery"}
+_RESTAURANT_TYPES = {"restaurant", "food", "meal_takeaway", "meal_delivery"}
+_WEEKDAYS = "월화수목금토일"
+_HOUR = re.compile(r"(오전|오후)?\s*(\d{1,2}):(\d{2})")
+
+
+def place_kind(types: Sequence[str]) -> Optional[str]:
+    """Google types → 일정 type (place/cafe/restaurant), 주차장·숙소는 None"""
+    t = set(types or [])
+    if t & _EXCLUDED_TYPES:
+        return None
+    if t & _CAFE_TYPES:
+        return "cafe"
+    if t & _RESTAURANT_TYPES:
+        return "restaurant"
+    return "place"
+
+
+def _to_minutes(ampm: Optional[str], h: str, m: str) -> int:
+    hour = int(h) % 12 if ampm else int(h)
+    if ampm == "오후":
+        hour += 12
+    return hour * 60 + int(m)
+
+
+def is_open(weekday_text: Sequence[str], at: datetime, minutes: int) -> bool:
+    """
+    weekday_text("월요일: 오전 9:00~오후 6:00") 기준 [at, at+minutes] 영업 여부.
+    형식을 모르면 영업 중으로 간주 (정보 없음 → 배제하지 않음)
+    """
+    prefix = _WEEKDAYS[at.weekday()] + "요일"
+    line = next((l for l in weekday_text or [] if l.startswith(prefix)), None)
+    if line is None:
+        return True
+    body = line.split(":", 1)[1] if ":" in line else line
+    if "휴무" in body:
+        return False
+    if "24시간" in body:
+        return True
+    times = _HOUR.findall(body)
+    if len(times) < 2:
+        return True
+    start_m = at.hour * 60 + at.minute
+    end_m = start_m + minutes
+    for (a1, h1, m1), (a2, h2, m2) in zip(times[0::2], times[1::2]):
+        open_m, close_m = _to_minutes(a1, h1, m1), _to_minutes(a2 or a1, h2, m2)
+        if close_m <= open_m:       # 자정 넘김
+            close_m += 24 * 60
+        if open_m <= start_m and end_m <= close_m:
+            return True
+    return False
+
+
+def _km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * 6371.0088 * math.asin(math.sqrt(min(1.0, h)))
+
+
+def move_minutes(km: float) -> int:
+    """이동 거리(km) → 이동 시간(분), 5분 단위 올림 (최소 MIN_MOVE_MINUTES)"""
+    m = km / AVG_SPEED_KMH * 60
+    return max(MIN_MOVE_MINUTES, int(math.ceil(m / 5.0)) * 5)
+
+
+def _in_meal_window(t: datetime) -> Optional[int]:
+    for i, (a, b) in enumerate(MEAL_WINDOWS):
+        if a <= t.time() <= b:
+            return i
+    return None
+
+
+def _item(kind: str, title: str, start: datetime, end: datetime, description: str) -> Dict[str, Any]:
+    return {
+        "index": 0,
+        "type": kind,
+        "title": title,
+        "start_time": start.isoformat(),
+        "end_time": end.isoformat(),
+        "description": description,
+    }
+
+
+def build_local_plan(
+    fest_title: str,
+    fest_location: Optional[str],
+    start_at: datetime,
+    end_at: datetime,
+    candidates: Sequence[Any],
+) -> Dict[str, Any]:
+    """
+    1) 첫날 첫 슬롯에 축제 배치
+    2) 남은 시간을 가까운 후보로 탐욕적으로 채움
+       - 식사 시간대엔 restaurant, 장소 두 곳마다 cafe, 그 외 place
+       - 이동 시간(평균 30km/h)·영업시간 반영
+    3) suggest_plan과 같은 스키마({"itinerary", "totals"})로 반환
+    """
+    here = parse_latlng(fest_location)
+    pool: List[Tuple[str, Any, Tuple[float, float]]] = []
+    for p in candidates:
+        kind = place_kind(p.category)
+        if kind is not None and p.lat is not None and p.lng is not None:
+            pool.append((kind, p, (p.lat, p.lng)))
+
+    itinerary: List[Dict[str, Any]] = []
+    travel_minutes = 0
+    festival_done = False
+    used = set()
+
+    day = start_at.date()
+    while day <= end_at.date():
+        tz = start_at.tzinfo
+        t = max(start_at, datetime.combine(day, DAY_START, tz))
+        day_end = min(end_at, datetime.combine(day, DAY_END, tz))
+        meals_done = set()
+        since_cafe = 0
+
+        if not festival_done and t + timedelta(minutes=FESTIVAL_MINUTES) <= day_end:
+            end = t + timedelta(minutes=FESTIVAL_MINUTES)
+            itinerary.append(_item("festival", fest_title, t, end, "행사장 중심 활동"))
+            t, festival_done = end, True
+
+        while t < day_end:
+            meal = _in_meal_window(t)
+            if meal is not None and meal not in meals_done:
+                want = "restaurant"
+            elif since_cafe >= 2:
+                want = "cafe"
+            else:
+                want = "place"
+
+            best = None
+            for i, (kind, p, pos) in enumerate(pool):
+                if i in used or kind != want:
+                    continue
+                move = move_minutes(_km(here, pos)) if here else MIN_MOVE_MINUTES
+                arrive = t + timedelta(minutes=move)
+                leave = arrive + timedelta(minutes=STAY_MINUTES[kind])
+                if leave > day_end or not is_open(p.operating_hours, arrive, STAY_MINUTES[kind]):
+                    continue
+                if best is None or move < best[0]:
+                    best = (move, i, arrive, leave)
+            if best is None:
+                if want == "place":
+                    t += timedelta(minutes=WAIT_MINUTES)   # 지금 열린 곳 없음 → 조금 뒤 다시
+                elif want == "cafe":
+                    since_cafe = 0
+                else:
+                    meals_done.add(meal)
+                continue
+
+            move, i, arrive, leave = best
+            kind, p, pos = pool[i]
+            used.add(i)
+            itinerary.append(_item(kind, p.name, arrive, leave, f"주소: {p.address}"))
+            travel_minutes += move
+            here, t = pos, leave
+            if kind == "restaurant" and meal is not None:
+                meals_done.add(meal)
+            since_cafe = 0 if kind == "cafe" else since_cafe + 1
+        day += timedelta(days=1)
+
+    for i, it in enumerate(itinerary, start=1):
+        it["index"] = i
+    return {
+        "itinerary": itinerary,
+        "totals": {"estimated_cost_krw": 0, "estimated_travel_time_minutes": travel_minutes},
+    }
@@ -0,0 +1,172 @@
+# src/services/plan_jobs.py
+from __future__ import annotations
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import update
+
+from core.config import settings
+from db.base import AsyncSessionLocal, SessionLocal
+from db.models import PlanJob
+from schemas.plan import ItineraryRequest
+from services.plan_service import process_plan_sync
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+# 작업 실행용 전용 풀 (FastAPI 요청 스레드풀과 분리)
+_executor: Optional[ThreadPoolExecutor] = None
+_slots = threading.BoundedSemaphore(settings.PLAN_JOB_MAX_PENDING)
+_lock = threading.Lock()
+# 이 프로세스 풀에 들어가 있는(대기·실행 중) 작업 id → 주기 점검에서 다시 넣거나 stale 처리하지 않음
+_inflight: set = set()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.PLAN_JOB_WORKERS, thread_name_prefix="plan-job")
+        return _executor
+
+
+def _enqueue(job_id: str) -> None:
+    if not _slots.acquire(blocking=False):
+        raise JobQueueFull("plan job queue is full")
+    try:
+        with _lock:
+            _inflight.add(job_id)
+        _get_executor().submit(_run_job, job_id)
+    except Exception:
+        with _lock:
+            _inflight.discard(job_id)
+        _slots.release()
+        raise
+
+
+def submit_plan_job(payload: ItineraryRequest, client_id: Optional[str] = None) -> PlanJob:
+    """작업 행을 queued로 저장하고 풀에 넣음 → 즉시 반환"""
+    job = PlanJob(
+        id=uuid.uuid4().hex,
+        status="queued",
+        request_json=payload.model_dump(mode="json"),
+        client_id=client_id,
+    )
+    with SessionLocal() as s:
+        s.add(job)
+        s.commit()
+        s.refresh(job)
+        s.expunge(job)
+    try:
+        _enqueue(job.id)
+    except JobQueueFull:
+        _finish(job.id, "failed", error="queue full")
+        raise
+    return job
+
+
+def get_plan_job(job_id: str) -> Optional[PlanJob]:
+    with SessionLocal() as s:
+        job = s.get(PlanJob, job_id)
+        if job is not None:
+            s.expunge(job)
+        return job
+
+
+async def get_plan_job_async(job_id: str) -> Optional[PlanJob]:
+    """폴링용: 스레드풀을 쓰지 않고 비동기 엔진으로 조회"""
+    async with AsyncSessionLocal() as s:
+        job = await s.get(PlanJob, job_id)
+        if job is not None:
+            s.expunge(job)
+        return job
+
+
+def _claim(job_id: str) -> Optional[dict]:
+    """queued → running 원자적 전환 (여러 워커 프로세스가 같은 작업을 잡지 않도록)"""
+    with SessionLocal() as s:
+        res = s.execute(
+            update(PlanJob)
+            .where(PlanJob.id == job_id, PlanJob.status == "queued")
+            .values(status="running", updated_at=datetime.now(tz=timezone.utc))
+        )
+        s.commit()
+        if res.rowcount != 1:
+            return None
+        return s.get(PlanJob, job_id).request_json
+
+
+def _finish(job_id: str, status: str, result: Optional[dict] = None, error: Optional[str] = None) -> None:
+    with SessionLocal() as s:
+        s.execute(
+            update(PlanJob)
+            .where(PlanJob.id == job_id)
+            .values(status=status, result_json=result, error=error, updated_at=datetime.now(tz=timezone.utc))
+        )
+        s.commit()
+
+
+def _run_job(job_id: str) -> None:
+    try:
+        request_json = _claim(job_id)
+        if request_json is None:
+            return
+        try:
+            payload = ItineraryRequest.model_validate(request_json)
+            result = process_plan_sync(payload)
+        except Exception as e:
+            logger.exception("Plan job failed: %s", job_id)
+            _finish(job_id, "failed", error=str(e))
+        else:
+            _finish(job_id, "done", result=result)
+    finally:
+        with _lock:
+            _inflight.discard(job_id)
+        _slots.release()
+
+
+def resume_plan_jobs() -> int:
+    """
+    기동 시 + PLAN_JOB_SWEEP_SECONDS마다 호출: 남아 있던 queued 작업과,
+    오래 멈춘 running 작업(이전 프로세스가 죽은 것)을 다시 대기열로.
+    이 프로세스 풀에 이미 있는 작업은 건너뜀
+    """
+    stale_before = datetime.now(tz=timezone.utc) - timedelta(seconds=settings.PLAN_JOB_STALE_SECONDS)
+    with _lock:
+        local = list(_inflight)
+    with SessionLocal() as s:
+        stale = update(PlanJob).where(PlanJob.status == "running", PlanJob.updated_at < stale_before)
+        if local:
+            stale = stale.where(PlanJob.id.notin_(local))
+        s.execute(stale.values(status="queued"))
+        s.commit()
+        q = s.query(PlanJob.id).filter(PlanJob.status == "queued")
+        if local:
+            q = q.filter(PlanJob.id.notin_(local))
+        ids = [jid for (jid,) in q.order_by(PlanJob.created_at).all()]
+    resumed = 0
+    for jid in ids:
+        try:
+            _enqueue(jid)
+        except JobQueueFull:
+            break  # 남은 건 다음 점검 때
+        resumed += 1
+    return resumed
+
+
+def shutdown_plan_jobs() -> None:
+    """on_shutdown: 대기 중 작업은 버리고(DB엔 queued로 남음) 실행 중인 것만 마무리"""
+    global _executor
+    with _lock:
+        ex, _executor = _executor, None
+        _inflight.clear()
+    if ex is not None:
+        ex.shutdown(wait=False, cancel_futures=True)
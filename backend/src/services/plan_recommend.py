@@ -1,13 +1,37 @@
 #%%
 import os
+import asyncio
+import logging
+import threading
+import time
 import requests
 import json
+from concurrent.futures import Future, TimeoutError as FutureTimeout
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from datetime import datetime
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from openai import OpenAI
 import httpx
 import certifi
 
+from core.config import settings
+from core.async_runner import run_sync, submit
+from core.metrics import (
+    GOOGLE_REQUESTS, GOOGLE_REQUEST_SECONDS, OPENAI_REQUESTS, OPENAI_REQUEST_SECONDS,
+    PLAN_STAGE_SECONDS, record_openai_usage,
+)
+from services.place_cache import DETAIL_FIELDS, PlaceDetailsCache, get_place_details_cache
+from services.geocode_cache import get_geocode_cache
+from services.place_store import PlaceSearchStore, get_place_search_store
+from services.place_index import get_place_index
+from services.geo import parse_latlng
+from services.plan_stream import ItineraryStreamParser
+from services.ai_client import get_openai_client
+from services.place_ranking import rank_places, rank_raw_results, estimate_tokens
+from services.plan_fallback import build_local_plan
+
+
+logger = logging.getLogger(__name__)
 
 # 환경변수에서 API 키 읽기
 GOOGLE_API_KEY = ""
@@ -16,6 +40,18 @@ OPENAI_API_KEY = ""
 class GoogleAPIError(Exception):
     pass
 
+# HTTP 200이어도 JSON status가 이 값들이 아니면(OVER_QUERY_LIMIT·REQUEST_DENIED·INVALID_REQUEST 등) 실패
+_GOOGLE_OK_STATUSES = ("OK", "ZERO_RESULTS")
+
+def _count_google(endpoint: str, data: Optional[Dict[str, Any]]) -> None:
+    """google_api_requests_total: 전송 실패(data=None)는 error, 나머지는 응답 JSON의 status로 구분"""
+    if data is None:
+        outcome = "error"
+    else:
+        status = str(data.get("status") or "OK")
+        outcome = "ok" if status in _GOOGLE_OK_STATUSES else status.lower()
+    GOOGLE_REQUESTS.inc(outcome=outcome, endpoint=endpoint)
+
 @dataclass
 class Place:
     name: str
@@ -51,26 +87,34 @@ class PlacesClient:
             "fields": "place_id",
         }
         try:
-            r = requests.get(url, params=params, timeout=10)
-            r.raise_for_status()
-            candidates = r.json().get("candidates", [])
-            return candidates[0]["place_id"] if candidates else ""
+            with GOOGLE_REQUEST_SECONDS.time(endpoint="findplacefromtext"):
+                r = requests.get(url, params=params, timeout=10)
+                r.raise_for_status()
+            data = r.json()
         except requests.exceptions.RequestException as e:
+            _count_google("findplacefromtext", None)
             raise GoogleAPIError(f"findplacefromtext 실패: {e}") from e
+        _count_google("findplacefromtext", data)
+        candidates = data.get("candidates", [])
+        return candidates[0]["place_id"] if candidates else ""
 
     def _geocode_place_id(self, place_id: str) -> Optional[str]:
         url = "https://maps.googleapis.com/maps/api/geocode/json"
         params = {"place_id": place_id, "key": self.api_key, "language": self.language}
         try:
-            r = requests.get(url, params=params, timeout=10)
-            r.raise_for_status()
-            results = r.json().get("results", [])
-            if not results:
-                return None
-            loc = results[0]["geometry"]["location"]
-            return f"{loc['lat']},{loc['lng']}"
+            with GOOGLE_REQUEST_SECONDS.time(endpoint="geocode"):
+                r = requests.get(url, params=params, timeout=10)
+                r.raise_for_status()
+            data = r.json()
         except requests.exceptions.RequestException as e:
+            _count_google("geocode", None)
             raise GoogleAPIError(f"geocode 실패: {e}") from e
+        _count_google("geocode", data)
+        results = data.get("results", [])
+        if not results:
+            return None
+        loc = results[0]["geometry"]["location"]
+        return f"{loc['lat']},{loc['lng']}"
 
     def get_place_details(self, place_id: str) -> Dict[str, Any]:
         url = "https://maps.googleapis.com/maps/api/place/details/json"
@@ -81,11 +125,15 @@ class PlacesClient:
             "language": self.language,
         }
         try:
-            r = requests.get(url, params=params, timeout=10)
-            r.raise_for_status()
-            return r.json().get("result", {}) or {}
+            with GOOGLE_REQUEST_SECONDS.time(endpoint="details"):
+                r = requests.get(url, params=params, timeout=10)
+                r.raise_for_status()
+            data = r.json()
         except requests.exceptions.RequestException as e:
+            _count_google("details", None)
             raise GoogleAPIError(f"place details 실패: {e}") from e
+        _count_google("details", data)
+        return data.get("result", {}) or {}
 
     def search_places_nearby(self, location: str, keyword: str, radius_m: int = 10000) -> List[Dict[str, Any]]:
         url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
@@ -97,29 +145,32 @@ class PlacesClient:
             "language": self.language,
         }
         try:
-            r = requests.get(url, params=params, timeout=10)
-            r.raise_for_status()
-            return r.json().get("results", []) or []
+            with GOOGLE_REQUEST_SECONDS.time(endpoint="nearbysearch"):
+                r = requests.get(url, params=params, timeout=10)
+                r.raise_for_status()
+            data = r.json()
         except requests.exceptions.RequestException as e:
+            _count_google("nearbysearch", None)
             raise GoogleAPIError(f"nearbysearch 실패: {e}") from e
+        _count_google("nearbysearch", data)
+        return data.get("results", []) or []
 
     def find_near_places(self, fest_location: str, keywords: Optional[List[str]] = None, radius_m: int = 10000) -> List[Place]:
         if not keywords:
-            keywords = ["관광", "레저", "맛집", "자연경관", "체험", "카페", "식당", "박물관", "전시"]
+            keywords = DEFAULT_KEYWORDS
         results: List[Place] = []
 
         for kw in keywords:
             try:
                 raw = self.search_places_nearby(location=fest_location, keyword=kw, radius_m=radius_m)
             except GoogleAPIError as e:
-                print(f"[에러] keyword={kw} API 호출 실패: {e}")
+                logger.warning("[PLACES] keyword=%s API 호출 실패: %s", kw, e)
                 continue
 
             for j, r in enumerate(raw):
                 try:
                     loc = r.get("geometry", {}).get("location", {})
-                    lat, lng = loc.get("lat"), loc.get("lng")
-                    if lat is None or lng is None:
+                    if loc.get("lat") is None or loc.get("lng") is None:
                         continue
 
                     details = {}
@@ -128,25 +179,311 @@ class PlacesClient:
                         try:
                             details = self.get_place_details(pid) or {}
                         except GoogleAPIError as e:
-                            print(f"[경고] details 실패 idx={j}: {e}")
-
-                    results.append(
-                        Place(
-                            name=details.get("name", r.get("name", "정보 없음")),
-                            address=details.get("formatted_address", r.get("vicinity", "정보 없음")),
-                            category=r.get("types") or ["정보 없음"],
-                            rating=details.get("rating", r.get("rating")),
-                            lat=lat,
-                            lng=lng,
-                            operating_hours=details.get("opening_hours", {}).get("weekday_text", ["정보 없음"]),
-                            place_id=pid
-                        )
-                    )
+                            logger.warning("[PLACES] details 실패 idx=%s: %s", j, e)
+
+                    place = _to_place(r, details)
+                    if place:
+                        results.append(place)
                 except Exception as e:
-                    print(f"[에러] keyword={kw} 처리 중 오류: {e}")
+                    logger.warning("[PLACES] keyword=%s 처리 중 오류: %s", kw, e)
 
         return results
 
+
+DEFAULT_KEYWORDS = ["관광", "레저", "맛집", "자연경관", "체험", "카페", "식당", "박물관", "전시"]
+
+def find_cached_places(
+    location: Optional[str],
+    keywords: List[str],
+    radius_m: int,
+    search_store: Optional[PlaceSearchStore] = None,
+) -> Dict[str, List[Place]]:
+    """
+    캐시에 있는 후보만 키워드별로 (실시간 Google 호출 없음, 못 찾은 키워드는 결과에 없음)
+    1) 메모리 인덱스: 이미 검색해 둔 영역 안이면 네트워크/DB 없이 반경 질의
+    2) 야간 프리페치 저장소 (인덱스 로드 이후 추가된 분)
+    """
+    stored: Dict[str, List[Place]] = {}
+    if not location:
+        return stored
+    index = get_place_index()
+    center = parse_latlng(location)
+    if index is not None and center is not None:
+        for kw, recs in index.query(center[0], center[1], radius_m / 1000.0, keywords).items():
+            stored[kw] = [Place(**r.as_dict()) for r in recs]
+
+    remaining = [kw for kw in keywords if kw not in stored]
+    if remaining:
+        try:
+            found = (search_store or get_place_search_store()).get_many(location, remaining, radius_m)
+            for kw, rows in found.items():
+                stored[kw] = [Place(**row) for row in rows]
+        except Exception as e:
+            logger.warning("[PLACES] 장소 저장소 조회 실패: %s", e)
+    return stored
+
+def cached_local_plan(
+    fest_title: str,
+    fest_location: Optional[str],
+    start_at: datetime,
+    end_at: datetime,
+    categories: List[str],
+    radius_km: float = 10,
+) -> Tuple[Dict[str, Any], List[Place]]:
+    """
+    FestPlanner 없이 캐시된 후보만으로 만든 로컬 일정 → (일정, 점수순 후보).
+    같은 형태의 계산을 기다리다 마감을 넘긴 요청용 (지오코딩·실시간 검색·LLM 없음)
+    """
+    keywords = list(dict.fromkeys(categories or DEFAULT_KEYWORDS))
+    radius_m = max(1000, int(radius_km * 1000))
+    found = find_cached_places(fest_location, keywords, radius_m)
+    places = [p for kw in keywords for p in found.get(kw, [])]
+    candidates = rank_places(places, fest_location, categories, max_km=radius_km)
+    plan = build_local_plan(fest_title, fest_location, start_at, end_at, candidates)
+    plan["source"] = "local"
+    return plan, candidates
+
+def _to_place(r: Dict[str, Any], details: Dict[str, Any]) -> Optional[Place]:
+    """nearbysearch 결과 1건 + details → Place (좌표 없으면 None)"""
+    loc = r.get("geometry", {}).get("location", {})
+    lat, lng = loc.get("lat"), loc.get("lng")
+    if lat is None or lng is None:
+        return None
+    return Place(
+        name=details.get("name", r.get("name", "정보 없음")),
+        address=details.get("formatted_address", r.get("vicinity", "정보 없음")),
+        category=r.get("types") or ["정보 없음"],
+        rating=details.get("rating", r.get("rating")),
+        lat=lat,
+        lng=lng,
+        operating_hours=(details.get("opening_hours") or {}).get("weekday_text", ["정보 없음"]),
+        place_id=r.get("place_id"),
+    )
+
+
+class AsyncPlacesClient:
+    """
+    PlacesClient의 asyncio 버전.
+    - keep-alive httpx.AsyncClient 하나를 공유 (요청마다 새 연결 X)
+    - 키워드 검색과 details 조회를 동시에 보내되, 전체 동시 요청 수는 semaphore로 제한
+    - 반드시 core.async_runner의 백그라운드 루프에서 사용 (커넥션 풀이 루프에 귀속됨)
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        language: str = "ko",
+        http_client: Optional[httpx.AsyncClient] = None,
+        max_concurrency: Optional[int] = None,
+        details_cache: Optional[PlaceDetailsCache] = None,
+    ):
+        self.api_key = api_key or GOOGLE_API_KEY
+        if not self.api_key:
+            raise ValueError("GOOGLE_API_KEY가 설정되지 않았습니다.")
+        self.language = language
+        self._http = http_client or httpx.AsyncClient(
+            verify=certifi.where(),
+            timeout=settings.PLACES_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.PLACES_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.PLACES_MAX_KEEPALIVE,
+            ),
+        )
+        self._sem = asyncio.Semaphore(max_concurrency or settings.PLACES_MAX_CONCURRENCY)
+        self.details_cache = details_cache
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def _get_json(self, url: str, params: Dict[str, Any], what: str) -> Dict[str, Any]:
+        endpoint = url.rsplit("/", 2)[-2]   # URL의 API 이름
+        async with self._sem:
+            try:
+                # 세마포어 대기 제외, 실제 요청 시간만
+                with GOOGLE_REQUEST_SECONDS.time(endpoint=endpoint):
+                    r = await self._http.get(url, params=params)
+                    r.raise_for_status()
+                data = r.json()
+            except (httpx.HTTPError, ValueError) as e:
+                _count_google(endpoint, None)
+                raise GoogleAPIError(f"{what} 실패: {e}") from e
+        _count_google(endpoint, data)
+        return data
+
+    async def get_coords_from_place_name(self, place_name: str) -> str:
+        place_id = await self._find_place_id(place_name)
+        if not place_id:
+            return ""
+        coords = await self._geocode_place_id(place_id)
+        return coords or ""
+
+    async def _find_place_id(self, place_name: str) -> str:
+        data = await self._get_json(
+            "https://maps.googleapis.com/maps/api/place/findplacefromtext/json",
+            {
+                "input": place_name,
+                "inputtype": "textquery",
+                "key": self.api_key,
+                "language": self.language,
+                "fields": "place_id",
+            },
+            "findplacefromtext",
+        )
+        candidates = data.get("candidates", [])
+        return candidates[0]["place_id"] if candidates else ""
+
+    async def _geocode_place_id(self, place_id: str) -> Optional[str]:
+        data = await self._get_json(
+            "https://maps.googleapis.com/maps/api/geocode/json",
+            {"place_id": place_id, "key": self.api_key, "language": self.language},
+            "geocode",
+        )
+        results = data.get("results", [])
+        if not results:
+            return None
+        loc = results[0]["geometry"]["location"]
+        return f"{loc['lat']},{loc['lng']}"
+
+    async def get_place_details(self, place_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        data = await self._get_json(
+            "https://maps.googleapis.com/maps/api/place/details/json",
+            {
+                "place_id": place_id,
+                "fields": ",".join(fields or DETAIL_FIELDS),
+                "key": self.api_key,
+                "language": self.language,
+            },
+            "place details",
+        )
+        return data.get("result", {}) or {}
+
+    async def search_places_nearby(self, location: str, keyword: str, radius_m: int = 10000) -> List[Dict[str, Any]]:
+        data = await self._get_json(
+            "https://maps.googleapis.com/maps/api/place/nearbysearch/json",
+            {
+                "location": location,
+                "keyword": keyword,
+                "radius": radius_m,
+                "key": self.api_key,
+                "language": self.language,
+            },
+            "nearbysearch",
+        )
+        return data.get("results", []) or []
+
+    async def _search_keyword(self, location: str, kw: str, radius_m: int) -> List[Dict[str, Any]]:
+        try:
+            return await self.search_places_nearby(location=location, keyword=kw, radius_m=radius_m)
+        except GoogleAPIError as e:
+            logger.warning("[PLACES] keyword=%s API 호출 실패: %s", kw, e)
+            return []
+
+    async def _details_or_none(self, pid: str, fields: List[str]) -> Optional[Dict[str, Any]]:
+        try:
+            return await self.get_place_details(pid, fields=fields) or {}
+        except GoogleAPIError as e:
+            logger.warning("[PLACES] details 실패 place_id=%s: %s", pid, e)
+            return None
+
+    async def _load_details(self, pids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        details 일괄 확보:
+        - 캐시 get_many 1회 → TTL 지난 필드만 골라 동시 재요청
+        - 재요청 결과는 put_many로 캐시에 반영 (실패한 건 캐시하지 않음)
+        """
+        cached = {}
+        if self.details_cache is not None:
+            try:
+                cached = await asyncio.to_thread(self.details_cache.get_many, pids)
+            except Exception as e:
+                logger.warning("[PLACES] details 캐시 조회 실패: %s", e)
+
+        need = {
+            pid: (cached[pid].stale if pid in cached else list(DETAIL_FIELDS))
+            for pid in pids
+        }
+        need = {pid: fields for pid, fields in need.items() if fields}
+        fetched_list = await asyncio.gather(*(self._details_or_none(pid, f) for pid, f in need.items()))
+        fetched = {pid: d for pid, d in zip(need, fetched_list) if d is not None}
+
+        if self.details_cache is not None and fetched:
+            try:
+                await asyncio.to_thread(
+                    self.details_cache.put_many, fetched, {pid: need[pid] for pid in fetched}
+                )
+            except Exception as e:
+                logger.warning("[PLACES] details 캐시 저장 실패: %s", e)
+
+        details_by_id: Dict[str, Dict[str, Any]] = {}
+        for pid in pids:
+            merged = dict(cached[pid].values) if pid in cached else {}
+            merged.update({k: v for k, v in fetched.get(pid, {}).items() if v is not None})
+            details_by_id[pid] = merged
+        return details_by_id
+
+    async def find_near_places(self, fest_location: str, keywords: Optional[List[str]] = None, radius_m: int = 10000) -> List[Place]:
+        by_keyword = await self.find_near_places_by_keyword(fest_location, keywords, radius_m)
+        return [p for places in by_keyword.values() for p in places]
+
+    async def find_near_places_by_keyword(
+        self,
+        fest_location: str,
+        keywords: Optional[List[str]] = None,
+        radius_m: int = 10000,
+        details_limit: Optional[int] = None,
+    ) -> Dict[str, List[Place]]:
+        """
+        find_near_places와 같지만 키워드별로 나눠 반환 (프리페치 저장용).
+        details_limit: 점수 상위 N곳만 details 조회 (나머지는 nearbysearch 정보만)
+        """
+        keywords = list(dict.fromkeys(keywords or DEFAULT_KEYWORDS))
+
+        # 1) 키워드 검색 동시 실행
+        raw_lists = await asyncio.gather(
+            *(self._search_keyword(fest_location, kw, radius_m) for kw in keywords)
+        )
+
+        # 2) details: 캐시 우선, 부족분만 동시 조회 (같은 place_id는 한 번만)
+        all_raw = [r for raw in raw_lists for r in raw]
+        if details_limit is not None:
+            all_raw = rank_raw_results(all_raw, fest_location, keywords, radius_m / 1000.0)
+        pids = list(dict.fromkeys(r.get("place_id") for r in all_raw if r.get("place_id")))
+        if details_limit is not None:
+            pids = pids[:details_limit]
+        details_by_id = await self._load_details(pids)
+
+        # 3) 키워드 순서를 유지해 Place 조립
+        results: Dict[str, List[Place]] = {}
+        for kw, raw in zip(keywords, raw_lists):
+            places = results.setdefault(kw, [])
+            for r in raw:
+                try:
+                    place = _to_place(r, details_by_id.get(r.get("place_id"), {}))
+                    if place:
+                        places.append(place)
+                except Exception as e:
+                    logger.warning("[PLACES] keyword=%s 처리 중 오류: %s", kw, e)
+        return results
+
+
+_shared_async_places: Optional[AsyncPlacesClient] = None
+_shared_lock = threading.Lock()
+
+def get_async_places_client() -> AsyncPlacesClient:
+    """프로세스 공용 AsyncPlacesClient (keep-alive 풀 공유)"""
+    global _shared_async_places
+    with _shared_lock:
+        if _shared_async_places is None:
+            _shared_async_places = AsyncPlacesClient(details_cache=get_place_details_cache())
+        return _shared_async_places
+
+async def close_async_places_client() -> None:
+    global _shared_async_places
+    with _shared_lock:
+        client, _shared_async_places = _shared_async_places, None
+    if client is not None:
+        await client.aclose()
+
 class FestPlanner:
     """
     - 체류시간 제약 X
@@ -155,15 +492,33 @@ class FestPlanner:
     - OpenAI 응답 호출 포함
     """
 
-    def __init__(self, fest_title: str, fest_location_text: str, travel_needs: Dict[str, Any], places_client: Optional[PlacesClient] = None):
+    def __init__(
+        self,
+        fest_title: str,
+        fest_location_text: str,
+        travel_needs: Dict[str, Any],
+        places_client: Optional[PlacesClient] = None,
+        async_places_client: Optional[AsyncPlacesClient] = None,
+        fest_location: Optional[str] = None,
+        search_store: Optional[PlaceSearchStore] = None,
+        openai_client: Optional[OpenAI] = None,
+    ):
         self.fest_title = fest_title
+        self.search_store = search_store or get_place_search_store()
+        self.candidates: List[Place] = []   # build_prompt에서 점수순으로 채움 (후처리 단계에서 재사용)
         self.travel_needs = self._normalize_needs(travel_needs)
         self.places = places_client or PlacesClient()
-        self.fest_location = self.places.get_coords_from_place_name(fest_location_text)
-        self.client = OpenAI(
-            api_key=OPENAI_API_KEY,
-            http_client=httpx.Client(verify=certifi.where())  # ⬅️ 추가
-        )
+        self.async_places = async_places_client or get_async_places_client()
+        if fest_location:
+            # 크롤 시점에 저장해 둔 좌표("lat,lng")가 있으면 외부 호출 없이 사용
+            self.fest_location = fest_location
+        else:
+            # 축제 주소는 고정된 소수 집합 → 정규화 주소 캐시 + 동시 miss 합치기
+            self.fest_location = get_geocode_cache().resolve(
+                fest_location_text, self.places.get_coords_from_place_name
+            )
+        # 요청마다 새로 만들지 않고 lifespan에서 만든 공용 클라이언트(커넥션 풀) 사용
+        self.client = openai_client or get_openai_client(OPENAI_API_KEY)
 
     def _normalize_needs(self, needs: Dict[str, Any]) -> Dict[str, Any]:
         if "budget" not in needs and "burget" in needs:
@@ -177,16 +532,46 @@ class FestPlanner:
         return needs
 
     def find_places_in_categories(self, categories: List[str], radius_km: int = 10) -> List[Place]:
+        if not self.fest_location:
+            return []
+        return run_sync(self._find_places_async(categories, radius_km))
+
+    async def _find_places_async(self, categories: List[str], radius_km: float = 10, details_limit: Optional[int] = None) -> List[Place]:
         if not self.fest_location:
             return []
         radius_m = max(1000, int(radius_km * 1000))
-        return self.places.find_near_places(self.fest_location, keywords=categories, radius_m=radius_m)
+        keywords = list(dict.fromkeys(categories or DEFAULT_KEYWORDS))
+
+        # 1) 메모리 인덱스 → 2) 야간 프리페치 저장소 (DB 조회가 있어 스레드에서)
+        stored = await asyncio.to_thread(find_cached_places, self.fest_location, keywords, radius_m, self.search_store)
+
+        # 3) 어디에도 없는 카테고리만 실시간 검색
+        missing = [kw for kw in keywords if kw not in stored]
+        live: Dict[str, List[Place]] = {}
+        if missing:
+            live = await self.async_places.find_near_places_by_keyword(
+                self.fest_location, keywords=missing, radius_m=radius_m, details_limit=details_limit
+            )
+
+        return [p for kw in keywords for p in (stored[kw] if kw in stored else live.get(kw, []))]
+
+    def rank_candidates(self, nearby_places: Optional[List[Place]]) -> List[Place]:
+        """중복 제거 + 거리·평점·카테고리 적합도 점수순 정렬"""
+        return rank_places(nearby_places or [], self.fest_location, self.travel_needs["categories"], max_km=10.0)
 
     def build_prompt(self, nearby_places: Optional[List[Place]] = None) -> str:
+        # 점수 높은 순으로 토큰 예산이 찰 때까지만 채움 (고정 [:20] 대신)
+        self.candidates = self.rank_candidates(nearby_places)
         snippets = []
-        for p in (nearby_places or [])[:20]:
+        used = 0
+        for p in self.candidates[:settings.PROMPT_PLACES_MAX]:
             cat = ", ".join(p.category[:3])
-            snippets.append(f"- {p.name} | {cat} | 평점:{p.rating} | {p.address}")
+            line = f"- {p.name} | {cat} | 평점:{p.rating} | {p.address}"
+            cost = estimate_tokens(line) + 1
+            if snippets and used + cost > settings.PROMPT_PLACES_TOKEN_BUDGET:
+                break
+            snippets.append(line)
+            used += cost
         places_block = "\n".join(snippets) if snippets else "(근처 후보 없음)"
 
         start_at = self.travel_needs["start_at"]
@@ -205,7 +590,7 @@ class FestPlanner:
   - 최대 예산: {budget}
   - 희망 여행 컨셉(참고용): {categories}
 
-참고용 주변 장소(최대 20개)
+참고용 주변 장소(적합도 순 상위 {len(snippets)}개)
 {places_block}
 
 요구사항
@@ -247,31 +632,110 @@ class FestPlanner:
 """
         return user_prompt.strip()
 
-    def suggest_plan(self) -> Any:
+    def _start_stages(self, deadline_at: Optional[float] = None) -> Tuple[List[Place], Future]:
+        """
+        지오코딩(생성자) 이후 단계를 동시에 시작:
+        - 주차 검색은 백그라운드 루프에 띄워 두고 (LLM 호출과 겹침)
+        - 프롬프트 후보 검색 결과만 기다려 반환 (deadline_at이 있으면 남은 시간까지만)
+        단계별 실패는 서로 번지지 않음 (후보 검색 실패 → 후보 없이, 마감 초과 → 캐시된 후보만으로 진행)
+        """
+        parking_fut = submit(self._suggest_parking_async())
+        nearby_places: List[Place] = []
+        if self.fest_location:
+            categories = self.travel_needs["categories"]
+            timeout = None if deadline_at is None else max(0.0, deadline_at - time.monotonic())
+            try:
+                nearby_places = run_sync(self._find_places_async(
+                    categories, radius_km=10, details_limit=settings.PROMPT_DETAILS_LIMIT
+                ), timeout=timeout)
+            except FutureTimeout:
+                logger.warning("[PLAN] 후보 장소 검색 마감 초과 → 캐시된 후보만 사용")
+                keywords = list(dict.fromkeys(categories or DEFAULT_KEYWORDS))
+                found = find_cached_places(self.fest_location, keywords, 10000, self.search_store)
+                nearby_places = [p for kw in keywords for p in found.get(kw, [])]
+            except Exception as e:
+                logger.warning("[PLAN] 후보 장소 검색 실패: %s", e)
+        return nearby_places, parking_fut
+
+    @staticmethod
+    def _join_parking(parking_fut: Future, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """주차 단계 합류 (실패하거나 timeout 안에 못 끝나도 본 일정은 그대로)"""
         try:
-            if not OPENAI_API_KEY:
-                return {"error": "OPENAI_API_KEY가 설정되지 않았습니다."}
-
-            nearby_places = []
-            if self.fest_location:
-                nearby_places = self.find_places_in_categories(self.travel_needs["categories"], radius_km=10)
-
-            user_prompt = self.build_prompt(nearby_places=nearby_places)
-
-            response = self.client.responses.create(
+            return parking_fut.result(timeout=timeout)
+        except Exception as e:
+            parking_fut.cancel()
+            logger.warning("[PLAN] 주차장 검색 실패: %r", e)
+            return {"itinerary": [], "totals": {"estimated_cost_krw": 0, "estimated_travel_time_minutes": 0}}
+
+    def _call_llm(self, user_prompt: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """LLM 일정 생성 (timeout: 이번 호출에만 적용, 재시도 없음)"""
+        if not OPENAI_API_KEY or self.client is None:
+            raise RuntimeError("OPENAI_API_KEY가 설정되지 않았습니다.")
+        client = self.client
+        if timeout is not None:
+            if timeout <= 0:
+                raise TimeoutError("응답 마감 시간 초과 (LLM 호출 전)")
+            client = client.with_options(timeout=timeout, max_retries=0)
+        with OPENAI_REQUEST_SECONDS.time(OPENAI_REQUESTS, call="plan"):
+            response = client.responses.create(
                 model="gpt-4o",
                 tools=[{"type": "web_search_preview"}],
                 input=user_prompt
             )
+        record_openai_usage("plan", response)
+        main_plan_text = getattr(response, "output_text", None) or str(response)
+        try:
+            return json.loads(main_plan_text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"OpenAI 응답 JSON 파싱 실패: {e}")
+
+    def local_plan(self) -> Dict[str, Any]:
+        """self.candidates만으로 만든 휴리스틱 일정 (외부 호출 없음, 수 ms)"""
+        def _dt(v: Any) -> datetime:
+            return v if isinstance(v, datetime) else datetime.fromisoformat(str(v))
+        plan = build_local_plan(
+            self.fest_title,
+            self.fest_location,
+            _dt(self.travel_needs["start_at"]),
+            _dt(self.travel_needs["end_at"]),
+            self.candidates,
+        )
+        plan["source"] = "local"
+        return plan
+
+    def suggest_plan(self, deadline_at: Optional[float] = None) -> Any:
+        """
+        deadline_at(time.monotonic() 기준 절대 시각)이 주어지면 지연 상한 모드:
+        후보 검색·LLM·주차 합류 모두 그 시각까지 남은 시간만 씀.
+        LLM 응답이 마감 안에 없거나 실패하면 로컬 휴리스틱 일정(source="local")으로 대신함.
+        """
+        parking_fut: Optional[Future] = None
+        try:
+            if not OPENAI_API_KEY and deadline_at is None:
+                return {"error": "OPENAI_API_KEY가 설정되지 않았습니다."}
 
-            main_plan_text = getattr(response, "output_text", None) or str(response)
-
-            try:
-                main_plan = json.loads(main_plan_text)
-            except json.JSONDecodeError as e:
-                return {"error": f"OpenAI 응답 JSON 파싱 실패: {e}"}
+            with PLAN_STAGE_SECONDS.time(stage="candidates"):
+                nearby_places, parking_fut = self._start_stages(deadline_at)
+            with PLAN_STAGE_SECONDS.time(stage="prompt"):
+                user_prompt = self.build_prompt(nearby_places=nearby_places)
+
+            # LLM 호출 동안 주차 검색은 백그라운드에서 계속 진행
+            parking_timeout = None
+            if deadline_at is None:
+                with PLAN_STAGE_SECONDS.time(stage="llm"):
+                    main_plan = self._call_llm(user_prompt)
+            else:
+                try:
+                    with PLAN_STAGE_SECONDS.time(stage="llm"):
+                        main_plan = self._call_llm(user_prompt, timeout=deadline_at - time.monotonic())
+                except Exception as e:
+                    logger.warning("[PLAN] LLM 응답 지연/실패 → 로컬 일정 사용: %r", e)
+                    with PLAN_STAGE_SECONDS.time(stage="local_fallback"):
+                        main_plan = self.local_plan()
+                parking_timeout = max(0.0, deadline_at - time.monotonic())
 
-            parking_plan = self.suggest_parking()
+            with PLAN_STAGE_SECONDS.time(stage="parking_join"):
+                parking_plan = self._join_parking(parking_fut, timeout=parking_timeout)
 
             main_itinerary = main_plan.get("itinerary", [])
             parking_itinerary = parking_plan.get("itinerary", [])
@@ -283,20 +747,87 @@ class FestPlanner:
 
             main_plan["itinerary"] = main_itinerary
 
-            main_plan["totals"]["estimated_cost_krw"] += parking_plan["totals"]["estimated_cost_krw"]
-            main_plan["totals"]["estimated_travel_time_minutes"] += parking_plan["totals"]["estimated_travel_time_minutes"]
+            totals = main_plan.setdefault("totals", {"estimated_cost_krw": 0, "estimated_travel_time_minutes": 0})
+            totals["estimated_cost_krw"] += parking_plan["totals"]["estimated_cost_krw"]
+            totals["estimated_travel_time_minutes"] += parking_plan["totals"]["estimated_travel_time_minutes"]
 
             return main_plan
 
         except Exception as e:
+            if parking_fut is not None:
+                parking_fut.cancel()
             return {"error": f"계획 생성 중 오류 발생: {str(e)}"}
 
+    def stream_plan(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        suggest_plan의 스트리밍 버전.
+        - 모델이 itinerary 항목을 하나 완성할 때마다 ("item", 항목)
+        - 끝나면 주차 항목들 뒤에 ("totals", 합계)
+        """
+        if not OPENAI_API_KEY:
+            raise RuntimeError("OPENAI_API_KEY가 설정되지 않았습니다.")
+
+        nearby_places, parking_fut = self._start_stages()
+        user_prompt = self.build_prompt(nearby_places=nearby_places)
+        parser = ItineraryStreamParser()
+        # 지연 지표는 업스트림(요청 + 이벤트 수신) 시간만: yield 뒤 소비자(SSE 전송) 대기는 빼고 잼
+        spent = 0.0
+        outcome = "error"
+        try:
+            t0 = time.perf_counter()
+            stream = self.client.responses.create(
+                model="gpt-4o",
+                tools=[{"type": "web_search_preview"}],
+                input=user_prompt,
+                stream=True,
+            )
+            events = iter(stream)
+            spent += time.perf_counter() - t0
+            while True:
+                t0 = time.perf_counter()
+                event = next(events, None)
+                spent += time.perf_counter() - t0
+                if event is None:
+                    break
+                kind = getattr(event, "type", None)
+                if kind == "response.output_text.delta":
+                    for item in parser.feed(event.delta):
+                        yield "item", item
+                elif kind == "response.completed":
+                    # 스트림은 마지막 이벤트에만 usage가 실림
+                    record_openai_usage("plan_stream", getattr(event, "response", None))
+            outcome = "ok"
+        except BaseException as e:
+            # 클라이언트가 끊어 제너레이터가 닫힌 건 OpenAI 실패가 아님
+            if isinstance(e, GeneratorExit):
+                outcome = "cancelled"
+            parking_fut.cancel()
+            raise
+        finally:
+            OPENAI_REQUEST_SECONDS.observe(spent, call="plan_stream")
+            OPENAI_REQUESTS.inc(outcome=outcome, call="plan_stream")
+
+        main_plan = parser.finish()
+        totals = {"estimated_cost_krw": 0, "estimated_travel_time_minutes": 0}
+        totals.update(main_plan.get("totals") or {})
+
+        parking_plan = self._join_parking(parking_fut)
+        for item in parking_plan["itinerary"]:
+            yield "item", item
+        for k in ("estimated_cost_krw", "estimated_travel_time_minutes"):
+            totals[k] += parking_plan["totals"].get(k, 0)
+
+        yield "totals", totals
+
     def suggest_parking(self) -> Any:
+        return run_sync(self._suggest_parking_async())
+
+    async def _suggest_parking_async(self) -> Dict[str, Any]:
         nearby_places = []
         if self.fest_location:
-            nearby_places = self.find_places_in_categories(["공영주차장"], radius_km=1.5)
-            first_3_places = nearby_places[:3] # 처음 3개만 선택
-            return self.create_itinerary(first_3_places)
+            nearby_places = await self._find_places_async(["공영주차장"], radius_km=1.5)
+        first_3_places = nearby_places[:3] # 처음 3개만 선택
+        return self.create_itinerary(first_3_places)
 
     def create_itinerary(self, places: List[Any]):
         itinerary = []
@@ -1,17 +1,55 @@
 from __future__ import annotations
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from db.models import PlanRequest, PlanItineraryItem
+from db.models import AppMeta, Festival, PlanRequest, PlanItineraryItem
 
-def save_plan_request(db: Session, cmd) -> int:
+# plan_request.id 블록 할당 카운터 (app_meta.value = 다음에 나눠 줄 id)
+PLAN_ID_KEY = "plan_request_next_id"
+
+def get_festival_coords(db: Session, festival_id: int) -> Optional[str]:
+    """
+    크롤 때 지오코딩해 둔 축제 좌표 → "lat,lng" (없으면 None)
+    """
+    row = db.get(Festival, festival_id)
+    if row is None or row.geocode_status != "ok" or row.lat is None or row.lng is None:
+        return None
+    return f"{row.lat},{row.lng}"
+
+def allocate_plan_ids(db: Session, size: int) -> Tuple[int, int]:
     """
-    요청 1건 저장 → plan_id 반환
+    plan_request.id를 size개 단위로 미리 받아 옴 → [start, end)
+    - 카운터 행 UPDATE 한 번 (행 잠금이라 여러 프로세스가 받아도 겹치지 않음)
+    - 카운터가 없으면 기존 최대 id 다음부터 시작
     """
-    row = PlanRequest(
-        client_app=cmd.client_app,
-        client_platform=cmd.client_platform,
-        client_version=cmd.client_version,
-        schedule_json={
+    for _ in range(2):
+        res = db.execute(
+            update(AppMeta).where(AppMeta.key == PLAN_ID_KEY).values(value=AppMeta.value + size)
+        )
+        if res.rowcount:
+            end = db.execute(select(AppMeta.value).where(AppMeta.key == PLAN_ID_KEY)).scalar_one()
+            db.commit()
+            return end - size, end
+        start = (db.execute(select(func.max(PlanRequest.id))).scalar() or 0) + 1
+        try:
+            db.execute(insert(AppMeta).values(key=PLAN_ID_KEY, value=start + size))
+            db.commit()
+            return start, start + size
+        except IntegrityError:
+            # 다른 프로세스가 먼저 만듦 → UPDATE 경로로 다시
+            db.rollback()
+    raise RuntimeError("plan id allocation failed")
+
+def plan_request_values(plan_id: int, cmd) -> dict:
+    """PlanCommand → plan_request 행 (bulk insert용)"""
+    return {
+        "id": plan_id,
+        "client_app": cmd.client_app,
+        "client_platform": cmd.client_platform,
+        "client_version": cmd.client_version,
+        "schedule_json": {
             "title": cmd.schedule.title,
             "start_at": cmd.schedule.start_at_kst.isoformat(),
             "end_at": cmd.schedule.end_at_kst.isoformat(),
@@ -22,7 +60,7 @@ def save_plan_request(db: Session, cmd) -> int:
             "festival_title": cmd.schedule.festival_title,
             "festival_detail_url": cmd.schedule.festival_detail_url,
         },
-        options_json={
+        "options_json": {
             "budget": cmd.options.budget,
             "categories": cmd.options.categories,
             "avoid_crowded": cmd.options.avoid_crowded,
@@ -30,31 +68,59 @@ def save_plan_request(db: Session, cmd) -> int:
             "end_time": cmd.options.end_time,
             "notes": cmd.options.notes,
         },
-    )
-    db.add(row)
-    db.commit()
-    db.refresh(row)
-    return row.id  # ← plan_id
+        # 큐에서 늦게 써도 요청 시각이 남도록 직접 채움
+        "created_at": datetime.now(timezone.utc),
+    }
 
 def _parse_iso(s: str) -> datetime:
     return datetime.fromisoformat(s)
 
+def plan_item_values(plan_id: int, items: list[dict]) -> List[dict]:
+    """정규화된 itinerary → plan_itinerary_item 행들 (시각 파싱 실패 항목은 제외)"""
+    now = datetime.now(timezone.utc)
+    rows: List[dict] = []
+    for it in items:
+        try:
+            rows.append({
+                "plan_request_id": plan_id,
+                "index": int(it["index"]),
+                "type": str(it["type"])[:24],
+                "title": str(it["title"])[:300],
+                "start_time": _parse_iso(it["start_time"]),
+                "end_time": _parse_iso(it["end_time"]),
+                "description": str(it.get("description") or "")[:1000],
+                "created_at": now,
+            })
+        except (KeyError, TypeError, ValueError):
+            continue
+    return rows
+
+def existing_plan_ids(db: Session, ids) -> set:
+    """plan_request에 실제로 있는 id만 (write-behind 항목의 부모 행 확인용)"""
+    ids = list(ids)
+    found: set = set()
+    for i in range(0, len(ids), 400):
+        found.update(db.execute(select(PlanRequest.id).where(PlanRequest.id.in_(ids[i:i + 400]))).scalars())
+    return found
+
+def bulk_insert_plan_rows(db: Session, requests: List[dict], items: List[dict]) -> None:
+    """요청 행 → 항목 행 순서로 한 트랜잭션에 bulk insert (외래키 순서 보장)"""
+    if requests:
+        db.execute(insert(PlanRequest), requests)
+    if items:
+        db.execute(insert(PlanItineraryItem), items)
+    db.commit()
+
+def save_plan_request(db: Session, cmd) -> int:
+    """
+    요청 1건 즉시 저장 → plan_id 반환 (배치 쓰기를 거치지 않는 경로용)
+    """
+    start, _ = allocate_plan_ids(db, 1)
+    bulk_insert_plan_rows(db, [plan_request_values(start, cmd)], [])
+    return start  # ← plan_id
+
 def save_plan_items(db: Session, plan_id: int, items: list[dict]) -> None:
     """
     추천 결과 여러 건을 plan_request_id 외래키로 저장
     """
-    rows = [
-        PlanItineraryItem(
-            plan_request_id=plan_id,
-            index=int(it["index"]),
-            type=str(it["type"]),
-            title=str(it["title"]),
-            start_time=_parse_iso(it["start_time"]),
-            end_time=_parse_iso(it["end_time"]),
-            description=str(it.get("description") or ""),
-        )
-        for it in items
-    ]
-    if rows:
-        db.add_all(rows)
-        db.commit()
\ No newline at end of file
+    bulk_insert_plan_rows(db, [], plan_item_values(plan_id, items))
@@ -1,12 +1,19 @@
 # src/services/plan_service.py  // ⬇️ 정확 패치 (추천 호출 + 저장 + 리턴)
 from __future__ import annotations
 import json
-from typing import Any, Dict, List
+import time as time_mod
+from typing import Any, Dict, Iterator, List, Optional
 from sqlalchemy.orm import Session
 from db.base import SessionLocal, Base, engine
 from schemas.plan import ItineraryRequest
 from services.plan_transformer import build_plan_command
-from services.plan_repository import save_plan_request, save_plan_items
+from services.plan_repository import get_festival_coords
+from services.plan_writer import get_plan_writer
+from services.plan_store import issue_plan_ticket
+from services.plan_cache import get_plan_result_cache, plan_cache_key
+from services.route_order import optimize_route
+from services.geocode_cache import get_geocode_cache
+from core.metrics import PLAN_RESULTS, PLAN_STAGE_SECONDS
 from datetime import datetime, time, timezone
 
 def _make_parking_items(addresses: list[str], base_dt: datetime, title: str) -> list[dict]:
@@ -53,7 +60,7 @@ def _merge_and_reindex(*lists: list[dict]) -> list[dict]:
 
 
 # ⬇️ 원본 추천 코드는 수정하지 않고 가져다 씀
-from services.plan_recommend import FestPlanner  # ← 너가 준 파일/클래스 이름 그대로 사용
+from services.plan_recommend import FestPlanner, cached_local_plan  # ← 너가 준 파일/클래스 이름 그대로 사용
 
 def ensure_schema_once():
     Base.metadata.create_all(bind=engine)
@@ -98,48 +105,104 @@ def _normalize_itinerary(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     norm.sort(key=lambda x: x["index"])
     return norm
 
-def process_plan_sync(payload: ItineraryRequest) -> dict:
+def _planner_kwargs(cmd, fest_coords: Optional[str]) -> Dict[str, Any]:
+    """PlanCommand → FestPlanner 생성 인자 (위치 텍스트는 축제 주소, 좌표는 크롤 때 저장분 우선)"""
+    return {
+        "fest_title": cmd.schedule.festival_title or cmd.schedule.title,
+        "fest_location_text": cmd.schedule.festival_address,
+        "travel_needs": {
+            "start_at": cmd.schedule.start_at_kst.isoformat(),
+            "end_at": cmd.schedule.end_at_kst.isoformat(),
+            "categories": cmd.options.categories,
+            "budget": cmd.options.budget,  # 원본 함수는 budget 있으면 사용
+        },
+        "fest_location": fest_coords,
+    }
+
+def process_plan_sync(payload: ItineraryRequest, deadline_s: Optional[float] = None) -> dict:
     """
     /plan/generate:
       1) 요청 가공 → plan_id 저장
       2) 추천 시스템 호출 (원본 그대로 사용)
       3) 추천 결과(itinerary) 저장
       4) 응답 리턴
+    deadline_s: 응답 마감(초, 호출 시점부터). 넘기면 LLM 대신 로컬 휴리스틱 일정 (source="local")
+      → 절대 마감 시각(time.monotonic 기준)으로 바꿔 모든 단계가 같은 시계로 남은 시간을 계산
+    단계별 소요 시간은 plan_stage_seconds{stage=...} (/metrics)
     """
-    ensure_schema_once()
+    deadline_at = None if deadline_s is None else time_mod.monotonic() + deadline_s
+    with PLAN_STAGE_SECONDS.time(stage="total"):
+        return _process_plan(payload, deadline_at)
+
+def _process_plan(payload: ItineraryRequest, deadline_at: Optional[float]) -> dict:
+    with PLAN_STAGE_SECONDS.time(stage="db_schema"):
+        ensure_schema_once()
 
     # 1) 입력 가공
     cmd = build_plan_command(payload)
 
-    # 2) 요청 저장 → plan_id
-    with SessionLocal() as db:  # type: Session
-        plan_id = save_plan_request(db, cmd)
-    print(cmd.schedule.festival_address)
-    # 3) 추천 호출 (원본 코드 사용: 위치 텍스트는 origin_address 우선, 없으면 destination → 제목)
-    fest_title = cmd.schedule.festival_title or cmd.schedule.title
-    fest_location_text = (
-        cmd.schedule.festival_address
-    )
-    travel_needs = {
-        "start_at": cmd.schedule.start_at_kst.isoformat(),
-        "end_at": cmd.schedule.end_at_kst.isoformat(),
-        "categories": cmd.options.categories,
-        "budget": cmd.options.budget,  # 원본 함수는 budget 있으면 사용
-    }
-    print("********")
-    planner = FestPlanner(
-        fest_title=fest_title,
-        fest_location_text=fest_location_text,
-        travel_needs=travel_needs,
+    # 2) 요청 저장 예약 → plan_id (커밋은 write-behind 스레드가 모아서)
+    #    + 크롤 때 저장해 둔 축제 좌표 조회
+    writer = get_plan_writer()
+    with PLAN_STAGE_SECONDS.time(stage="plan_id"):
+        plan_id = writer.add_request(cmd)
+    with PLAN_STAGE_SECONDS.time(stage="db_festival_coords"):
+        with SessionLocal() as db:  # type: Session
+            fest_coords = get_festival_coords(db, cmd.schedule.festival_id)
+    # 3) 추천 호출
+
+    def _new_planner() -> FestPlanner:
+        # planner_init: 축제 좌표가 없으면 지오코딩(findplacefromtext → geocode) 포함
+        with PLAN_STAGE_SECONDS.time(stage="planner_init"):
+            return FestPlanner(**_planner_kwargs(cmd, fest_coords))
+
+    def _run_planner() -> Dict[str, Any]:
+        if deadline_at is not None and time_mod.monotonic() >= deadline_at:
+            return _local_fallback()   # 이미 마감 → 지오코딩·후보 검색도 하지 않음
+        planner = _new_planner()
+        with PLAN_STAGE_SECONDS.time(stage="suggest_plan"):
+            raw = planner.suggest_plan(deadline_at=deadline_at)
+        return _finish(raw, planner.fest_location, planner.candidates)
+
+    def _local_fallback() -> Dict[str, Any]:
+        # 같은 형태의 계산이 진행 중인데 마감 안에 안 끝나면 기다리지 않고 로컬 일정
+        # (planner를 새로 만들지 않음: 좌표·후보 모두 캐시에서만, 외부 호출 없음)
+        with PLAN_STAGE_SECONDS.time(stage="local_fallback"):
+            location = fest_coords or get_geocode_cache().peek(cmd.schedule.festival_address)
+            raw, candidates = cached_local_plan(
+                cmd.schedule.festival_title or cmd.schedule.title,
+                location,
+                cmd.schedule.start_at_kst,
+                cmd.schedule.end_at_kst,
+                cmd.options.categories,
+            )
+        return _finish(raw, location, candidates)
+
+    def _finish(raw: Any, fest_location: Optional[str], candidates: List[Any]) -> Dict[str, Any]:
+        with PLAN_STAGE_SECONDS.time(stage="parse_output"):
+            parsed = _parse_model_output(raw)
+            itinerary = _normalize_itinerary(parsed.get("itinerary") or [])
+        # 지그재그 동선 정리 (축제·식사 시간 고정, 좌표는 이미 조회한 후보에서)
+        with PLAN_STAGE_SECONDS.time(stage="route_optimize"):
+            itinerary = optimize_route(itinerary, fest_location, candidates)
+        PLAN_RESULTS.inc(source="error" if "error" in parsed else parsed.get("source", "llm"))
+        return {
+            "itinerary": itinerary,
+            "source": parsed.get("source", "llm"),
+            "totals": parsed.get("totals") or {},   # 스트림 캐시 적중 때 그대로 재생
+            "routed": True,                         # 동선 정리 완료 (PlanResultCache는 이것만 받음)
+        }
+
+    # 같은 요청 형태는 캐시/진행 중인 계산을 공유 (LLM 호출은 형태당 1회)
+    # 마감이 있으면 남은 시간만큼만 기다림 (넘으면 로컬 일정)
+    remaining = None if deadline_at is None else deadline_at - time_mod.monotonic()
+    generated = get_plan_result_cache().get_or_compute(
+        plan_cache_key(cmd), _run_planner, timeout=remaining, fallback=_local_fallback,
     )
-    raw = planner.suggest_plan()
-    parsed = _parse_model_output(raw)
-    itinerary = _normalize_itinerary(parsed.get("itinerary") or [])
-    
-    # # 4) 추천 결과 저장
-    # if itinerary:
-    #     with SessionLocal() as db:  # type: Session
-    #         save_plan_items(db, plan_id, itinerary)
+    itinerary = generated["itinerary"]
+
+    # 4) 추천 결과 저장 예약 (분석용, 응답 지연 없음)
+    writer.add_items(plan_id, itinerary)
 
     # parking_addresses = [
     # "강원특별자치도 양구군 양구읍 박수근로 366-27",
@@ -172,4 +235,58 @@ def process_plan_sync(payload: ItineraryRequest) -> dict:
             "notes": cmd.options.notes,
         },
         "itinerary": itinerary,  # ← 앱에서 바로 렌더 가능
+        "source": generated["source"],  # llm | local(마감 초과 시 휴리스틱 대체)
     }
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def stream_plan_events(payload: ItineraryRequest, client_id: Optional[str] = None) -> Iterator[str]:
+    """
+    /plan/generate/stream: SSE 이벤트 문자열을 순서대로 생성
+      meta   → {"plan_id": ..., "ticket": ...}  (ticket은 /plan/save용)
+      item   → 검증(_normalize_itinerary)을 통과한 항목 1건 (index는 1..N으로 다시 매김)
+      itinerary → 동선 정리(optimize_route) 후 최종 일정 전체 (item 도착 순서와 다를 수 있음)
+      totals → 합계 (마지막)
+      error  → 도중 실패 시
+    같은 요청 형태의 결과가 캐시에 있으면 LLM 없이 바로 흘려보냄.
+    """
+    ensure_schema_once()
+    cmd = build_plan_command(payload)
+    writer = get_plan_writer()
+    plan_id = writer.add_request(cmd)
+    with SessionLocal() as db:  # type: Session
+        fest_coords = get_festival_coords(db, cmd.schedule.festival_id)
+    ticket = issue_plan_ticket(plan_id, client_id, cmd.schedule.festival_title or cmd.schedule.title)
+    yield _sse("meta", {"plan_id": plan_id, "ticket": ticket})
+
+    cache = get_plan_result_cache()
+    key = plan_cache_key(cmd)
+    cached = cache.peek(key)
+    if cached is not None:
+        for item in cached["itinerary"]:
+            yield _sse("item", item)
+        writer.add_items(plan_id, cached["itinerary"])
+        yield _sse("itinerary", cached["itinerary"])
+        yield _sse("totals", cached.get("totals") or {})
+        return
+
+    itinerary: List[Dict[str, Any]] = []
+    try:
+        planner = FestPlanner(**_planner_kwargs(cmd, fest_coords))
+        for kind, data in planner.stream_plan():
+            if kind == "totals":
+                # /generate와 같은 후처리를 거친 결과만 공용 캐시·저장에 (캐시 적중 응답이 경로별로 달라지지 않도록)
+                final = optimize_route(itinerary, planner.fest_location, planner.candidates)
+                cache.put(key, {"itinerary": final, "source": "llm", "totals": data, "routed": True})
+                writer.add_items(plan_id, final)
+                yield _sse("itinerary", final)
+                yield _sse("totals", data)
+                continue
+            norm = _normalize_itinerary([dict(data, index=len(itinerary) + 1)])
+            if not norm:
+                continue
+            itinerary.append(norm[0])
+            yield _sse("item", norm[0])
+    except Exception as e:
+        yield _sse("error", {"detail": f"계획 생성 중 오류 발생: {e}"})
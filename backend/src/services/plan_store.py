@@ -0,0 +1,181 @@
+# src/services/plan_store.py
+from __future__ import annotations
+import base64
+import hashlib
+import json
+import secrets
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import IntegrityError
+
+from core.cache import LRUCache
+from core.config import settings
+from core.responses import dumps_json
+from core.security import sign_ticket, verify_ticket
+from db.base import SessionLocal
+from db.models import SavedPlan
+from services.timezone import as_utc
+
+# 저장 일정 목록 keyset 조건: (created_at, id)가 커서 행보다 앞선 것 (비교 값은 DB에서 다시 읽음)
+_AFTER_CURSOR = text(
+    "(saved_plan.created_at, saved_plan.id) < "
+    "(SELECT c.created_at, c.id FROM saved_plan AS c WHERE c.public_id = :cursor_id)"
+)
+
+
+class InvalidTicket(ValueError):
+    pass
+
+
+def issue_plan_ticket(plan_id: int, client: Optional[str], title: str) -> str:
+    """generate 응답에 붙이는 저장용 ticket (plan_id·클라이언트·제목을 서명)"""
+    return sign_ticket({"plan_id": plan_id, "client": client, "title": title, "iat": int(time.time())})
+
+
+def new_public_id() -> str:
+    """외부에 노출하는 저장 일정 id (추측 불가, 순차 id는 내부 정렬·커서 비교에만 씀)"""
+    return secrets.token_urlsafe(16)
+
+
+def _pack(items: List[Dict[str, Any]]) -> bytes:
+    return zlib.compress(dumps_json(items), 6)
+
+
+def _unpack(blob: bytes) -> List[Dict[str, Any]]:
+    return json.loads(zlib.decompress(blob))
+
+
+def _iso_utc(dt: datetime) -> str:
+    """응답 시각 표기 통일: UTC + "Z" (pydantic JSON과 같은 형식, /plan/{id}는 모델을 거치지 않으므로 여기서 맞춤)"""
+    return as_utc(dt).astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _to_dict(row, items: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """SavedPlan 행(또는 같은 컬럼의 select 결과) → 저장·목록·단건 응답 공통 dict"""
+    out = {
+        "id": row.public_id,
+        "plan_id": row.plan_request_id,
+        "client": row.client,
+        "title": row.title,
+        "item_count": row.item_count,
+        "created_at": _iso_utc(row.created_at),
+    }
+    if items is not None:
+        out["itinerary"] = items
+    return out
+
+
+def save_committed_plan(ticket: str, itinerary: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+    """
+    ticket 검증 후 확정 일정 1행 저장 → (저장 일정, 새로 만들었는지)
+    같은 ticket을 다시 보내면(재시도 등) 새로 쓰지 않고 처음 저장한 행을 돌려줌
+    """
+    try:
+        claims = verify_ticket(ticket)
+    except Exception as e:
+        raise InvalidTicket(str(e)) from e
+    if not isinstance(claims, dict) or "plan_id" not in claims:
+        raise InvalidTicket("ticket has no plan_id")
+
+    ticket_hash = hashlib.sha256(ticket.encode("utf-8")).hexdigest()
+    with SessionLocal() as s:
+        existing = s.execute(select(SavedPlan).where(SavedPlan.ticket_hash == ticket_hash)).scalar_one_or_none()
+        if existing is not None:
+            return _to_dict(existing), False
+        row = SavedPlan(
+            public_id=new_public_id(),
+            ticket_hash=ticket_hash,
+            plan_request_id=claims.get("plan_id"),
+            client=claims.get("client"),
+            title=str(claims.get("title") or "")[:300],
+            item_count=len(itinerary),
+            itinerary_z=_pack(itinerary),
+            created_at=datetime.now(timezone.utc),
+        )
+        s.add(row)
+        try:
+            s.commit()
+        except IntegrityError:
+            # 같은 ticket 동시 저장 → 먼저 들어간 행 사용
+            s.rollback()
+            existing = s.execute(select(SavedPlan).where(SavedPlan.ticket_hash == ticket_hash)).scalar_one()
+            return _to_dict(existing), False
+        saved = _to_dict(row, itinerary)
+    get_saved_plan_cache().set(saved["id"], saved)
+    return saved, True
+
+
+def _encode_cursor(public_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"id": public_id}).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        public_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))["id"]
+    except Exception:
+        raise ValueError("invalid cursor")
+    if not isinstance(public_id, str):
+        raise ValueError("invalid cursor")
+    return public_id
+
+
+def list_saved_plans(client: str, limit: int, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    클라이언트별 저장 일정 최신순 (keyset, ix_saved_plan_client_created 범위 스캔).
+    목록엔 요약만 (압축 본문은 읽지 않음)
+    """
+    stmt = select(
+        SavedPlan.public_id, SavedPlan.plan_request_id, SavedPlan.client, SavedPlan.title,
+        SavedPlan.item_count, SavedPlan.created_at,
+    ).where(SavedPlan.client == client)
+    if cursor:
+        stmt = stmt.where(_AFTER_CURSOR.bindparams(cursor_id=decode_cursor(cursor)))
+    stmt = stmt.order_by(SavedPlan.created_at.desc(), SavedPlan.id.desc()).limit(limit + 1)
+    with SessionLocal() as s:
+        rows = s.execute(stmt).all()
+    items = [_to_dict(r) for r in rows[:limit]]
+    next_cursor = _encode_cursor(items[-1]["id"]) if len(rows) > limit else None
+    return items, next_cursor
+
+
+class SavedPlanCache:
+    """저장 일정 read-through 캐시 (저장 후 내용이 바뀌지 않으므로 무효화 없음)"""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self._lru = LRUCache(maxsize=max_entries or settings.SAVED_PLAN_CACHE_MAX_ENTRIES)
+
+    def get(self, public_id: str) -> Optional[Dict[str, Any]]:
+        hit = self._lru.get(public_id)
+        if hit is not None:
+            return hit
+        with SessionLocal() as s:
+            row = s.execute(select(SavedPlan).where(SavedPlan.public_id == public_id)).scalar_one_or_none()
+            if row is None:
+                return None
+            saved = _to_dict(row, _unpack(row.itinerary_z))
+        self._lru.set(public_id, saved)
+        return saved
+
+    def set(self, public_id: str, saved: Dict[str, Any]) -> None:
+        self._lru.set(public_id, saved)
+
+
+_shared_cache: Optional[SavedPlanCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_saved_plan_cache() -> SavedPlanCache:
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = SavedPlanCache()
+        return _shared_cache
+
+
+def get_saved_plan(public_id: str) -> Optional[Dict[str, Any]]:
+    return get_saved_plan_cache().get(public_id)
@@ -0,0 +1,79 @@
+# src/services/plan_stream.py
+from __future__ import annotations
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+_ITINERARY_START = re.compile(r'"itinerary"\s*:\s*\[')
+
+
+class ItineraryStreamParser:
+    """
+    LLM 출력 텍스트를 토큰 단위로 받아 "itinerary" 배열의 완성된 객체를 하나씩 꺼냄.
+    - 문자열/이스케이프 안의 중괄호는 무시
+    - 코드펜스(```json) 등 앞뒤 잡음이 있어도 "itinerary": [ 를 찾은 뒤부터 파싱
+    - 마지막에 finish()로 전체 JSON(totals 포함)을 얻음
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos: Optional[int] = None  # 배열 안에서 다음에 볼 위치 (None = 아직 배열 시작 전)
+        self._obj_start = -1
+        self._depth = 0
+        self._in_str = False
+        self._esc = False
+        self._done = False
+
+    def feed(self, delta: str) -> List[Dict[str, Any]]:
+        self.text += delta
+        if self._done:
+            return []
+        if self._pos is None:
+            m = _ITINERARY_START.search(self.text)
+            if not m:
+                return []
+            self._pos = m.end()
+
+        items: List[Dict[str, Any]] = []
+        text, i = self.text, self._pos
+        while i < len(text):
+            ch = text[i]
+            if self._depth == 0:
+                if ch == "{":
+                    self._obj_start, self._depth = i, 1
+                elif ch == "]":
+                    self._done = True
+                    i += 1
+                    break
+            elif self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif ch == "\\":
+                    self._esc = True
+                elif ch == '"':
+                    self._in_str = False
+            elif ch == '"':
+                self._in_str = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        items.append(json.loads(text[self._obj_start:i + 1]))
+                    except json.JSONDecodeError:
+                        pass  # 깨진 항목은 건너뜀 (최종 파싱에서 다시 보지 않음)
+            i += 1
+        self._pos = i
+        return items
+
+    def finish(self) -> Dict[str, Any]:
+        """전체 텍스트를 JSON으로 파싱 (앞뒤 잡음 제거). 실패하면 빈 dict"""
+        s = self.text.strip()
+        left, right = s.find("{"), s.rfind("}")
+        if left == -1 or right <= left:
+            return {}
+        try:
+            return json.loads(s[left:right + 1])
+        except json.JSONDecodeError:
+            return {}
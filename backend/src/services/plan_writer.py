@@ -0,0 +1,189 @@
+# src/services/plan_writer.py
+from __future__ import annotations
+import logging
+import queue
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from core.config import settings
+from core.metrics import PLAN_STAGE_SECONDS
+from db.base import SessionLocal
+from services.plan_repository import (
+    allocate_plan_ids, bulk_insert_plan_rows, existing_plan_ids, plan_item_values, plan_request_values,
+)
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+# 배치 커밋 실패 시 재시도 간격(초). 다 실패하면 행 단위로 나눠 씀
+FLUSH_RETRY_DELAYS = (0.5, 2.0, 5.0)
+
+
+class PlanIdAllocator:
+    """plan_request.id 블록을 DB에서 받아 두고 메모리에서 하나씩 나눠 줌 (블록 소진 시에만 DB 왕복)"""
+
+    def __init__(self, block_size: Optional[int] = None):
+        self.block_size = block_size or settings.PLAN_ID_BLOCK_SIZE
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            if self._next >= self._end:
+                with SessionLocal() as s:
+                    self._next, self._end = allocate_plan_ids(s, self.block_size)
+            pid = self._next
+            self._next += 1
+            return pid
+
+
+class PlanWriteBehind:
+    """
+    일정 요청·결과 행을 요청 경로 밖에서 모아 쓰는 write-behind 큐.
+    - plan_id는 미리 받아 둔 id 블록에서 즉시 발급 → 응답에 바로 실음
+    - 전용 스레드가 PLAN_PERSIST_BATCH_SIZE개 또는 PLAN_PERSIST_FLUSH_SECONDS마다 bulk insert 한 번에 커밋
+    - 큐 크기 제한: 가득 차면 잠깐 기다렸다가 그래도 안 되면 버리고 경고 (요청은 막지 않음)
+    - 커밋 실패(SQLite busy 등)는 백오프 재시도 → 그래도 실패하면 행 단위로 써서 문제 행만 건너뜀
+    - 부모 요청 행이 없는 항목(요청 배치 실패·큐에서 버려짐)은 쓰지 않음
+    - close() 시 남은 행을 모두 쓰고 종료
+    """
+
+    def __init__(self):
+        self._ids = PlanIdAllocator()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=settings.PLAN_PERSIST_MAX_PENDING)
+        self._thread = threading.Thread(target=self._run, name="plan-writer", daemon=True)
+        self._thread.start()
+        self.dropped = 0
+
+    # ---- 요청 경로 ----
+    def add_request(self, cmd) -> int:
+        """PlanCommand 저장 예약 → plan_id"""
+        plan_id = self._ids.next_id()
+        self._put(("request", plan_request_values(plan_id, cmd)))
+        return plan_id
+
+    def add_items(self, plan_id: int, items: List[dict]) -> None:
+        rows = plan_item_values(plan_id, items)
+        if rows:
+            self._put(("items", rows))
+
+    def _put(self, entry: Tuple[str, object]) -> None:
+        try:
+            self._queue.put(entry, timeout=settings.PLAN_PERSIST_PUT_TIMEOUT_SECONDS)
+        except queue.Full:
+            self.dropped += 1
+            logger.warning("[PLAN-WRITER] queue full, dropped %s (total dropped=%d)", entry[0], self.dropped)
+
+    # ---- 쓰기 스레드 ----
+    def _run(self) -> None:
+        requests: List[dict] = []
+        items: List[dict] = []
+        deadline: Optional[float] = None
+        stopping = False
+        while not stopping:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                entry = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                entry = None
+            if entry is _STOP:
+                stopping = True
+            elif entry is not None:
+                kind, payload = entry
+                if kind == "request":
+                    requests.append(payload)
+                else:
+                    items.extend(payload)
+                if deadline is None:
+                    deadline = time.monotonic() + settings.PLAN_PERSIST_FLUSH_SECONDS
+            full = len(requests) + len(items) >= settings.PLAN_PERSIST_BATCH_SIZE
+            due = deadline is not None and time.monotonic() >= deadline
+            if (requests or items) and (full or due or stopping):
+                self._flush(requests, items)
+                requests, items, deadline = [], [], None
+
+    def _flush(self, requests: List[dict], items: List[dict]) -> None:
+        with PLAN_STAGE_SECONDS.time(stage="db_persist_flush"):
+            for delay in FLUSH_RETRY_DELAYS + (None,):
+                try:
+                    with SessionLocal() as s:
+                        bulk_insert_plan_rows(s, requests, self._with_parent(s, requests, items))
+                    return
+                except Exception as e:
+                    if delay is None:
+                        logger.warning("[PLAN-WRITER] batch flush failed, writing row by row: %r", e)
+                        break
+                    logger.warning("[PLAN-WRITER] batch flush failed, retry in %.1fs: %r", delay, e)
+                    time.sleep(delay)
+            self._flush_rows(requests, items)
+
+    @staticmethod
+    def _with_parent(s, requests: List[dict], items: List[dict]) -> List[dict]:
+        """같은 배치나 DB에 요청 행이 있는 항목만 (없으면 SQLite는 고아 행, PostgreSQL은 FK 위반)"""
+        batch_ids = {r["id"] for r in requests}
+        outside = {it["plan_request_id"] for it in items} - batch_ids
+        known = batch_ids | (existing_plan_ids(s, outside) if outside else set())
+        kept = [it for it in items if it["plan_request_id"] in known]
+        if len(kept) < len(items):
+            logger.warning("[PLAN-WRITER] skipped %d items without a plan_request row", len(items) - len(kept))
+        return kept
+
+    def _flush_rows(self, requests: List[dict], items: List[dict]) -> None:
+        """배치 재시도가 모두 실패했을 때: 한 행씩 커밋해 문제 행만 버림"""
+        lost = 0
+        for r in requests:
+            try:
+                with SessionLocal() as s:
+                    bulk_insert_plan_rows(s, [r], [])
+            except Exception as e:
+                lost += 1
+                logger.warning("[PLAN-WRITER] plan_request %s not written: %r", r["id"], e)
+        parents: set = set()
+        try:
+            with SessionLocal() as s:
+                parents = existing_plan_ids(s, {it["plan_request_id"] for it in items})
+        except Exception as e:
+            logger.warning("[PLAN-WRITER] parent lookup failed: %r", e)
+        for it in items:
+            if it["plan_request_id"] not in parents:
+                lost += 1
+                continue
+            try:
+                with SessionLocal() as s:
+                    bulk_insert_plan_rows(s, [], [it])
+            except Exception as e:
+                lost += 1
+                logger.warning("[PLAN-WRITER] item of plan %s not written: %r", it["plan_request_id"], e)
+        if lost:
+            logger.error("[PLAN-WRITER] %d of %d rows lost after row-by-row flush", lost, len(requests) + len(items))
+
+    def close(self, timeout: float = 10.0) -> None:
+        """남은 행 flush 후 스레드 종료 (큐 뒤에 종료 표시를 넣어 먼저 들어온 건 모두 씀)"""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("[PLAN-WRITER] flush did not finish within %.1fs", timeout)
+
+
+_shared_writer: Optional[PlanWriteBehind] = None
+_shared_lock = threading.Lock()
+
+
+def get_plan_writer() -> PlanWriteBehind:
+    global _shared_writer
+    with _shared_lock:
+        if _shared_writer is None:
+            _shared_writer = PlanWriteBehind()
+        return _shared_writer
+
+
+def close_plan_writer() -> None:
+    global _shared_writer
+    with _shared_lock:
+        writer, _shared_writer = _shared_writer, None
+    if writer is not None:
+        writer.close()
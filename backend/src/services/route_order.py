@@ -0,0 +1,179 @@
+# src/services/route_order.py
+from __future__ import annotations
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.geo import haversine_matrix, parse_latlng
+from services.plan_fallback import move_minutes
+
+# 동선 재배치 대상 type. 그 외(parking 등)는 자리 그대로 둠
+ROUTE_TYPES = {"festival", "place", "cafe", "restaurant"}
+# 시간대가 의미 있는 항목은 자리·시각 고정: 축제 슬롯 + 식당(점심·저녁 시간대가 밀리지 않도록).
+# 식당 고정은 축제만 고정하는 것보다 재배치 폭이 좁아지는 대신 식사 시각을 지킴
+FIXED_TYPES = {"festival", "restaurant"}
+MAX_2OPT_ROUNDS = 50
+
+_NON_WORD = re.compile(r"[\s\W_]+")
+
+
+def _norm(name: str) -> str:
+    return _NON_WORD.sub("", name or "").lower()
+
+
+class CoordResolver:
+    """일정 항목 title → 좌표 (이미 조회해 둔 후보 목록에서 이름으로 매칭)"""
+
+    def __init__(self, candidates: Sequence[Any]):
+        self._exact: Dict[str, Tuple[float, float]] = {}
+        for p in candidates:
+            key = _norm(p.name)
+            if key and p.lat is not None and p.lng is not None:
+                self._exact.setdefault(key, (p.lat, p.lng))
+        # 부분 일치는 긴 이름부터 (짧은 이름이 엉뚱하게 걸리지 않도록)
+        self._by_len = sorted(self._exact, key=len, reverse=True)
+
+    def resolve(self, title: str) -> Optional[Tuple[float, float]]:
+        key = _norm(title)
+        if not key:
+            return None
+        hit = self._exact.get(key)
+        if hit is not None:
+            return hit
+        for name in self._by_len:
+            if min(len(name), len(key)) >= 3 and (name in key or key in name):
+                return self._exact[name]
+        return None
+
+
+def _path_length(d: np.ndarray, path: Sequence[int]) -> float:
+    p = np.asarray(path)
+    return float(d[p[:-1], p[1:]].sum())
+
+
+def _nearest_neighbour(d: np.ndarray, start: int, end: int, nodes: List[int]) -> List[int]:
+    path, left = [start], list(nodes)
+    while left:
+        row = d[path[-1], left]
+        path.append(left.pop(int(np.argmin(row))))
+    path.append(end)
+    return path
+
+
+def _two_opt(d: np.ndarray, path: List[int]) -> List[int]:
+    """양 끝(고정 앵커) 제외 구간 뒤집기, j 방향은 벡터화"""
+    p = np.array(path)
+    m = len(p)
+    for _ in range(MAX_2OPT_ROUNDS):
+        improved = False
+        for i in range(1, m - 2):
+            js = np.arange(i + 1, m - 1)
+            delta = (
+                d[p[i - 1], p[js]] + d[p[i], p[js + 1]]
+                - d[p[i - 1], p[i]] - d[p[js], p[js + 1]]
+            )
+            k = int(np.argmin(delta))
+            if delta[k] < -1e-9:
+                j = int(js[k])
+                p[i:j + 1] = p[i:j + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return p.tolist()
+
+
+def _order_segment(d: np.ndarray, start: int, end: int, nodes: List[int]) -> List[int]:
+    """start → nodes(순서 자유) → end 경로 최소화. 원래 순서보다 나쁘면 원래 순서"""
+    original = [start] + nodes + [end]
+    if len(nodes) < 2:
+        return nodes
+    best = _two_opt(d, _nearest_neighbour(d, start, end, nodes))
+    if _path_length(d, best) >= _path_length(d, original) - 1e-9:
+        return nodes
+    return best[1:-1]
+
+
+def _retime(items: List[Dict[str, Any]], nodes: List[int], begin: datetime,
+            prev: Optional[int], d: np.ndarray) -> Tuple[List[Dict[str, Any]], datetime]:
+    """체류 시간은 유지하고 이동 시간만 다시 계산해 시작/종료 시각 재배치"""
+    out, t, here = [], begin, prev
+    for it, node in zip(items, nodes):
+        start = t + timedelta(minutes=move_minutes(d[here, node])) if here is not None else t
+        stay = datetime.fromisoformat(it["end_time"]) - datetime.fromisoformat(it["start_time"])
+        end = start + stay
+        out.append(dict(it, start_time=start.isoformat(), end_time=end.isoformat()))
+        t, here = end, node
+    return out, t
+
+
+def optimize_route(itinerary: List[Dict[str, Any]], fest_location: Optional[str], candidates: Sequence[Any]) -> List[Dict[str, Any]]:
+    """
+    _normalize_itinerary 이후 동선 후처리 (/generate·스트림 모두, 캐시에 넣기 전에 실행).
+    - 날짜별로 고정 항목(축제·식사·좌표 모르는 항목) 사이 구간의 자유 항목만 재배치
+    - 구간마다 거리 행렬 → nearest-neighbour + 2-opt (앞뒤 고정 항목을 끝점으로)
+    - 순서가 바뀐 구간만 이동 시간 기준으로 시각 재계산, 다음 고정 항목과 겹치면 원래대로
+    - 시각 파싱 실패 등 예외 상황에선 입력 그대로 반환
+    """
+    try:
+        starts = [datetime.fromisoformat(it["start_time"]) for it in itinerary]
+        for it in itinerary:
+            datetime.fromisoformat(it["end_time"])
+    except (KeyError, ValueError):
+        return itinerary
+
+    resolver = CoordResolver(candidates)
+    fest_pos = parse_latlng(fest_location)
+
+    slots = [i for i, it in enumerate(itinerary) if it.get("type") in ROUTE_TYPES]
+    pos: Dict[int, Optional[Tuple[float, float]]] = {}
+    for i in slots:
+        it = itinerary[i]
+        pos[i] = fest_pos if it["type"] == "festival" else resolver.resolve(it["title"])
+    located = [i for i in slots if pos[i] is not None]
+    if len(located) < 3:
+        return itinerary
+
+    # 좌표 있는 항목 전체의 거리 행렬 한 번에 + 열린 끝점용 더미 노드(모든 거리 0)
+    col = {i: k for k, i in enumerate(located)}
+    arr = np.array([pos[i] for i in located], dtype=np.float64)
+    n = len(located)
+    d = np.zeros((n + 1, n + 1))
+    d[:n, :n] = haversine_matrix(arr[:, 0], arr[:, 1])
+    dummy = n
+
+    result = list(itinerary)
+    # 날짜별로 연속 구간 나누기
+    days: Dict[Any, List[int]] = {}
+    for i in slots:
+        days.setdefault(starts[i].date(), []).append(i)
+
+    for day_slots in days.values():
+        segment: List[int] = []
+        anchor: Optional[int] = None
+        for i in day_slots + [None]:
+            fixed = i is None or pos[i] is None or itinerary[i]["type"] in FIXED_TYPES
+            if not fixed:
+                segment.append(i)
+                continue
+            if len(segment) >= 2:
+                s_node = col[anchor] if anchor is not None and pos[anchor] is not None else dummy
+                e_node = col[i] if i is not None and pos[i] is not None else dummy
+                order = _order_segment(d, s_node, e_node, [col[k] for k in segment])
+                new_ids = [located[c] for c in order]
+                if new_ids != segment:
+                    begin = (datetime.fromisoformat(itinerary[anchor]["end_time"])
+                             if anchor is not None else starts[segment[0]])
+                    prev = s_node if s_node != dummy else None
+                    items, finish = _retime([itinerary[k] for k in new_ids], order, begin, prev, d)
+                    if e_node != dummy:
+                        finish += timedelta(minutes=move_minutes(d[order[-1], e_node]))
+                    if i is None or finish <= starts[i]:
+                        for slot, item in zip(segment, items):
+                            result[slot] = item
+            segment, anchor = [], i
+
+    for idx, item in enumerate(result, start=1):
+        item["index"] = idx
+    return result
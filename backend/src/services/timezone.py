@@ -1,5 +1,5 @@
 # src/services/timezone.py
-from datetime import datetime
+from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 
 KST = ZoneInfo("Asia/Seoul")
@@ -9,3 +9,9 @@ def to_kst(dt: datetime) -> datetime:
     if dt.tzinfo is None:
         raise ValueError("timezone-aware datetime expected")
     return dt.astimezone(KST)
+
+def as_utc(dt: datetime) -> datetime:
+    """DB에서 읽은 datetime 보정: SQLite는 tz 없이 돌려주므로 UTC로 간주"""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
@@ -0,0 +1,13 @@
+# backend/tests/conftest.py
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 앱은 --app-dir src 로 뜨므로 테스트도 src를 import 경로에 둠
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# settings/engine이 만들어지기 전에 임시 DB·크롤 비활성화
+_tmp = tempfile.mkdtemp(prefix="kwplan-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ["CRAWL_ON_STARTUP"] = "false"
@@ -0,0 +1,97 @@
+# backend/tests/test_festivals_cursor.py
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers.festivals import router
+from db.base import Base, SessionLocal, engine
+from db.models import Festival
+from services.festival_cache import get_festival_response_cache
+
+T0 = datetime(2025, 5, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def client():
+    Base.metadata.create_all(engine)
+    with SessionLocal() as s:
+        s.query(Festival).delete()
+        n = 0
+        # 같은 period_start·created_at 동률을 일부러 섞음 (id로 순서 고정되는지)
+        for k in range(23):
+            n += 1
+            s.add(Festival(
+                title=f"기간축제{n}", hash=f"h{n}", detail_url=f"u{n}",
+                period_start=date(2025, 6, 1) + timedelta(days=k // 3),
+                period_end=date(2025, 6, 10) + timedelta(days=k // 3),
+                region="춘천시" if k % 2 else "강릉시",
+                created_at=T0 + timedelta(minutes=k // 2),
+            ))
+        for k in range(11):
+            n += 1
+            s.add(Festival(title=f"미정축제{n}", hash=f"h{n}", detail_url=f"u{n}",
+                           region="춘천시", created_at=T0 + timedelta(minutes=k // 4)))
+        # 최신 스냅샷이 아닌 행은 목록에서 빠져야 함
+        s.add(Festival(title="옛스냅샷", hash="old", detail_url="u1", is_latest=False,
+                       period_start=date(2025, 7, 1), created_at=T0))
+        s.commit()
+    get_festival_response_cache().clear()
+
+    app = FastAPI()
+    app.include_router(router, prefix="/festivals")
+    return TestClient(app)
+
+
+def _expected(region=None, dated_only=False):
+    with SessionLocal() as s:
+        rows = s.query(Festival).filter(Festival.is_latest.is_(True)).all()
+    if region:
+        rows = [f for f in rows if f.region == region]
+    dated = sorted((f for f in rows if f.period_start is not None),
+                   key=lambda f: (f.period_start, f.created_at, f.id), reverse=True)
+    undated = sorted((f for f in rows if f.period_start is None),
+                     key=lambda f: (f.created_at, f.id), reverse=True)
+    return [f.id for f in dated] + ([] if dated_only else [f.id for f in undated])
+
+
+def _walk(client, limit, **params):
+    ids, cursor, pages = [], None, 0
+    while True:
+        q = dict(params, limit=limit)
+        if cursor:
+            q["cursor"] = cursor
+        r = client.get("/festivals", params=q)
+        assert r.status_code == 200
+        body = r.json()
+        assert len(body["items"]) <= limit
+        ids.extend(it["id"] for it in body["items"])
+        cursor = body["next_cursor"]
+        pages += 1
+        assert pages < 100
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("limit", [1, 3, 7, 23, 34, 100])
+def test_cursor_walk_has_no_duplicates_or_gaps(client, limit):
+    # 23 = 기간 있는 구간이 딱 한 페이지로 끝나는 경계
+    ids = _walk(client, limit)
+    assert ids == _expected()
+    assert len(ids) == len(set(ids)) == 34
+
+
+@pytest.mark.parametrize("limit", [2, 5])
+def test_cursor_walk_with_filters(client, limit):
+    assert _walk(client, limit, region="춘천") == _expected(region="춘천시")
+    assert _walk(client, limit, date_from="2025-06-01") == _expected(dated_only=True)
+
+
+def test_first_page_matches_list_order(client):
+    r = client.get("/festivals/first-page", params={"limit": 10})
+    assert [it["id"] for it in r.json()] == _expected()[:10]
+
+
+def test_invalid_cursor_is_400(client):
+    assert client.get("/festivals", params={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,75 @@
+# backend/tests/test_plan_fallback.py
+from datetime import datetime, timedelta
+
+from services.plan_fallback import MEAL_WINDOWS, build_local_plan, is_open
+from services.plan_recommend import Place
+
+FEST = "37.8813,127.7298"
+MONDAY = datetime(2025, 6, 2, 9, 0)  # 월요일
+ALL_DAY = [f"{d}요일: 오전 9:00~오후 9:00" for d in "월화수목금토일"]
+
+
+def _place(name, lat, lng, category, hours=ALL_DAY):
+    return Place(name=name, address=f"{name} 주소", category=category, rating=4.5,
+                 lat=lat, lng=lng, operating_hours=hours, place_id=name)
+
+
+def _candidates():
+    return [
+        _place("월요휴무관", 37.8815, 127.7300, ["tourist_attraction"],
+               ["월요일: 휴무"] + ALL_DAY[1:]),
+        _place("소양강스카이워크", 37.8900, 127.7350, ["tourist_attraction"]),
+        _place("춘천박물관", 37.8700, 127.7450, ["museum"]),
+        _place("공지천", 37.8650, 127.7100, ["park"]),
+        _place("저녁만여는집", 37.8820, 127.7310, ["restaurant"],
+               [f"{d}요일: 오후 5:00~오후 10:00" for d in "월화수목금토일"]),
+        _place("닭갈비골목", 37.8750, 127.7250, ["restaurant"]),
+        _place("막국수집", 37.8950, 127.7200, ["restaurant"]),
+        _place("호숫가카페", 37.8880, 127.7400, ["cafe"]),
+        _place("역앞주차장", 37.8812, 127.7299, ["parking"]),
+    ]
+
+
+def test_is_open_parses_weekday_text():
+    hours = ["월요일: 오전 9:00~오후 6:00", "화요일: 휴무", "수요일: 24시간", "목요일: 정보 없음"]
+    assert is_open(hours, datetime(2025, 6, 2, 10, 0), 60)
+    assert not is_open(hours, datetime(2025, 6, 2, 17, 30), 60)    # 18:30 종료 > 18:00
+    assert not is_open(hours, datetime(2025, 6, 3, 10, 0), 60)     # 화요일 휴무
+    assert is_open(hours, datetime(2025, 6, 4, 3, 0), 60)          # 24시간
+    assert is_open(hours, datetime(2025, 6, 5, 3, 0), 60)          # 모르는 형식 → 영업 간주
+    assert is_open(["금요일: 오후 6:00~오전 2:00"], datetime(2025, 6, 6, 23, 0), 120)  # 자정 넘김
+
+
+def test_build_local_plan_uses_cached_candidates():
+    cands = _candidates()
+    plan = build_local_plan("춘천마임축제", FEST, MONDAY, MONDAY.replace(hour=21), cands)
+    items = plan["itinerary"]
+    by_name = {p.name: p for p in cands}
+
+    assert items[0]["type"] == "festival" and items[0]["title"] == "춘천마임축제"
+    assert [it["index"] for it in items] == list(range(1, len(items) + 1))
+    titles = [it["title"] for it in items]
+    assert len(items) > 1
+    assert "월요휴무관" not in titles
+    assert "역앞주차장" not in titles
+    assert len(set(titles)) == len(titles)
+
+    prev_end = None
+    for it in items:
+        start, end = datetime.fromisoformat(it["start_time"]), datetime.fromisoformat(it["end_time"])
+        assert start < end
+        assert prev_end is None or prev_end <= start
+        prev_end = end
+        p = by_name.get(it["title"])
+        if p is not None:
+            assert is_open(p.operating_hours, start, int((end - start) / timedelta(minutes=1)))
+        if it["type"] == "restaurant":
+            assert any(a <= start.time() <= b for a, b in MEAL_WINDOWS)
+
+    assert any(it["type"] == "restaurant" for it in items)
+    assert plan["totals"]["estimated_travel_time_minutes"] > 0
+
+
+def test_build_local_plan_without_candidates_keeps_festival():
+    plan = build_local_plan("축제", FEST, MONDAY, MONDAY.replace(hour=21), [])
+    assert [it["type"] for it in plan["itinerary"]] == ["festival"]
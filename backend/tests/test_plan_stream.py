@@ -0,0 +1,63 @@
+# backend/tests/test_plan_stream.py
+import json
+import random
+
+from services.plan_stream import ItineraryStreamParser
+
+PLAN = {
+    "itinerary": [
+        {"index": 1, "type": "festival", "title": "춘천마임축제 {본행사}",
+         "start_time": "2025-06-02T09:00:00", "end_time": "2025-06-02T11:00:00",
+         "description": "중괄호 } 와 대괄호 ] 가 든 설명"},
+        {"index": 2, "type": "restaurant", "title": "닭갈비 \"원조\" 골목",
+         "start_time": "2025-06-02T12:00:00", "end_time": "2025-06-02T13:00:00",
+         "description": "역슬래시 \\ 와 줄바꿈\n포함", "meta": {"nested": [1, {"a": "}"}]}},
+        {"index": 3, "type": "cafe", "title": "호숫가 카페",
+         "start_time": "2025-06-02T13:20:00", "end_time": "2025-06-02T14:05:00",
+         "description": "주소: 춘천시 {미상}"},
+    ],
+    "totals": {"estimated_cost_krw": 35000, "estimated_travel_time_minutes": 40},
+}
+TEXT = "```json\n" + json.dumps(PLAN, ensure_ascii=False, indent=2) + "\n```"
+
+
+def _chunks(text, rng):
+    i = 0
+    while i < len(text):
+        n = rng.randint(1, 12)
+        yield text[i:i + n]
+        i += n
+
+
+def test_single_feed_yields_all_items():
+    p = ItineraryStreamParser()
+    assert p.feed(TEXT) == PLAN["itinerary"]
+    assert p.finish() == PLAN
+
+
+def test_random_chunking_matches_whole_parse():
+    rng = random.Random(20251018)
+    for _ in range(200):
+        p = ItineraryStreamParser()
+        got = []
+        for chunk in _chunks(TEXT, rng):
+            got.extend(p.feed(chunk))
+        assert got == PLAN["itinerary"]
+        assert p.finish() == PLAN
+
+
+def test_char_by_char_emits_each_item_once_when_closed():
+    p = ItineraryStreamParser()
+    seen = []
+    for ch in TEXT:
+        for item in p.feed(ch):
+            seen.append(item)
+            # 객체가 닫히는 바로 그 글자에서 나와야 함
+            assert ch == "}"
+    assert seen == PLAN["itinerary"]
+
+
+def test_broken_output_yields_nothing():
+    p = ItineraryStreamParser()
+    assert p.feed('죄송합니다. {"itinerary": [{"title": "미완') == []
+    assert p.finish() == {}
@@ -0,0 +1,83 @@
+# backend/tests/test_route_order.py
+from datetime import datetime
+
+from services.plan_recommend import Place
+from services.route_order import optimize_route
+
+FEST = "37.8800,127.7300"
+
+
+def _place(name, lat, lng):
+    return Place(name=name, address="", category=["tourist_attraction"], rating=4.0,
+                 lat=lat, lng=lng, operating_hours=[], place_id=name)
+
+
+CANDIDATES = [
+    _place("먼곳", 37.9100, 127.7300),
+    _place("가까운곳", 37.8850, 127.7300),
+    _place("중간곳", 37.8950, 127.7300),
+    _place("점심식당", 37.8800, 127.7350),
+    _place("오후A", 37.8700, 127.7300),
+    _place("오후B", 37.8600, 127.7300),
+]
+
+
+def _it(kind, title, start, end):
+    return {"index": 0, "type": kind, "title": title, "description": "",
+            "start_time": f"2025-06-02T{start}:00", "end_time": f"2025-06-02T{end}:00"}
+
+
+def _itinerary(lunch_start="12:30", lunch_end="13:30"):
+    return [
+        _it("festival", "축제", "09:00", "10:00"),
+        _it("place", "먼곳", "10:10", "10:30"),
+        _it("place", "가까운곳", "10:45", "11:05"),
+        _it("place", "중간곳", "11:10", "11:30"),
+        _it("restaurant", "점심식당", lunch_start, lunch_end),
+        _it("place", "오후B", "13:45", "14:15"),
+        _it("place", "오후A", "14:30", "15:00"),
+    ]
+
+
+def _times(it):
+    return datetime.fromisoformat(it["start_time"]), datetime.fromisoformat(it["end_time"])
+
+
+def _assert_no_overlap(items):
+    prev_end = None
+    for it in items:
+        start, end = _times(it)
+        assert start < end
+        assert prev_end is None or prev_end <= start
+        prev_end = end
+
+
+def test_optimize_route_reorders_free_items_between_fixed_slots():
+    before = _itinerary()
+    after = optimize_route(before, FEST, CANDIDATES)
+
+    assert [it["title"] for it in after] == ["축제", "가까운곳", "중간곳", "먼곳", "점심식당", "오후A", "오후B"]
+    # 축제·식당은 자리와 시각 그대로
+    for i in (0, 4):
+        assert after[i]["title"] == before[i]["title"]
+        assert _times(after[i]) == _times(before[i])
+    # 체류 시간 유지
+    stay = {it["title"]: _times(it)[1] - _times(it)[0] for it in before}
+    assert all(_times(it)[1] - _times(it)[0] == stay[it["title"]] for it in after)
+    assert [it["index"] for it in after] == list(range(1, len(after) + 1))
+    _assert_no_overlap(after)
+
+
+def test_optimize_route_keeps_order_when_retime_hits_next_fixed_slot():
+    before = _itinerary(lunch_start="11:35", lunch_end="12:35")
+    after = optimize_route(before, FEST, CANDIDATES)
+
+    assert [it["title"] for it in after[:5]] == ["축제", "먼곳", "가까운곳", "중간곳", "점심식당"]
+    assert [_times(it) for it in after[:5]] == [_times(it) for it in before[:5]]
+    _assert_no_overlap(after)
+
+
+def test_optimize_route_leaves_unparseable_itinerary_alone():
+    broken = _itinerary()
+    broken[1]["start_time"] = "오전 10시"
+    assert optimize_route(broken, FEST, CANDIDATES) is broken